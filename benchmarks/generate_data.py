@@ -0,0 +1,166 @@
+"""Gerador determinístico de bancos sintéticos para benchmarks.
+
+    python benchmarks/generate_data.py /tmp/bench.db --users 200 --activities 50000
+
+A mesma semente e a mesma --end-date geram os mesmos dados (só o usuário
+admin, criado pela aplicação, leva a data da geração). Sem
+--end-date o período termina hoje, para que as telas de "hoje" e dos últimos
+30 dias tenham dados.
+
+O banco é criado pelas próprias migrações da aplicação. Como o caminho do
+banco é lido na importação do pacote, cada processo gera um único banco.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PRIORITIES = ["Baixa", "Média", "Alta", "Urgente"]
+CATEGORIES = ["Desenvolvimento", "Manutenção", "Suporte", "Reunião", "Outro"]
+ACTIONS = ["login", "create_activity", "complete_activity", "update_activity", "create_user"]
+WORDS = ("relatório análise cliente sistema ajuste revisão deploy reunião contrato "
+         "integração suporte banco tela API migração teste documentação backup").split()
+
+def sentence(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+def load_app(path):
+    """Importa o pacote apontando para `path`"""
+    os.environ['MONITOR_DB_PATH'] = path
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    from monitor_atividades import db
+    if os.path.abspath(db.DB_PATH) != os.path.abspath(path):
+        raise RuntimeError(f"monitor_atividades já foi importado com o banco {db.DB_PATH}")
+    from monitor_atividades.schema import init_db
+    init_db()
+
+def generate_database(path, users=50, departments=5, activities=5000, years=2,
+                      logs_per_activity=2, comments_per_activity=0.5,
+                      tracking_per_activity=1.0, seed=42, end_date=None, batch_size=10000):
+    """Cria `path` com os dados pedidos e devolve um resumo com as contagens"""
+    if os.path.exists(path):
+        raise FileExistsError(path)
+    load_app(path)
+    from monitor_atividades.db import db_write, to_db_timestamp
+    from monitor_atividades.logs import get_log_db, write_log_entries
+    from monitor_atividades.rollup import rebuild_activity_daily_stats
+
+    rng = random.Random(seed)
+    end = datetime.combine(end_date or date.today(), datetime.min.time()) + timedelta(days=1)
+    start = end - timedelta(days=365 * years)
+    span = int((end - start).total_seconds())
+
+    def random_time():
+        return start + timedelta(seconds=rng.randrange(span))
+
+    with db_write('departments', 'users') as conn:
+        existing = [row[0] for row in conn.execute('SELECT name FROM departments')]
+        new_departments = [(f"Departamento {i:03d}", sentence(rng, 4), start)
+                           for i in range(max(0, departments - len(existing)))]
+        conn.executemany('INSERT INTO departments (name, description, created_at) VALUES (?, ?, ?)',
+                         new_departments)
+        department_names = (existing + [name for name, _, _ in new_departments])[:departments]
+
+        user_rows = []
+        for i in range(users):
+            role = rng.choices(["comum", "supervisor", "admin"], weights=[85, 12, 3])[0]
+            user_rows.append((f"user{i:06d}", "x" * 64, role, f"Usuário {i:06d}",
+                              f"user{i:06d}@empresa.com", rng.choice(department_names),
+                              random_time(), rng.choices(["active", "inactive"], weights=[9, 1])[0]))
+        conn.executemany('''INSERT INTO users (username, password, role, full_name, email,
+                                               department, created_at, status)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?)''', user_rows)
+        user_ids = [row[0] for row in conn.execute('SELECT id FROM users ORDER BY id')]
+
+    counts = {'users': len(user_ids), 'departments': len(department_names),
+              'activities': 0, 'comments': 0, 'time_tracking': 0, 'system_logs': 0}
+    next_id = 1
+    while counts['activities'] < activities:
+        size = min(batch_size, activities - counts['activities'])
+        activity_rows, comment_rows, tracking_rows, log_rows = [], [], [], []
+        for activity_id in range(next_id, next_id + size):
+            user_id = rng.choice(user_ids)
+            started = random_time()
+            age_days = (end - started).days
+            # Atividades antigas quase sempre estão concluídas
+            if age_days > 30 or rng.random() < 0.5:
+                status = 'concluida'
+            else:
+                status = rng.choice(['em_andamento', 'pendente'])
+            estimated = rng.choice([0.5, 1.0, 2.0, 4.0, 8.0, 16.0])
+            finished = actual = None
+            if status == 'concluida':
+                actual = round(estimated * rng.uniform(0.5, 2.0), 2)
+                finished = min(started + timedelta(hours=actual * rng.uniform(1, 6)),
+                               end - timedelta(seconds=1))
+            activity_rows.append((activity_id, user_id, sentence(rng, 3).capitalize(),
+                                  sentence(rng, 12), status, rng.choice(PRIORITIES),
+                                  rng.choice(CATEGORIES), started, finished, estimated,
+                                  actual, sentence(rng, 6), finished or started))
+            for _ in range(int(comments_per_activity + rng.random())):
+                comment_rows.append((activity_id, user_id, sentence(rng, 10),
+                                     started + timedelta(minutes=rng.randrange(1, 600))))
+            for _ in range(int(tracking_per_activity + rng.random())):
+                tracking_rows.append((activity_id, user_id, round(rng.uniform(0.25, 4), 2),
+                                      sentence(rng, 4),
+                                      started + timedelta(minutes=rng.randrange(1, 600))))
+            for _ in range(int(logs_per_activity + rng.random())):
+                log_rows.append((user_id, rng.choice(ACTIONS), sentence(rng, 5),
+                                 to_db_timestamp(started + timedelta(seconds=rng.randrange(3600)))))
+
+        with db_write('activities', 'activity_comments', 'time_tracking') as conn:
+            conn.executemany('''INSERT INTO activities
+                                (id, user_id, activity, description, status, priority, category,
+                                 start_time, end_time, estimated_hours, actual_hours, comments,
+                                 last_updated)
+                                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''', activity_rows)
+            conn.executemany('''INSERT INTO activity_comments (activity_id, user_id, comment, created_at)
+                                VALUES (?, ?, ?, ?)''', comment_rows)
+            conn.executemany('''INSERT INTO time_tracking
+                                (activity_id, user_id, hours_spent, description, tracked_at)
+                                VALUES (?, ?, ?, ?, ?)''', tracking_rows)
+        write_log_entries(get_log_db(), log_rows)
+
+        next_id += size
+        counts['activities'] += size
+        counts['comments'] += len(comment_rows)
+        counts['time_tracking'] += len(tracking_rows)
+        counts['system_logs'] += len(log_rows)
+
+    counts['daily_stats'] = rebuild_activity_daily_stats()
+    with db_write() as conn:
+        conn.execute('ANALYZE')
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera um banco sintético para benchmarks")
+    parser.add_argument('path')
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--departments', type=int, default=5)
+    parser.add_argument('--activities', type=int, default=5000)
+    parser.add_argument('--years', type=int, default=2)
+    parser.add_argument('--logs-per-activity', type=float, default=2)
+    parser.add_argument('--comments-per-activity', type=float, default=0.5)
+    parser.add_argument('--tracking-per-activity', type=float, default=1.0)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--end-date', type=date.fromisoformat, default=None,
+                        help='último dia do período (AAAA-MM-DD); padrão: hoje')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    counts = generate_database(
+        args.path, users=args.users, departments=args.departments,
+        activities=args.activities, years=args.years,
+        logs_per_activity=args.logs_per_activity,
+        comments_per_activity=args.comments_per_activity,
+        tracking_per_activity=args.tracking_per_activity,
+        seed=args.seed, end_date=args.end_date)
+    print(f"Banco gerado em {time.perf_counter() - started:.1f}s: {counts}")
+
+if __name__ == '__main__':
+    main()
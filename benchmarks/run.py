@@ -0,0 +1,276 @@
+"""Suíte de benchmarks das funções de dados sobre bancos sintéticos.
+
+    python benchmarks/run.py                               # tamanhos small e medium
+    python benchmarks/run.py --sizes small,medium,large --save benchmarks/baselines/local.json
+    python benchmarks/run.py --compare benchmarks/baselines/local.json --threshold 0.25
+
+Cada tamanho roda em um processo próprio, que gera o banco (generate_data.py,
+semente fixa) e mede cada função com o cache de consultas limpo, ou seja, o
+custo real no SQLite. O resultado guardado é a mediana de --repeats execuções,
+após uma execução de aquecimento.
+
+No modo --compare, uma função é marcada como regressão quando a mediana fica
+mais de --threshold (fração) acima da linha de base e a diferença absoluta
+passa de --min-delta-ms, para não acusar ruído em funções de microssegundos.
+O processo termina com código 1 se houver regressões.
+
+Para incluir uma função, registre-a em BENCHMARKS com o decorador `benchmark`.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+SIZES = {
+    'small': dict(users=50, departments=5, activities=5000, years=1),
+    'medium': dict(users=200, departments=10, activities=50000, years=2),
+    'large': dict(users=1000, departments=25, activities=250000, years=3),
+}
+
+# nome -> (preparo, escrita?). O preparo recebe o contexto (ids do banco
+# gerado) e devolve a função sem argumentos que será medida.
+BENCHMARKS = {}
+
+def benchmark(name, writes=False):
+    def register(setup):
+        BENCHMARKS[name] = (setup, writes)
+        return setup
+    return register
+
+@benchmark('get_filtered_activities')
+def _(ctx):
+    return lambda: ctx.queries.get_filtered_activities("Todos", "Todos", "Todos")
+
+@benchmark('get_filtered_activities[dept,status]')
+def _(ctx):
+    return lambda: ctx.queries.get_filtered_activities(ctx.department, "Concluídas", "Todos")
+
+@benchmark('count_filtered_activities')
+def _(ctx):
+    return lambda: ctx.queries.count_filtered_activities("Todos", "Todos", "Todos")
+
+@benchmark('get_user_active_activities')
+def _(ctx):
+    return lambda: ctx.queries.get_user_active_activities(ctx.user_id)
+
+@benchmark('get_filtered_users')
+def _(ctx):
+    return lambda: ctx.queries.get_filtered_users("Todos", "Ativo", "")
+
+@benchmark('get_all_departments')
+def _(ctx):
+    return ctx.queries.get_all_departments
+
+@benchmark('get_realtime_activities')
+def _(ctx):
+    return lambda: list(ctx.queries.get_realtime_activities())
+
+@benchmark('get_global_snapshot')
+def _(ctx):
+    return ctx.queries.get_global_snapshot
+
+@benchmark('get_access_logs[30d]')
+def _(ctx):
+    return lambda: ctx.queries.get_access_logs(date.today() - timedelta(days=30), date.today())
+
+@benchmark('get_online_users')
+def _(ctx):
+    return ctx.queries.get_online_users
+
+@benchmark('get_activities_timeline_data')
+def _(ctx):
+    return ctx.charts.get_activities_timeline_data
+
+@benchmark('get_activities_timeline_bins')
+def _(ctx):
+    return ctx.charts.get_activities_timeline_bins
+
+@benchmark('get_productivity_data')
+def _(ctx):
+    return ctx.charts.get_productivity_data
+
+@benchmark('get_status_distribution_data')
+def _(ctx):
+    return ctx.charts.get_status_distribution_data
+
+@benchmark('get_department_performance_data')
+def _(ctx):
+    return ctx.charts.get_department_performance_data
+
+@benchmark('get_team_performance_data')
+def _(ctx):
+    return ctx.charts.get_team_performance_data
+
+@benchmark('get_team_workload_data')
+def _(ctx):
+    return ctx.charts.get_team_workload_data
+
+@benchmark('get_user_productivity_data')
+def _(ctx):
+    return lambda: ctx.charts.get_user_productivity_data(ctx.user_id)
+
+@benchmark('search_activities')
+def _(ctx):
+    return lambda: ctx.search.search_activities("cliente deploy")
+
+@benchmark('search_activities[filtros]')
+def _(ctx):
+    return lambda: ctx.search.search_activities("cliente", ctx.department, "Concluídas",
+                                                date.today() - timedelta(days=90), date.today())
+
+@benchmark('user_performance_report[365d]')
+def _(ctx):
+    return lambda: ctx.analytics.user_performance_report(date.today() - timedelta(days=364),
+                                                         date.today())
+
+@benchmark('completion_time_report[365d]')
+def _(ctx):
+    return lambda: ctx.analytics.completion_time_report(date.today() - timedelta(days=364),
+                                                        date.today())
+
+@benchmark('create_activity', writes=True)
+def _(ctx):
+    return lambda: ctx.queries.create_activity(ctx.user_id, "Benchmark", "Atividade de benchmark",
+                                               "Média", "Outro", 1.0, "")
+
+@benchmark('complete_activity', writes=True)
+def _(ctx):
+    pending = iter(ctx.open_activity_ids)
+    return lambda: ctx.queries.complete_activity(next(pending))
+
+class Context:
+    """Módulos da aplicação e ids de referência do banco gerado"""
+
+    def __init__(self, repeats):
+        from monitor_atividades import analytics, charts, db, queries, search
+        self.analytics = analytics
+        self.charts = charts
+        self.db = db
+        self.queries = queries
+        self.search = search
+        with db.db_read() as conn:
+            self.user_id, self.department = conn.execute(
+                '''SELECT user_id, u.department FROM activities a JOIN users u ON u.id = a.user_id
+                   GROUP BY user_id ORDER BY COUNT(*) DESC LIMIT 1''').fetchone()
+            self.open_activity_ids = [row[0] for row in conn.execute(
+                "SELECT id FROM activities WHERE status != 'concluida' ORDER BY id LIMIT ?",
+                (repeats + 1,))]
+
+def time_function(ctx, fn, writes, repeats):
+    samples = []
+    for i in range(repeats + 1):
+        if not writes:
+            ctx.db.get_query_cache().clear()
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        if i:  # a primeira execução é aquecimento
+            samples.append(elapsed)
+    return {'median_ms': statistics.median(samples) * 1000, 'min_ms': min(samples) * 1000}
+
+def run_worker(size, repeats, only):
+    """Executado no processo filho: gera o banco e mede as funções"""
+    import logging
+    logging.disable(logging.WARNING)
+    from generate_data import generate_database
+
+    path = os.path.join(tempfile.mkdtemp(prefix=f'bench-{size}-'), 'bench.db')
+    started = time.perf_counter()
+    counts = generate_database(path, **SIZES[size])
+    generation_s = time.perf_counter() - started
+
+    ctx = Context(repeats)
+    results = {}
+    for name, (setup, writes) in BENCHMARKS.items():
+        if only and name not in only:
+            continue
+        results[name] = time_function(ctx, setup(ctx), writes, repeats)
+    print(json.dumps({'counts': counts, 'generation_s': generation_s, 'results': results}))
+
+def run_size(size, repeats, only):
+    command = [sys.executable, os.path.abspath(__file__), '--worker', size,
+               '--repeats', str(repeats)]
+    if only:
+        command += ['--only', ','.join(only)]
+    output = subprocess.run(command, cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def compare(current, baseline, threshold, min_delta_ms):
+    """Lista (tamanho, função, base, atual, razão, regressão?) das medições em comum"""
+    rows = []
+    for size, data in current['sizes'].items():
+        base_results = baseline['sizes'].get(size, {}).get('results', {})
+        for name, result in data['results'].items():
+            if name not in base_results:
+                continue
+            base = base_results[name]['median_ms']
+            now = result['median_ms']
+            ratio = now / base if base else float('inf')
+            regression = ratio > 1 + threshold and now - base > min_delta_ms
+            rows.append((size, name, base, now, ratio, regression))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks das funções de dados")
+    parser.add_argument('--sizes', default='small,medium',
+                        help=f"tamanhos separados por vírgula ({', '.join(SIZES)})")
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--only', default='', help='funções separadas por vírgula')
+    parser.add_argument('--save', help='grava o resultado em JSON neste caminho')
+    parser.add_argument('--compare', help='JSON de linha de base para comparação')
+    parser.add_argument('--threshold', type=float, default=0.25)
+    parser.add_argument('--min-delta-ms', type=float, default=1.0)
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    only = [name for name in args.only.split(',') if name]
+
+    if args.worker:
+        run_worker(args.worker, args.repeats, only)
+        return
+
+    current = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeats': args.repeats,
+        'sizes': {},
+    }
+    for size in args.sizes.split(','):
+        print(f"== {size} {SIZES[size]}", flush=True)
+        data = run_size(size, args.repeats, only)
+        current['sizes'][size] = {'params': SIZES[size], **data}
+        print(f"   banco gerado em {data['generation_s']:.1f}s: {data['counts']}")
+        for name, result in data['results'].items():
+            print(f"   {name:<40} {result['median_ms']:10.2f} ms  (mín. {result['min_ms']:.2f})")
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, 'w') as f:
+            json.dump(current, f, indent=2, ensure_ascii=False)
+        print(f"Resultado gravado em {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = compare(current, baseline, args.threshold, args.min_delta_ms)
+        print(f"\nComparação com {args.compare} (limite +{args.threshold:.0%}):")
+        for size, name, base, now, ratio, regression in rows:
+            flag = 'REGRESSÃO' if regression else ''
+            print(f"   {size:<7} {name:<40} {base:10.2f} -> {now:10.2f} ms  x{ratio:5.2f}  {flag}")
+        regressions = [row for row in rows if row[-1]]
+        if regressions:
+            print(f"{len(regressions)} regressão(ões) acima do limite")
+            sys.exit(1)
+        print("Nenhuma regressão acima do limite")
+
+if __name__ == '__main__':
+    main()
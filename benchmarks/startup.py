@@ -0,0 +1,91 @@
+"""Benchmark de inicialização: tempo de import e primeira pintura do login.
+
+Cada medição roda em um interpretador novo (como um pod recém-criado), com um
+banco vazio em diretório temporário:
+
+    python benchmarks/startup.py [--runs 5] [--json]
+
+- import: tempo de `import monitor_atividades.app` (streamlit incluso)
+- primeira pintura: primeira execução do script até o formulário de login
+  estar renderizado (inclui migrações e criação do banco)
+- rerun: segunda execução na mesma sessão, já com tudo carregado
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY = os.path.join(ROOT, 'task-monitoring-app.py')
+HEAVY_MODULES = ['pandas', 'plotly.express', 'PIL.Image']
+
+IMPORT_PROBE = '''
+import json, sys, time
+start = time.perf_counter()
+import monitor_atividades.app
+elapsed = time.perf_counter() - start
+print(json.dumps({"import": elapsed,
+                  "heavy": [m for m in %r if m in sys.modules]}))
+''' % HEAVY_MODULES
+
+PAINT_PROBE = '''
+import json, sys, time, warnings
+warnings.filterwarnings("ignore")
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(%r, default_timeout=60)
+start = time.perf_counter()
+at.run()
+first = time.perf_counter() - start
+labels = [w.label for w in at.text_input]
+start = time.perf_counter()
+at.run()
+rerun = time.perf_counter() - start
+print(json.dumps({"first_paint": first, "rerun": rerun,
+                  "login_form": labels == ["Usuário", "Senha"],
+                  "exceptions": [e.value for e in at.exception],
+                  "heavy": [m for m in %r if m in sys.modules]}))
+''' % (ENTRY, HEAVY_MODULES)
+
+def run_probe(code):
+    env = dict(os.environ)
+    env['MONITOR_DB_PATH'] = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    env['PYTHONPATH'] = ROOT + os.pathsep + env.get('PYTHONPATH', '')
+    out = subprocess.run([sys.executable, '-c', code], env=env, cwd=ROOT,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+def measure(runs):
+    imports = [run_probe(IMPORT_PROBE) for _ in range(runs)]
+    paints = [run_probe(PAINT_PROBE) for _ in range(runs)]
+    return {
+        'runs': runs,
+        'import_s': statistics.median(r['import'] for r in imports),
+        'first_paint_s': statistics.median(r['first_paint'] for r in paints),
+        'rerun_s': statistics.median(r['rerun'] for r in paints),
+        'heavy_modules_after_import': imports[0]['heavy'],
+        'heavy_modules_on_login_page': paints[0]['heavy'],
+        'login_form_rendered': all(r['login_form'] and not r['exceptions'] for r in paints),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--json', action='store_true', help='saída em JSON')
+    args = parser.parse_args()
+    
+    result = measure(args.runs)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    print(f"import (mediana de {args.runs}):          {result['import_s'] * 1000:8.1f} ms")
+    print(f"primeira pintura do login:           {result['first_paint_s'] * 1000:8.1f} ms")
+    print(f"rerun do login:                      {result['rerun_s'] * 1000:8.1f} ms")
+    print(f"módulos pesados após o import:       {result['heavy_modules_after_import'] or '-'}")
+    print(f"módulos pesados na página de login:  {result['heavy_modules_on_login_page'] or '-'}")
+    print(f"formulário de login renderizado:     {'sim' if result['login_form_rendered'] else 'NÃO'}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+"""Sistema de monitoramento de atividades em equipe."""
@@ -0,0 +1,135 @@
+"""Análises dos relatórios, calculadas com operações vetorizadas do pandas."""
+
+import numpy as np
+import pandas as pd
+
+from .db import DB_TIMESTAMP_FORMAT, activities_source, cached_query, db_read, period_range
+
+# Cada relatório parte do mesmo frame: as atividades iniciadas ou concluídas
+# no período, lidas uma vez com as colunas tipadas (datas, categorias e
+# floats). O frame e os relatórios ficam no QueryCache, chaveados pelo
+# período e invalidados pela versão das tabelas.
+CATEGORY_COLUMNS = ('user', 'department', 'status', 'category', 'priority')
+# Faixas (horas) do histograma de tempo de conclusão
+COMPLETION_HOURS_BINS = [0, 1, 2, 4, 8, 16, 24, 48, 72, 168, np.inf]
+
+@cached_query('activities', 'users')
+def load_activity_frame(start_date, end_date, include_archive=False):
+    """Atividades iniciadas ou concluídas entre start_date e end_date (inclusive)"""
+    start, end = period_range(start_date, end_date)
+    query = f'''
+        SELECT a.id, a.user_id, COALESCE(u.full_name, u.username) as user,
+               COALESCE(NULLIF(u.department, ''), 'Sem departamento') as department,
+               a.status, COALESCE(a.category, '') as category, a.priority,
+               a.start_time, a.end_time, a.estimated_hours, a.actual_hours
+        FROM {activities_source(include_archive)} a
+        JOIN users u ON u.id = a.user_id
+        WHERE (a.start_time >= :start AND a.start_time < :end)
+           OR (a.end_time >= :start AND a.end_time < :end)
+    '''
+    with db_read() as conn:
+        c = conn.execute(query, {'start': start, 'end': end})
+        columns = [column[0] for column in c.description]
+        df = pd.DataFrame.from_records(c.fetchall(), columns=columns)
+
+    for column in CATEGORY_COLUMNS:
+        df[column] = df[column].astype('category')
+    for column in ('start_time', 'end_time'):
+        df[column] = pd.to_datetime(df[column], format=DB_TIMESTAMP_FORMAT)
+    for column in ('estimated_hours', 'actual_hours'):
+        df[column] = pd.to_numeric(df[column]).astype('float64')
+
+    period_start, period_end = pd.Timestamp(start), pd.Timestamp(end)
+    df['started'] = (df['start_time'] >= period_start) & (df['start_time'] < period_end)
+    df['completed'] = ((df['status'] == 'concluida')
+                       & (df['end_time'] >= period_start) & (df['end_time'] < period_end))
+    # Métricas de conclusão só valem para as concluídas no período (NaN nas demais)
+    elapsed = (df['end_time'] - df['start_time']).dt.total_seconds() / 3600
+    df['completion_hours'] = elapsed.where(df['completed'])
+    ratio = df['actual_hours'] / df['estimated_hours'].where(df['estimated_hours'] > 0)
+    df['estimate_ratio'] = ratio.where(df['completed'])
+    return df
+
+def period_weeks(start_date, end_date):
+    return ((end_date - start_date).days + 1) / 7
+
+def performance_by(df, key, weeks):
+    """Volume, conclusão e vazão agrupados por `key` (user_id ou department)"""
+    df = df.assign(
+        started_done=df['started'] & (df['status'] == 'concluida'),
+        completed_estimated=df['estimated_hours'].where(df['completed']),
+        completed_actual=df['actual_hours'].where(df['completed']),
+    )
+    grouped = df.groupby(key, observed=True)
+    result = grouped.agg(
+        activities=('started', 'sum'),
+        started_done=('started_done', 'sum'),
+        completed=('completed', 'sum'),
+        median_completion_hours=('completion_hours', 'median'),
+        median_estimate_ratio=('estimate_ratio', 'median'),
+        estimated_hours=('completed_estimated', 'sum'),
+        actual_hours=('completed_actual', 'sum'),
+    )
+    result['completion_rate'] = (result['started_done'] * 100.0
+                                 / result['activities'].where(result['activities'] > 0))
+    result['throughput_per_week'] = result['completed'] / weeks
+    return result.drop(columns='started_done')
+
+@cached_query('activities', 'users')
+def user_performance_report(start_date, end_date, include_archive=False):
+    """Por usuário: atividades iniciadas, concluídas, taxa, vazão semanal,
+    tempo mediano de conclusão e razão real/estimado"""
+    df = load_activity_frame(start_date, end_date, include_archive)
+    result = performance_by(df, 'user_id', period_weeks(start_date, end_date))
+    names = df.groupby('user_id', observed=True)[['user', 'department']].first()
+    result = names.join(result).reset_index()
+    return result.sort_values(['completed', 'activities'], ascending=False, ignore_index=True)
+
+@cached_query('activities', 'users')
+def department_report(start_date, end_date, include_archive=False):
+    """Por departamento: usuários com atividade, volume, conclusão e vazão"""
+    df = load_activity_frame(start_date, end_date, include_archive)
+    result = performance_by(df, 'department', period_weeks(start_date, end_date))
+    users = df.groupby('department', observed=True)['user_id'].nunique().rename('users')
+    result = result.join(users).reset_index()
+    return result.sort_values('completed', ascending=False, ignore_index=True)
+
+@cached_query('activities', 'users')
+def activities_by_period_report(start_date, end_date, include_archive=False):
+    """Atividades iniciadas por status e concluídas, por dia (até 31 dias) ou semana"""
+    df = load_activity_frame(start_date, end_date, include_archive)
+    freq = 'D' if (end_date - start_date).days < 31 else 'W-MON'
+    started = (df[df['started']]
+               .groupby([pd.Grouper(key='start_time', freq=freq, label='left', closed='left'),
+                         'status'], observed=True)
+               .size().unstack('status', fill_value=0))
+    completed = (df[df['completed']]
+                 .groupby(pd.Grouper(key='end_time', freq=freq, label='left', closed='left'))
+                 .size().rename('completed'))
+    started.index.name = completed.index.name = 'period'
+    result = started.join(completed, how='outer').fillna(0).astype('int64')
+    return result.reset_index()
+
+@cached_query('activities', 'users')
+def completion_time_report(start_date, end_date, include_archive=False):
+    """Distribuição do tempo de conclusão: quantis por categoria e histograma"""
+    df = load_activity_frame(start_date, end_date, include_archive)
+    done = df[df['completed']]
+    grouped = done.groupby('category', observed=True)
+    by_category = grouped.agg(
+        completed=('id', 'size'),
+        mean_hours=('completion_hours', 'mean'),
+        mean_actual_hours=('actual_hours', 'mean'),
+        median_estimate_ratio=('estimate_ratio', 'median'),
+    )
+    # reindex: sem concluídas no período o unstack não tem colunas
+    quantiles = (grouped['completion_hours'].quantile([0.5, 0.75, 0.9]).unstack()
+                 .reindex(columns=[0.5, 0.75, 0.9])
+                 .rename(columns={0.5: 'p50_hours', 0.75: 'p75_hours', 0.9: 'p90_hours'}))
+    by_category = by_category.join(quantiles).reset_index()
+
+    counts, edges = np.histogram(done['completion_hours'].to_numpy(), bins=COMPLETION_HOURS_BINS)
+    labels = [f"{low:g}–{high:g}h" if np.isfinite(high) else f"{low:g}h+"
+              for low, high in zip(edges[:-1], edges[1:])]
+    histogram = pd.DataFrame({'range': labels, 'completed': counts})
+    return {'by_category': by_category, 'histogram': histogram}
@@ -0,0 +1,50 @@
+"""Roteamento principal da aplicação."""
+
+import streamlit as st
+
+from .profiling import get_profiler
+from .schema import init_db
+from .queries import get_session_tracker, refresh_user_profile
+from .views.common import configure_page, show_login_page, show_user_profile
+
+# Função principal
+def main():
+    # Configuração inicial
+    configure_page()
+    # Aplica migrações e dados padrão (uma única vez por processo)
+    init_db()
+    
+    if 'user' not in st.session_state:
+        st.session_state.user = None
+    elif st.session_state.user is not None:
+        # O perfil só é relido se o usuário foi alterado desde o carregamento;
+        # removido ou desativado, a sessão é encerrada
+        profile = refresh_user_profile(st.session_state.user)
+        if profile is None or profile['status'] != 'active':
+            profile = None
+        st.session_state.user = profile
+    
+    # Mede o rerun inteiro quando o rastreamento está ligado (Configurações > Performance)
+    user = st.session_state.user
+    with get_profiler().rerun(user['role'] if user else 'login'):
+        # Verificação de sessão
+        if st.session_state.user is None:
+            show_login_page()
+        else:
+            # Registrar atividade da sessão (gravada em lote, não a cada rerun)
+            get_session_tracker().touch(st.session_state.user['id'])
+        
+            # Mostrar interface apropriada
+            show_user_profile()
+        
+            # As telas de cada perfil (e com elas pandas/plotly) só são importadas
+            # depois do login, para que a página de login abra sem carregá-las
+            if st.session_state.user['role'] == 'admin':
+                from .views.admin import show_admin_interface
+                show_admin_interface()
+            elif st.session_state.user['role'] == 'supervisor':
+                from .views.supervisor import show_supervisor_interface
+                show_supervisor_interface()
+            else:
+                from .views.user import show_user_interface
+                show_user_interface()
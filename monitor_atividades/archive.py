@@ -0,0 +1,132 @@
+"""Arquivamento das atividades concluídas antigas (camada fria).
+
+    python task-monitoring-app.py archive-activities
+    python task-monitoring-app.py archive-activities --days 180 --batch-size 1000
+
+Atividades concluídas há mais de ARCHIVE_AFTER_DAYS dias saem de activities
+(camada quente) para o banco de arquivo, anexado a todas as conexões como
+`archive` e com o mesmo esquema. Tags, comentários e registros de tempo vão
+junto, e o documento de busca da atividade é copiado para
+archive.activities_fts. O rollup diário não muda: ele continua contando as
+atividades arquivadas, e archive.activity_daily_stats guarda a parte delas
+para as contagens só da camada quente.
+
+Cada lote é uma transação de escrita curta; entre os lotes o lock de escrita
+fica livre para as demais escritas.
+"""
+
+import argparse
+import os
+import re
+import time
+from datetime import datetime, timedelta
+
+from .db import ID_LIST, archive_ready, db_read, db_write, id_list, to_db_timestamp
+from .rollup import rollup_add_where
+
+ARCHIVE_AFTER_DAYS = int(os.environ.get('MONITOR_ARCHIVE_AFTER_DAYS', '90'))
+ARCHIVE_BATCH_SIZE = int(os.environ.get('MONITOR_ARCHIVE_BATCH_SIZE', '500'))
+# Pausa entre lotes, para que outras escritas peguem o lock
+ARCHIVE_PAUSE_SECONDS = 0.01
+# Tabelas filhas movidas junto com a atividade (ligadas por activity_id)
+ARCHIVE_CHILD_TABLES = ('activity_tags', 'activity_comments', 'time_tracking')
+ARCHIVE_TABLES = ('activities',) + ARCHIVE_CHILD_TABLES + ('activity_daily_stats', 'activities_fts')
+ARCHIVE_WRITE_TABLES = ('activities',) + ARCHIVE_CHILD_TABLES
+
+# O sqlite_master guarda o CREATE sem IF NOT EXISTS e com o nome sem schema
+DDL_NAME = re.compile(r'^CREATE (VIRTUAL TABLE|TABLE|INDEX) (\w+)')
+
+def ensure_archive_schema():
+    """Cria no arquivo as tabelas e índices de ARCHIVE_TABLES copiando o DDL da
+    camada quente, e acrescenta as colunas que migrações posteriores criaram"""
+    with db_write() as conn:
+        ddl = conn.execute(f'''SELECT type, sql FROM main.sqlite_master
+                               WHERE tbl_name IN ({', '.join('?' * len(ARCHIVE_TABLES))})
+                               AND type IN ('table', 'index') AND sql IS NOT NULL
+                               ORDER BY type = 'index' ''', ARCHIVE_TABLES).fetchall()
+        for _, sql in ddl:
+            conn.execute(DDL_NAME.sub(r'CREATE \1 IF NOT EXISTS archive.\2', sql, count=1))
+
+        for table in ARCHIVE_TABLES:
+            if table == 'activities_fts':
+                continue
+            existing = {row[1] for row in conn.execute(f'PRAGMA archive.table_info({table})')}
+            for _, column, kind, _, default, _ in conn.execute(f'PRAGMA main.table_info({table})'):
+                if column not in existing:
+                    default = f' DEFAULT {default}' if default is not None else ''
+                    conn.execute(f'ALTER TABLE archive.{table} ADD COLUMN {column} {kind}{default}')
+
+def archive_cutoff(days=ARCHIVE_AFTER_DAYS):
+    return to_db_timestamp(datetime.now() - timedelta(days=days))
+
+def archive_batch(cutoff, batch_size=ARCHIVE_BATCH_SIZE):
+    """Move para o arquivo até `batch_size` atividades concluídas antes de
+    `cutoff`, em uma transação; devolve quantas foram movidas.
+
+    Com WAL, o commit é atômico em cada arquivo, mas não entre os dois: numa
+    queda no meio dele uma atividade pode ficar nos dois lados, e o próximo
+    lote a copia de novo (INSERT OR REPLACE) e a remove da camada quente.
+    """
+    with db_write(*ARCHIVE_WRITE_TABLES) as conn:
+        c = conn.cursor()
+        ids = [row[0] for row in c.execute('''SELECT id FROM main.activities
+                                              WHERE status = 'concluida' AND end_time < ?
+                                              ORDER BY end_time LIMIT ?''', (cutoff, batch_size))]
+        if not ids:
+            return 0
+        params = {'ids': id_list(ids)}
+
+        c.execute(f'INSERT OR REPLACE INTO archive.activities SELECT * FROM main.activities '
+                  f'WHERE id IN ({ID_LIST})', params)
+        for table in ARCHIVE_CHILD_TABLES:
+            c.execute(f'INSERT OR REPLACE INTO archive.{table} SELECT * FROM main.{table} '
+                      f'WHERE activity_id IN ({ID_LIST})', params)
+        c.execute(f'DELETE FROM archive.activities_fts WHERE rowid IN ({ID_LIST})', params)
+        c.execute(f'''INSERT INTO archive.activities_fts (rowid, activity, description, comments, tags)
+                      SELECT rowid, activity, description, comments, tags FROM main.activities_fts
+                      WHERE rowid IN ({ID_LIST})''', params)
+        rollup_add_where(c, f'a.id IN ({ID_LIST})', params, target='archive.activity_daily_stats')
+
+        # Atividades antes das filhas: assim os triggers de busca das filhas
+        # não remontam o documento de uma atividade que está saindo
+        c.execute(f'DELETE FROM main.activities WHERE id IN ({ID_LIST})', params)
+        for table in ARCHIVE_CHILD_TABLES:
+            c.execute(f'DELETE FROM main.{table} WHERE activity_id IN ({ID_LIST})', params)
+    return len(ids)
+
+def archive_activities(days=ARCHIVE_AFTER_DAYS, batch_size=ARCHIVE_BATCH_SIZE, progress=None):
+    """Arquiva, lote a lote, as atividades concluídas há mais de `days` dias;
+    devolve o total movido. `progress(total)` é chamado após cada lote."""
+    cutoff = archive_cutoff(days)
+    total = 0
+    while True:
+        moved = archive_batch(cutoff, batch_size)
+        if not moved:
+            return total
+        total += moved
+        if progress:
+            progress(total)
+        time.sleep(ARCHIVE_PAUSE_SECONDS)
+
+def archive_counts():
+    """(atividades na camada quente, atividades no arquivo)"""
+    with db_read() as conn:
+        hot = conn.execute('SELECT COUNT(*) FROM main.activities').fetchone()[0]
+        cold = (conn.execute('SELECT COUNT(*) FROM archive.activities').fetchone()[0]
+                if archive_ready(conn) else 0)
+    return hot, cold
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='task-monitoring-app.py archive-activities',
+                                     description="Move as atividades concluídas antigas "
+                                                 "para o banco de arquivo")
+    parser.add_argument('--days', type=int, default=ARCHIVE_AFTER_DAYS,
+                        help=f'idade mínima da conclusão, em dias (padrão: {ARCHIVE_AFTER_DAYS})')
+    parser.add_argument('--batch-size', type=int, default=ARCHIVE_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    total = archive_activities(args.days, args.batch_size)
+    hot, cold = archive_counts()
+    print(f"{total} atividades arquivadas em {time.perf_counter() - started:.1f}s "
+          f"(camada quente: {hot}, arquivo: {cold})")
@@ -0,0 +1,82 @@
+"""Feed de alterações (tabela changes, preenchida por triggers)."""
+
+import os
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from .db import ChangeRow, db_read, db_snapshot, db_write, iter_rows, to_db_timestamp
+
+# Cada escrita em atividades, usuários, departamentos e tabelas auxiliares
+# acrescenta (seq, tabela, id, operação, horário) em changes. Um consumidor
+# guarda o último seq que processou e pergunta só pelo que veio depois; se
+# nada mudou, pode pular a consulta completa. A compactação apaga as entradas
+# com mais de CHANGES_RETENTION_DAYS dias.
+CHANGES_RETENTION_DAYS = int(os.environ.get('MONITOR_CHANGES_RETENTION_DAYS', '7'))
+CHANGES_READ_LIMIT = 1000
+CHANGES_COMPACT_BATCH = 5000
+
+# truncated: parte das alterações posteriores a `after` já foi compactada e o
+# consumidor deve recarregar tudo em vez de aplicar o delta
+ChangeBatch = namedtuple('ChangeBatch', 'changes last_seq truncated')
+
+def change_sequence(conn):
+    # sqlite_sequence guarda o maior seq usado, mesmo depois da compactação
+    row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'changes'").fetchone()
+    return row[0] if row else 0
+
+def get_change_sequence():
+    """Último seq emitido (0 se o feed nunca recebeu alterações)"""
+    with db_read() as conn:
+        return change_sequence(conn)
+
+def tables_filter(tables):
+    if not tables:
+        return '', []
+    return f" AND table_name IN ({', '.join('?' for _ in tables)})", list(tables)
+
+def has_changes(after, tables=()):
+    """Há alterações depois de `after` (opcionalmente só nestas tabelas)?"""
+    if not tables:
+        return get_change_sequence() > after
+    where, params = tables_filter(tables)
+    with db_read() as conn:
+        return conn.execute(f'SELECT EXISTS (SELECT 1 FROM changes WHERE seq > ?{where})',
+                            [after] + params).fetchone()[0] == 1
+
+def read_changes(after, tables=(), limit=CHANGES_READ_LIMIT):
+    """Alterações com seq > `after`, em ordem, no máximo `limit` por chamada.
+
+    last_seq é o cursor para a próxima leitura: o seq da última alteração
+    devolvida ou, se o lote não encheu, o seq atual do feed (para não reler
+    entradas de outras tabelas).
+    """
+    where, params = tables_filter(tables)
+    # Seq atual, piso da compactação e linhas do mesmo snapshot: uma escrita ou
+    # compactação concorrente não abre buraco nem repete um intervalo
+    with db_snapshot() as conn:
+        current = change_sequence(conn)
+        oldest = conn.execute('SELECT MIN(seq) FROM changes').fetchone()[0]
+        changes = list(iter_rows(conn, ChangeRow, f'''
+            SELECT seq, table_name, row_id, op, changed_at
+            FROM changes
+            WHERE seq > ? AND seq <= ?{where}
+            ORDER BY seq
+            LIMIT ?
+        ''', [after, current] + params + [limit]))
+    # Sem entradas, tudo até o seq atual foi compactado
+    compacted_through = current if oldest is None else oldest - 1
+    last_seq = changes[-1].seq if len(changes) == limit else current
+    return ChangeBatch(changes, max(last_seq, after), after < compacted_through)
+
+def compact_changes(retention_days=CHANGES_RETENTION_DAYS, batch_size=CHANGES_COMPACT_BATCH):
+    """Apaga as entradas antigas em lotes (transações curtas); devolve quantas"""
+    cutoff = to_db_timestamp(datetime.now() - timedelta(days=retention_days))
+    deleted = 0
+    while True:
+        with db_write() as conn:
+            count = conn.execute('''DELETE FROM changes WHERE seq IN
+                                    (SELECT seq FROM changes WHERE changed_at < ?
+                                     ORDER BY seq LIMIT ?)''', (cutoff, batch_size)).rowcount
+        deleted += count
+        if count < batch_size:
+            return deleted
@@ -0,0 +1,378 @@
+"""Dados e gráficos dos dashboards, montados com pandas e plotly."""
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+from datetime import date, datetime, timedelta
+
+from .analytics import (
+    activities_by_period_report, completion_time_report, department_report,
+    user_performance_report
+)
+from .db import cached_query, db_read, period_range, to_db_timestamp
+from .profiling import get_profiler, profiled_view
+from .rollup import rollup_window_start
+
+# Linha do tempo: até TIMELINE_DETAIL_LIMIT atividades no período aparecem uma
+# a uma; acima disso o banco agrega por usuário ou departamento em intervalos
+# (dia ou semana) e o gráfico recebe no máximo TIMELINE_MAX_BARS barras. O
+# detalhamento de um grupo volta a mostrar as atividades, também limitadas.
+TIMELINE_WINDOWS = {"7 dias": 7, "30 dias": 30, "90 dias": 90}
+TIMELINE_GROUPS = {"Usuário": 'user', "Departamento": 'department'}
+TIMELINE_DETAIL_LIMIT = 300
+TIMELINE_MAX_BARS = 1500
+TIMELINE_OTHERS = "Outros"
+
+_TIMELINE_GROUP_COLUMNS = {
+    'user': "COALESCE(u.full_name, u.username)",
+    'department': "COALESCE(NULLIF(u.department, ''), 'Sem departamento')",
+}
+
+def timeline_bin_days(days):
+    """Largura do intervalo de agregação: dia para até um mês, senão semana"""
+    return 1 if days <= 31 else 7
+
+def timeline_where(days, group_by=None, group=None):
+    """Filtro (início da atividade dentro dos últimos `days` dias, opcionalmente de um grupo)"""
+    today = date.today()
+    where = 'a.start_time >= ? AND a.start_time < ?'
+    params = list(period_range(today - timedelta(days=days - 1), today))
+    if group_by and group is not None:
+        where += f' AND {_TIMELINE_GROUP_COLUMNS[group_by]} = ?'
+        params.append(group)
+    return where, params
+
+# Dados dos gráficos
+@cached_query('activities', 'users', per_day=True)
+def count_timeline_activities(days=30, group_by=None, group=None):
+    where, params = timeline_where(days, group_by, group)
+    with db_read() as conn:
+        return conn.execute(f'''SELECT COUNT(*) FROM activities a
+                                JOIN users u ON a.user_id = u.id WHERE {where}''',
+                            params).fetchone()[0]
+
+@cached_query('activities', 'users', per_day=True)
+def get_activities_timeline_data(days=30, group_by=None, group=None, limit=TIMELINE_DETAIL_LIMIT):
+    """Atividades individuais do período (as `limit` mais recentes).
+
+    end_time fica nulo para atividades em aberto; quem desenha usa o horário atual.
+    """
+    where, params = timeline_where(days, group_by, group)
+    with db_read() as conn:
+        query = f'''
+            SELECT 
+                a.activity,
+                a.start_time,
+                a.end_time,
+                a.status,
+                COALESCE(u.full_name, u.username) as user
+            FROM activities a
+            JOIN users u ON a.user_id = u.id
+            WHERE {where}
+            ORDER BY a.start_time DESC
+            LIMIT ?
+        '''
+        df = pd.read_sql_query(query, conn, params=params + [limit])
+    return df
+
+@cached_query('activities', 'users', per_day=True)
+def get_activities_timeline_bins(days=30, group_by='user'):
+    """Atividades por grupo e intervalo: group, bin_start, bin_end, activities, completed"""
+    where, params = timeline_where(days)
+    if timeline_bin_days(days) == 1:
+        bin_expr = 'substr(a.start_time, 1, 10)'
+    else:
+        # Segunda-feira da semana de início
+        bin_expr = "date(a.start_time, '-6 days', 'weekday 1')"
+    with db_read() as conn:
+        query = f'''
+            SELECT 
+                {_TIMELINE_GROUP_COLUMNS[group_by]} as "group",
+                {bin_expr} as bin_start,
+                COUNT(*) as activities,
+                SUM(a.status = 'concluida') as completed
+            FROM activities a
+            JOIN users u ON a.user_id = u.id
+            WHERE {where}
+            GROUP BY 1, 2
+        '''
+        df = pd.read_sql_query(query, conn, params=params)
+    df['bin_start'] = pd.to_datetime(df['bin_start'])
+    df['bin_end'] = df['bin_start'] + pd.Timedelta(days=timeline_bin_days(days))
+    return df
+
+def limit_timeline_groups(bins, days, max_bars=TIMELINE_MAX_BARS):
+    """Mantém os grupos com mais atividades e junta o restante em "Outros"
+    para que o gráfico tenha no máximo `max_bars` barras"""
+    bin_count = -(-days // timeline_bin_days(days)) + 1
+    max_groups = max(2, max_bars // bin_count)
+    totals = bins.groupby('group')['activities'].sum().sort_values(ascending=False)
+    if len(totals) <= max_groups:
+        return bins
+    kept = bins['group'].isin(totals.index[:max_groups - 1])
+    others = (bins[~kept].groupby(['bin_start', 'bin_end'], as_index=False)
+              [['activities', 'completed']].sum())
+    others['group'] = f"{TIMELINE_OTHERS} ({len(totals) - max_groups + 1})"
+    return pd.concat([bins[kept], others], ignore_index=True)
+
+@cached_query('activity_daily_stats')
+def get_department_performance_data():
+    with db_read() as conn:
+        query = '''
+            SELECT 
+                NULLIF(department, '') as department,
+                SUM(CASE WHEN status='concluida' THEN activity_count ELSE 0 END) * 100.0
+                    / SUM(activity_count) as completion_rate
+            FROM activity_daily_stats
+            WHERE user_id != 0
+            GROUP BY department
+            HAVING SUM(activity_count) > 0
+        '''
+        df = pd.read_sql_query(query, conn)
+    return df
+
+@cached_query('activity_daily_stats', per_day=True)
+def get_productivity_data():
+    with db_read() as conn:
+        query = '''
+            SELECT 
+                day as date,
+                SUM(activity_count) as tasks_completed
+            FROM activity_daily_stats
+            WHERE status='concluida'
+            AND day >= ?
+            GROUP BY day
+            ORDER BY day
+        '''
+        df = pd.read_sql_query(query, conn, params=[rollup_window_start(30)])
+    return df
+
+@cached_query('activity_daily_stats')
+def get_status_distribution_data():
+    with db_read() as conn:
+        query = '''
+            SELECT 
+                status,
+                SUM(activity_count) as count
+            FROM activity_daily_stats
+            GROUP BY status
+            HAVING SUM(activity_count) > 0
+        '''
+        df = pd.read_sql_query(query, conn)
+    return df
+
+@cached_query('activity_daily_stats', per_day=True)
+def get_user_productivity_data(user_id):
+    with db_read() as conn:
+        query = '''
+            SELECT 
+                day as date,
+                SUM(activity_count) as completed
+            FROM activity_daily_stats
+            WHERE user_id=? AND status='concluida'
+            AND day >= ?
+            GROUP BY day
+            ORDER BY day
+        '''
+        df = pd.read_sql_query(query, conn, params=[user_id, rollup_window_start(30)])
+    return df
+
+@cached_query('activity_daily_stats')
+def get_user_status_distribution(user_id):
+    with db_read() as conn:
+        query = '''
+            SELECT status, SUM(activity_count) as count
+            FROM activity_daily_stats
+            WHERE user_id=?
+            GROUP BY status
+            HAVING SUM(activity_count) > 0
+        '''
+        df = pd.read_sql_query(query, conn, params=[user_id])
+    return df
+
+@cached_query('users', 'activity_daily_stats')
+def get_team_performance_data():
+    with db_read() as conn:
+        query = '''
+            SELECT 
+                u.full_name as user,
+                COALESCE(SUM(CASE WHEN s.status='concluida' THEN s.activity_count ELSE 0 END) * 100.0
+                         / SUM(s.activity_count), 0) as completion_rate
+            FROM users u
+            LEFT JOIN activity_daily_stats s ON u.id = s.user_id
+            GROUP BY u.id, u.full_name
+        '''
+        df = pd.read_sql_query(query, conn)
+    return df
+
+@cached_query('users', 'activity_daily_stats')
+def get_team_workload_data():
+    with db_read() as conn:
+        query = '''
+            SELECT 
+                u.full_name as user,
+                SUM(s.activity_count) as activities
+            FROM users u
+            JOIN activity_daily_stats s ON u.id = s.user_id
+            WHERE s.status = 'em_andamento'
+            GROUP BY u.id, u.full_name
+            HAVING SUM(s.activity_count) > 0
+        '''
+        df = pd.read_sql_query(query, conn)
+    return df
+
+# Gráficos
+@profiled_view
+def show_user_productivity_chart(user_id):
+    st.subheader("Produtividade")
+    df = get_user_productivity_data(user_id)
+    with get_profiler().plotly():
+        fig = px.line(df, x='date', y='completed',
+                      title='Atividades Concluídas por Dia')
+    st.plotly_chart(fig)
+
+@profiled_view
+def show_user_status_distribution(user_id):
+    st.subheader("Status das Atividades")
+    df = get_user_status_distribution(user_id)
+    with get_profiler().plotly():
+        fig = px.pie(df, values='count', names='status',
+                     title='Distribuição por Status')
+    st.plotly_chart(fig)
+
+@profiled_view
+def show_team_performance():
+    st.subheader("📈 Performance da Equipe")
+    df = get_team_performance_data()
+    with get_profiler().plotly():
+        fig = px.bar(df, x='user', y='completion_rate',
+                     title='Taxa de Conclusão por Membro')
+    st.plotly_chart(fig)
+
+@profiled_view
+def show_team_workload():
+    st.subheader("⚖️ Distribuição de Carga")
+    df = get_team_workload_data()
+    with get_profiler().plotly():
+        fig = px.pie(df, values='activities', names='user',
+                     title='Distribuição de Atividades')
+    st.plotly_chart(fig)
+
+@profiled_view
+def show_activities_timeline():
+    st.subheader("Timeline de Atividades")
+    col1, col2, col3 = st.columns(3)
+    days = TIMELINE_WINDOWS[col1.selectbox("Período", list(TIMELINE_WINDOWS), index=1,
+                                           key='timeline_window')]
+    label = col2.selectbox("Agrupar por", list(TIMELINE_GROUPS), key='timeline_group_by')
+    group_by = TIMELINE_GROUPS[label]
+    
+    total = count_timeline_activities(days)
+    if total <= TIMELINE_DETAIL_LIMIT:
+        show_timeline_detail(days)
+        return
+    
+    bins = get_activities_timeline_bins(days, group_by)
+    groups = bins.groupby('group')['activities'].sum().sort_values(ascending=False)
+    group = col3.selectbox(f"Detalhar {label.lower()}", ["Todos"] + list(groups.index),
+                           key='timeline_drill')
+    if group != "Todos":
+        show_timeline_detail(days, group_by, group)
+        return
+    
+    bins = limit_timeline_groups(bins, days)
+    with get_profiler().plotly():
+        fig = px.timeline(bins, x_start='bin_start', x_end='bin_end', y='group',
+                          color='activities', hover_data=['completed'],
+                          labels={'group': label, 'activities': 'Atividades',
+                                  'completed': 'Concluídas'})
+        fig.update_yaxes(categoryorder='total ascending')
+    st.plotly_chart(fig)
+    period = "dia" if timeline_bin_days(days) == 1 else "semana"
+    st.caption(f"{total} atividades agregadas por {label.lower()} e {period}. "
+               f"Escolha um item em \"Detalhar\" para ver as atividades.")
+
+def show_timeline_detail(days, group_by=None, group=None):
+    df = get_activities_timeline_data(days, group_by, group)
+    if df.empty:
+        st.info("Nenhuma atividade no período.")
+        return
+    df = df.assign(end_time=df['end_time'].fillna(to_db_timestamp(datetime.now())))
+    with get_profiler().plotly():
+        fig = px.timeline(df, x_start='start_time', x_end='end_time',
+                         y='activity', color='status', hover_data=['user'])
+    st.plotly_chart(fig)
+    total = count_timeline_activities(days, group_by, group) if group is not None else len(df)
+    if total > len(df):
+        st.caption(f"Mostrando as {len(df)} atividades mais recentes de {total}.")
+
+@profiled_view
+def show_department_performance():
+    st.subheader("Performance por Departamento")
+    df = get_department_performance_data()
+    with get_profiler().plotly():
+        fig = px.bar(df, x='department', y='completion_rate',
+                     title='Taxa de Conclusão por Departamento')
+    st.plotly_chart(fig)
+
+@profiled_view
+def show_productivity_metrics():
+    st.subheader("Métricas de Produtividade")
+    df = get_productivity_data()
+    with get_profiler().plotly():
+        fig = px.line(df, x='date', y='tasks_completed',
+                      title='Atividades Concluídas por Dia')
+    st.plotly_chart(fig)
+
+@profiled_view
+def show_status_distribution():
+    st.subheader("Distribuição de Status")
+    df = get_status_distribution_data()
+    with get_profiler().plotly():
+        fig = px.pie(df, values='count', names='status',
+                     title='Distribuição de Status das Atividades')
+    st.plotly_chart(fig)
+
+@profiled_view
+def show_report_analysis(name, start_date, end_date, include_archive=False):
+    """Análise do relatório `name` (chave de reports.REPORTS) no período.
+    Devolve False quando não há dados."""
+    if name == 'tempo-conclusao':
+        result = completion_time_report(start_date, end_date, include_archive)
+        if result['by_category'].empty:
+            return False
+        with get_profiler().plotly():
+            fig = px.bar(result['histogram'], x='range', y='completed',
+                         title='Atividades Concluídas por Tempo de Conclusão')
+        st.plotly_chart(fig)
+        st.dataframe(result['by_category'].round(2), hide_index=True)
+        return True
+    
+    if name == 'atividades':
+        df = activities_by_period_report(start_date, end_date, include_archive)
+        if df.empty:
+            return False
+        with get_profiler().plotly():
+            fig = px.bar(df, x='period', y=[c for c in df.columns if c not in ('period', 'completed')],
+                         title='Atividades Iniciadas por Status')
+            fig.add_scatter(x=df['period'], y=df['completed'], name='concluídas no período')
+        st.plotly_chart(fig)
+    elif name == 'usuarios':
+        df = user_performance_report(start_date, end_date, include_archive)
+        if df.empty:
+            return False
+        with get_profiler().plotly():
+            fig = px.scatter(df, x='throughput_per_week', y='median_completion_hours',
+                             size='activities', color='department', hover_name='user',
+                             title='Vazão Semanal x Tempo Mediano de Conclusão')
+        st.plotly_chart(fig)
+    else:
+        df = department_report(start_date, end_date, include_archive)
+        if df.empty:
+            return False
+        with get_profiler().plotly():
+            fig = px.bar(df, x='department', y='throughput_per_week', color='completion_rate',
+                         title='Vazão Semanal por Departamento')
+        st.plotly_chart(fig)
+    st.dataframe(df.round(2), hide_index=True)
+    return True
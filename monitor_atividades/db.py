@@ -0,0 +1,459 @@
+"""Conexões SQLite, timestamps, cache de consultas e tipos de linha."""
+
+import streamlit as st
+from datetime import date, datetime, timedelta
+import sqlite3
+import os
+import queue
+import re
+import sys
+import threading
+import functools
+import json
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from .profiling import TracedConnection
+
+# Configuração da conexão com o banco de dados
+DB_PATH = os.environ.get('MONITOR_DB_PATH', 'team_activities.db')
+DB_BUSY_TIMEOUT_MS = int(os.environ.get('MONITOR_DB_BUSY_TIMEOUT_MS', '5000'))
+DB_CACHE_SIZE_KB = int(os.environ.get('MONITOR_DB_CACHE_SIZE_KB', '16384'))
+DB_MMAP_SIZE = int(os.environ.get('MONITOR_DB_MMAP_SIZE', str(256 * 1024 * 1024)))
+DB_READ_POOL_SIZE = int(os.environ.get('MONITOR_DB_READ_POOL_SIZE', '16'))
+# Banco de arquivo (atividades concluídas antigas, ver archive.py), anexado a
+# todas as conexões com o nome `archive`
+ARCHIVE_DB_PATH = os.environ.get('MONITOR_ARCHIVE_DB_PATH',
+                                 os.path.splitext(DB_PATH)[0] + '_archive.db')
+
+class ConnectionManager:
+    """Gerencia as conexões SQLite compartilhadas por todas as sessões do processo.
+
+    Leituras usam um pool de conexões reutilizáveis (o Streamlit executa cada
+    rerun em uma thread nova, então conexões por thread seriam descartadas a
+    cada clique). Escritas passam por uma única conexão protegida por lock e
+    sempre abrem a transação com BEGIN IMMEDIATE, evitando "database is locked"
+    na promoção de lock de leitura para escrita.
+    """
+
+    def __init__(self, path, read_pool_size=DB_READ_POOL_SIZE, attachments=None):
+        self.path = path
+        # nome do schema -> caminho, anexados (ATTACH) a cada conexão
+        self.attachments = dict(attachments or {})
+        self._read_pool = queue.LifoQueue(maxsize=read_pool_size)
+        self._writer = None
+        self._write_lock = threading.RLock()
+        self._pending_tables = set()
+        # Chamados com o conjunto de tabelas alteradas após cada commit
+        self.commit_listeners = []
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.path,
+            timeout=DB_BUSY_TIMEOUT_MS / 1000,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=256,
+            factory=TracedConnection,
+        )
+        conn.execute(f'PRAGMA busy_timeout={DB_BUSY_TIMEOUT_MS}')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA cache_size=-{DB_CACHE_SIZE_KB}')
+        conn.execute(f'PRAGMA mmap_size={DB_MMAP_SIZE}')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        self._attach(conn, self.attachments)
+        return conn
+
+    @staticmethod
+    def _attach(conn, attachments):
+        for name, path in attachments.items():
+            conn.execute('ATTACH DATABASE ? AS ' + name, (path,))
+
+    @staticmethod
+    def _detach(conn, attachments):
+        attached = {row[1] for row in conn.execute('PRAGMA database_list')}
+        for name in attachments:
+            if name in attached:
+                conn.execute('DETACH DATABASE ' + name)
+
+    def _get_writer(self):
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = self._connect()
+                self._writer.execute('PRAGMA journal_mode=WAL')
+                for name in self.attachments:
+                    self._writer.execute(f'PRAGMA {name}.journal_mode=WAL')
+            return self._writer
+
+    @contextmanager
+    def read(self, attach=None):
+        """Empresta uma conexão de leitura do pool.
+
+        `attach` (nome do schema -> caminho) anexa arquivos só durante o bloco.
+        """
+        if self._writer is None:
+            # Garante que o arquivo já esteja em modo WAL antes da primeira leitura
+            self._get_writer()
+        try:
+            conn = self._read_pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            if attach:
+                self._attach(conn, attach)
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            try:
+                if attach:
+                    self._detach(conn, attach)
+                self._read_pool.put_nowait(conn)
+            except (queue.Full, sqlite3.Error):
+                conn.close()
+
+    @contextmanager
+    def write(self, tables=(), attach=None):
+        """Executa o bloco em uma transação de escrita serializada.
+
+        `tables` lista as tabelas alteradas pelo bloco; elas são repassadas aos
+        commit_listeners depois do commit. Chamadas aninhadas na mesma thread
+        reaproveitam a transação externa. `attach` (nome do schema -> caminho)
+        anexa arquivos, em modo WAL, só durante a transação; o SQLite não
+        permite ATTACH dentro de uma transação, então não vale em chamadas
+        aninhadas.
+        """
+        with self._write_lock:
+            conn = self._get_writer()
+            self._pending_tables.update(tables)
+            if conn.in_transaction:
+                yield conn
+                return
+            if attach:
+                self._attach(conn, attach)
+                for name in attach:
+                    conn.execute(f'PRAGMA {name}.journal_mode=WAL')
+            try:
+                conn.execute('BEGIN IMMEDIATE')
+                try:
+                    yield conn
+                except BaseException:
+                    conn.rollback()
+                    self._pending_tables = set()
+                    raise
+                else:
+                    conn.commit()
+                    changed, self._pending_tables = self._pending_tables, set()
+                    for listener in self.commit_listeners:
+                        listener(changed)
+            finally:
+                if attach:
+                    self._detach(conn, attach)
+
+    def close(self):
+        """Fecha todas as conexões abertas; elas são reabertas sob demanda."""
+        with self._write_lock:
+            while True:
+                try:
+                    self._read_pool.get_nowait().close()
+                except queue.Empty:
+                    break
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+@st.cache_resource
+def get_db():
+    """Retorna o gerenciador de conexões do processo (compartilhado entre reruns)"""
+    return ConnectionManager(DB_PATH, attachments={'archive': ARCHIVE_DB_PATH})
+
+def db_read():
+    return get_db().read()
+
+@contextmanager
+def db_snapshot():
+    """Como db_read, mas dentro de uma transação de leitura: todas as consultas
+    do bloco veem o mesmo estado do banco, sem as escritas feitas nesse meio-tempo"""
+    with db_read() as conn:
+        conn.execute('BEGIN')
+        try:
+            yield conn
+        finally:
+            conn.execute('COMMIT')
+
+def db_write(*tables):
+    """Transação de escrita; informe as tabelas alteradas para invalidar o cache"""
+    return get_db().write(tables)
+
+# Atividades das duas camadas (quente e arquivo); a coluna `archived` indica
+# de onde veio cada linha. Os dois lados têm as mesmas colunas, na mesma ordem
+# (archive.ensure_archive_schema).
+ALL_ACTIVITIES = '''(SELECT *, 0 AS archived FROM main.activities
+                     UNION ALL
+                     SELECT *, 1 AS archived FROM archive.activities)'''
+
+def activities_source(include_archive=False):
+    """Tabela de atividades para o FROM de uma consulta"""
+    return ALL_ACTIVITIES if include_archive else 'main.activities'
+
+# O rollup da camada quente (main.activity_daily_stats) conta também as
+# atividades arquivadas; sem o arquivo, desconta-se a parte delas, guardada em
+# archive.activity_daily_stats com as mesmas chaves.
+HOT_DAILY_STATS = '''(SELECT day, user_id, department, category, status,
+                             SUM(activity_count) AS activity_count,
+                             SUM(estimated_hours) AS estimated_hours,
+                             SUM(actual_hours) AS actual_hours
+                      FROM (SELECT day, user_id, department, category, status,
+                                   activity_count, estimated_hours, actual_hours
+                            FROM main.activity_daily_stats
+                            UNION ALL
+                            SELECT day, user_id, department, category, status,
+                                   -activity_count, -estimated_hours, -actual_hours
+                            FROM archive.activity_daily_stats)
+                      GROUP BY day, user_id, department, category, status
+                      HAVING SUM(activity_count) != 0)'''
+
+def daily_stats_source(include_archive=False):
+    """Tabela do rollup diário para o FROM de uma consulta"""
+    return 'main.activity_daily_stats' if include_archive else HOT_DAILY_STATS
+
+def archive_ready(conn):
+    """Se o esquema do arquivo já foi criado (init_db)"""
+    return conn.execute("SELECT 1 FROM archive.sqlite_master "
+                        "WHERE type = 'table' AND name = 'activities'").fetchone() is not None
+
+# Listas de ids nas consultas: `IN (ID_LIST)` com o parâmetro :ids = id_list(ids),
+# um array JSON ligado como valor, em vez de montar o SQL com os ids
+ID_LIST = 'SELECT value FROM json_each(:ids)'
+
+def id_list(ids):
+    """Array JSON dos ids convertidos para int (ordenado, sem repetição);
+    levanta ValueError/TypeError para ids que não são inteiros"""
+    return json.dumps(sorted({int(value) for value in ids}))
+
+# Formato canônico dos timestamps no banco: texto em horário local, com
+# precisão de segundos. É ordenável lexicograficamente, então filtros por
+# período viram buscas por intervalo nos índices.
+DB_TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+def to_db_timestamp(value):
+    """Converte datetime/date para o formato canônico do banco"""
+    if isinstance(value, datetime):
+        return value.strftime(DB_TIMESTAMP_FORMAT)
+    return datetime.combine(value, datetime.min.time()).strftime(DB_TIMESTAMP_FORMAT)
+
+sqlite3.register_adapter(datetime, to_db_timestamp)
+sqlite3.register_adapter(date, to_db_timestamp)
+
+def day_range(day=None):
+    """Intervalo semiaberto [início do dia, início do dia seguinte)"""
+    day = day or datetime.now().date()
+    return to_db_timestamp(day), to_db_timestamp(day + timedelta(days=1))
+
+def period_range(start_date, end_date):
+    """Intervalo semiaberto cobrindo os dias de start_date até end_date, inclusive"""
+    return to_db_timestamp(start_date), to_db_timestamp(end_date + timedelta(days=1))
+
+# Termos da busca textual: palavras (letras, dígitos e _), sem aspas nem
+# operadores, então o texto digitado nunca vira sintaxe do FTS5
+FTS_TERM = re.compile(r'\w+')
+
+def fts_match(text):
+    """Expressão MATCH do FTS5 para o texto digitado: todos os termos, cada um
+    como prefixo. None quando não há termos."""
+    terms = FTS_TERM.findall(text or '')
+    return ' '.join(f'"{term}"*' for term in terms) or None
+
+# Cache de resultados de consultas compartilhado por todas as sessões
+QUERY_CACHE_MAX_MB = int(os.environ.get('MONITOR_QUERY_CACHE_MB', '64'))
+
+def estimate_size(value):
+    """Estimativa (em bytes) da memória ocupada por um resultado de consulta"""
+    if hasattr(value, 'memory_usage'):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v)
+                                          for k, v in value.items())
+    if isinstance(value, Row):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value.values())
+    return sys.getsizeof(value)
+
+class QueryCache:
+    """Cache LRU limitado por memória, invalidado por versão de tabela.
+
+    Cada tabela tem um contador de versão incrementado após todo commit que a
+    altera. Uma entrada guarda as versões das tabelas das quais depende no
+    momento em que a consulta foi executada e só é válida enquanto elas não
+    mudarem; não há expiração por tempo. Os contadores são do processo:
+    escritas feitas por outros processos no mesmo arquivo não são vistas.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.versions = {}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def bump(self, tables):
+        with self._lock:
+            for table in tables:
+                self.versions[table] = self.versions.get(table, 0) + 1
+
+    def _versions_for(self, tables):
+        return tuple(self.versions.get(table, 0) for table in tables)
+
+    def _discard(self, key):
+        _, _, size = self._entries.pop(key)
+        self.current_bytes -= size
+
+    def get_or_compute(self, key, tables, compute):
+        with self._lock:
+            versions = self._versions_for(tables)
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] == versions:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                self._discard(key)
+                self.invalidations += 1
+            self.misses += 1
+        
+        # A consulta roda fora do lock; o resultado fica associado às versões
+        # lidas antes dela, então uma escrita concorrente apenas o invalida
+        value = compute()
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return value
+        
+        with self._lock:
+            if key in self._entries:
+                self._discard(key)
+            self._entries[key] = (versions, value, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits * 100.0 / lookups if lookups else 0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'versions': dict(self.versions),
+            }
+
+@st.cache_resource
+def get_query_cache():
+    cache = QueryCache(QUERY_CACHE_MAX_MB * 1024 * 1024)
+    get_db().commit_listeners.append(cache.bump)
+    return cache
+
+def cached_query(*tables, per_day=False):
+    """Decorador: guarda o resultado da função no QueryCache.
+
+    `tables` são as tabelas lidas pela consulta. Use per_day=True quando o
+    resultado depende da data atual (janelas "hoje"/"últimos N dias").
+    Os resultados são compartilhados entre sessões e não devem ser alterados
+    por quem os recebe.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (func.__name__, args, tuple(sorted(kwargs.items())))
+            if per_day:
+                key += (date.today(),)
+            return get_query_cache().get_or_compute(key, tables, lambda: func(*args, **kwargs))
+        return wrapper
+    return decorator
+
+# Linhas de resultado para listas e telas de detalhe. Cada consulta monta os
+# objetos direto do cursor (row factory), sem passar por um DataFrame; pandas
+# fica restrito aos dados que vão para gráficos.
+class Row:
+    """Linha com atributos fixos (__slots__) e acesso também por row['coluna']"""
+    __slots__ = ()
+
+    @classmethod
+    def from_cursor(cls, cursor, values):
+        row = cls.__new__(cls)
+        for column, value in zip(cursor.description, values):
+            setattr(row, column[0], value)
+        return row
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def keys(self):
+        return [name for name in self.__slots__ if hasattr(self, name)]
+
+    def values(self):
+        return [getattr(self, name) for name in self.keys()]
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.keys()}
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.as_dict()!r})"
+
+class ActivityRow(Row):
+    __slots__ = ('id', 'user_id', 'activity', 'description', 'status', 'priority',
+                 'category', 'start_time', 'end_time', 'estimated_hours', 'actual_hours',
+                 'comments', 'attachments', 'last_updated', 'tracked_hours', 'wall_clock_hours',
+                 'full_name', 'archived')
+
+class UserRow(Row):
+    __slots__ = ('id', 'username', 'role', 'full_name', 'email', 'department',
+                 'last_login', 'last_seen', 'created_at', 'status')
+
+class DepartmentRow(Row):
+    __slots__ = ('id', 'name', 'description', 'created_at', 'user_count', 'active_tasks')
+
+class ChangeRow(Row):
+    __slots__ = ('seq', 'table_name', 'row_id', 'op', 'changed_at')
+
+class ActivitySearchRow(Row):
+    __slots__ = ('id', 'activity', 'status', 'priority', 'category', 'start_time', 'end_time',
+                 'full_name', 'department', 'snippet', 'archived')
+
+class UserSearchRow(Row):
+    __slots__ = ('id', 'username', 'full_name', 'email', 'department', 'role', 'status',
+                 'snippet')
+
+def iter_rows(conn, row_type, query, params=()):
+    """Gera as linhas da consulta sob demanda, já como `row_type`"""
+    c = conn.cursor()
+    c.row_factory = row_type.from_cursor
+    yield from c.execute(query, params)
+
+def query_rows(row_type, query, params=()):
+    """Como iter_rows, mas com uma conexão de leitura própria, devolvida ao pool
+    quando a iteração termina"""
+    with db_read() as conn:
+        yield from iter_rows(conn, row_type, query, params)
@@ -0,0 +1,269 @@
+"""Grafo de dependências entre atividades (activity_dependencies), em memória.
+
+Uma linha (activity_id, depends_on) diz que activity_id só pode ser feita
+depois de depends_on. As arestas são carregadas uma vez por processo em listas
+de adjacência e mantidas pelo feed de alterações (changes.py): a cada consulta
+o grafo aplica só o que mudou em activities e activity_dependencies desde o
+último seq visto. Inserções passam por add_dependencies, que recusa ciclos.
+
+Uma atividade está concluída quando tem status concluida, foi arquivada ou não
+existe mais; dependências concluídas não bloqueiam. Bloqueios, atividades
+prontas e caminho crítico (soma de estimated_hours das atividades abertas) são
+calculados em tempo linear e guardados até a próxima mudança no grafo.
+"""
+
+import streamlit as st
+import threading
+from collections import Counter, defaultdict, deque, namedtuple
+
+from .changes import get_change_sequence, read_changes
+from .db import ID_LIST, archive_ready, db_read, db_write, id_list
+
+# Acima disso, recarregar o grafo é mais barato que ler o feed
+GRAPH_RELOAD_CHANGES = 5000
+GRAPH_SYNC_BATCH = 1000
+
+# status None: atividade excluída
+DependencyNode = namedtuple('DependencyNode', 'id activity status estimated_hours archived')
+# hours[id]: horas do caminho crítico que termina na atividade; previous[id]:
+# a dependência anterior nesse caminho
+DependencyAnalysis = namedtuple('DependencyAnalysis', 'blocked ready hours previous')
+
+def fetch_nodes(conn, ids):
+    nodes = {}
+    sources = [('main', 0)] + ([('archive', 1)] if archive_ready(conn) else [])
+    for schema, archived in sources:
+        missing = set(ids) - nodes.keys()
+        if not missing:
+            break
+        for row in conn.execute(f'''SELECT id, activity, status, COALESCE(estimated_hours, 0), {archived}
+                                    FROM {schema}.activities WHERE id IN ({ID_LIST})''',
+                                {'ids': id_list(missing)}):
+            nodes[row[0]] = DependencyNode(*row)
+    for activity_id in set(ids) - nodes.keys():
+        nodes[activity_id] = DependencyNode(activity_id, None, None, 0, 0)
+    return nodes
+
+class DependencyGraph:
+    def __init__(self):
+        self.depends_on = defaultdict(set)   # atividade -> dependências
+        self.required_by = defaultdict(set)  # atividade -> atividades que dependem dela
+        self.edges = {}                      # id da linha -> (activity_id, depends_on)
+        self.pairs = Counter()               # linhas repetidas contam uma aresta só
+        self.nodes = {}
+        self.seq = 0
+        self._analysis = None
+        self._lock = threading.RLock()
+
+    def reload(self):
+        with self._lock:
+            seq = get_change_sequence()
+            self.depends_on.clear()
+            self.required_by.clear()
+            self.edges.clear()
+            self.pairs.clear()
+            with db_read() as conn:
+                for edge_id, activity_id, depends_on in conn.execute(
+                        'SELECT id, activity_id, depends_on FROM activity_dependencies'):
+                    self._link(edge_id, activity_id, depends_on)
+                self.nodes = fetch_nodes(conn, self.depends_on.keys() | self.required_by.keys())
+            self.seq = seq
+            self._analysis = None
+
+    def sync(self):
+        """Aplica as alterações do feed desde o último seq visto"""
+        with self._lock:
+            current = get_change_sequence()
+            if current == self.seq:
+                return
+            if current - self.seq > GRAPH_RELOAD_CHANGES:
+                return self.reload()
+            edge_ids, activity_ids = set(), set()
+            after = self.seq
+            while True:
+                batch = read_changes(after, ('activities', 'activity_dependencies'), GRAPH_SYNC_BATCH)
+                if batch.truncated:
+                    return self.reload()
+                for change in batch.changes:
+                    if change.table_name == 'activity_dependencies':
+                        edge_ids.add(change.row_id)
+                    else:
+                        activity_ids.add(change.row_id)
+                after = batch.last_seq
+                if len(batch.changes) < GRAPH_SYNC_BATCH:
+                    break
+            self._apply(edge_ids, activity_ids)
+            self.seq = after
+
+    def _apply(self, edge_ids, activity_ids):
+        with db_read() as conn:
+            rows = conn.execute(f'''SELECT id, activity_id, depends_on FROM activity_dependencies
+                                    WHERE id IN ({ID_LIST})''', {'ids': id_list(edge_ids)}).fetchall()
+            for edge_id in edge_ids & self.edges.keys():
+                self._unlink(edge_id)
+            for edge_id, activity_id, depends_on in rows:
+                self._link(edge_id, activity_id, depends_on)
+            linked = self.depends_on.keys() | self.required_by.keys()
+            for activity_id in self.nodes.keys() - linked:
+                del self.nodes[activity_id]
+            refresh = (activity_ids & linked) | (linked - self.nodes.keys())
+            if refresh:
+                self.nodes.update(fetch_nodes(conn, refresh))
+        if edge_ids or activity_ids & linked:
+            self._analysis = None
+
+    def _link(self, edge_id, activity_id, depends_on):
+        self.edges[edge_id] = (activity_id, depends_on)
+        self.pairs[activity_id, depends_on] += 1
+        self.depends_on[activity_id].add(depends_on)
+        self.required_by[depends_on].add(activity_id)
+
+    def _unlink(self, edge_id):
+        activity_id, depends_on = pair = self.edges.pop(edge_id)
+        self.pairs[pair] -= 1
+        if self.pairs[pair]:
+            return
+        del self.pairs[pair]
+        for adjacency, node, other in ((self.depends_on, activity_id, depends_on),
+                                       (self.required_by, depends_on, activity_id)):
+            adjacency[node].discard(other)
+            if not adjacency[node]:
+                del adjacency[node]
+
+    def creates_cycle(self, activity_id, depends_on):
+        """A aresta activity_id -> depends_on fecharia um ciclo? (busca a partir
+        de depends_on pelas dependências, O(V + E) no pior caso)"""
+        if activity_id == depends_on:
+            return True
+        seen = {depends_on}
+        stack = [depends_on]
+        while stack:
+            for dependency in self.depends_on.get(stack.pop(), ()):
+                if dependency == activity_id:
+                    return True
+                if dependency not in seen:
+                    seen.add(dependency)
+                    stack.append(dependency)
+        return False
+
+    def is_open(self, activity_id):
+        node = self.nodes.get(activity_id)
+        return node is not None and node.status not in (None, 'concluida') and not node.archived
+
+    def analysis(self):
+        with self._lock:
+            if self._analysis is None:
+                self._analysis = self._analyze()
+            return self._analysis
+
+    def _analyze(self):
+        open_nodes = {node for node in self.nodes if self.is_open(node)}
+        pending = {node: [dep for dep in self.depends_on.get(node, ()) if dep in open_nodes]
+                   for node in open_nodes}
+        blocked = {node for node, deps in pending.items() if deps}
+        ready = {node for node, deps in pending.items() if not deps and node in self.depends_on}
+
+        # Ordem topológica (Kahn) das abertas; o caminho mais longo até cada
+        # uma é o maior entre os das suas dependências abertas mais as próprias horas
+        remaining = {node: len(deps) for node, deps in pending.items()}
+        queue = deque(node for node, count in remaining.items() if not count)
+        hours, previous = {}, {}
+        while queue:
+            node = queue.popleft()
+            before = max(pending[node], key=hours.__getitem__, default=None)
+            hours[node] = self.nodes[node].estimated_hours + (hours[before] if before is not None else 0)
+            if before is not None:
+                previous[node] = before
+            for dependent in self.required_by.get(node, ()):
+                if dependent in remaining:
+                    remaining[dependent] -= 1
+                    if not remaining[dependent]:
+                        queue.append(dependent)
+        return DependencyAnalysis(blocked, ready, hours, previous)
+
+    def blockers(self, activity_id):
+        """[(id, distância)] das atividades abertas de que activity_id depende,
+        direta ou indiretamente; concluídas interrompem a cadeia"""
+        with self._lock:
+            result = []
+            seen = {activity_id}
+            queue = deque([(activity_id, 0)])
+            while queue:
+                node, depth = queue.popleft()
+                for dependency in self.depends_on.get(node, ()):
+                    if dependency not in seen and self.is_open(dependency):
+                        seen.add(dependency)
+                        result.append((dependency, depth + 1))
+                        queue.append((dependency, depth + 1))
+            return result
+
+    def critical_path(self, activity_id=None):
+        """(horas, [ids da primeira à última]) da cadeia de atividades abertas com
+        mais horas estimadas; com activity_id, a cadeia que termina nela"""
+        analysis = self.analysis()
+        if activity_id is None:
+            activity_id = max(analysis.hours, key=analysis.hours.__getitem__, default=None)
+        if activity_id not in analysis.hours:
+            return 0, []
+        path = [activity_id]
+        while path[-1] in analysis.previous:
+            path.append(analysis.previous[path[-1]])
+        return analysis.hours[activity_id], path[::-1]
+
+    def add_edges(self, pairs):
+        # Lock do grafo antes do de escrita: a checagem e a gravação veem o
+        # mesmo grafo, e o sync depois do commit traz as linhas novas pelo feed
+        with self._lock:
+            with db_write('activity_dependencies') as conn:
+                self.sync()
+                pairs = [(int(activity_id), int(depends_on)) for activity_id, depends_on in pairs]
+                pairs = [pair for pair in dict.fromkeys(pairs) if pair not in self.pairs]
+                if not pairs:
+                    return 0
+                ids = {activity_id for pair in pairs for activity_id in pair}
+                missing = sorted(activity_id for activity_id, node in fetch_nodes(conn, ids).items()
+                                 if node.status is None)
+                if missing:
+                    raise ValueError(f"atividade inexistente: {', '.join(map(str, missing))}")
+
+                # As aceitas entram no grafo com ids provisórios (negativos), para
+                # que as seguintes do mesmo lote sejam checadas contra elas
+                accepted = []
+                try:
+                    for activity_id, depends_on in pairs:
+                        if self.creates_cycle(activity_id, depends_on):
+                            raise ValueError(f"a dependência {activity_id} → {depends_on} "
+                                             f"cria um ciclo")
+                        self._link(-len(accepted) - 1, activity_id, depends_on)
+                        accepted.append((activity_id, depends_on))
+                finally:
+                    for i in range(len(accepted)):
+                        self._unlink(-i - 1)
+                conn.executemany('INSERT INTO activity_dependencies (activity_id, depends_on) '
+                                 'VALUES (?, ?)', accepted)
+            self.sync()
+            return len(accepted)
+
+@st.cache_resource
+def get_dependency_graph():
+    graph = DependencyGraph()
+    graph.reload()
+    return graph
+
+def dependency_graph():
+    """O grafo do processo, atualizado com o feed de alterações"""
+    graph = get_dependency_graph()
+    graph.sync()
+    return graph
+
+def add_dependencies(pairs):
+    """Grava as arestas (activity_id, depends_on) que ainda não existem; devolve
+    quantas. Levanta ValueError, sem gravar nenhuma, se alguma atividade não
+    existir ou se alguma aresta fechar um ciclo."""
+    return get_dependency_graph().add_edges(pairs)
+
+def remove_dependency(activity_id, depends_on):
+    """Apaga a aresta (todas as linhas repetidas dela)"""
+    with db_write('activity_dependencies') as conn:
+        conn.execute('DELETE FROM activity_dependencies WHERE activity_id = ? AND depends_on = ?',
+                     (activity_id, depends_on))
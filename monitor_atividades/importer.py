@@ -0,0 +1,411 @@
+"""Importação em lote de atividades a partir de CSV ou JSONL.
+
+    python task-monitoring-app.py import-activities tarefas.csv
+    python task-monitoring-app.py import-activities tarefas.jsonl --reject-file rejeitadas.jsonl
+
+Campos (colunas do CSV ou chaves do JSONL): `username` (ou `user_id`) e
+`activity` são obrigatórios; `description`, `status`, `priority`, `category`,
+`start_time`, `end_time`, `estimated_hours`, `actual_hours`, `comments`,
+`department` e `tags` (lista no JSONL, separadas por ";" no CSV) são
+opcionais. Campos desconhecidos são ignorados.
+
+O arquivo é lido em fluxo e processado em lotes de IMPORT_CHUNK_SIZE
+registros: cada lote é validado contra mapas de usuários e departamentos em
+memória e gravado com executemany em uma única transação, junto com o ponto
+de retomada. Registros inválidos vão para o arquivo de rejeitados, no mesmo
+formato da entrada e com as colunas _line e _error. Se a importação for
+interrompida, rodar de novo com o mesmo arquivo continua do último lote
+gravado (o arquivo é identificado pelo conteúdo, não pelo nome).
+"""
+
+import argparse
+import csv
+import hashlib
+import io
+import itertools
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+from .db import db_read, db_write, to_db_timestamp
+from .logs import log_system_action
+from .rollup import rollup_add_range
+
+IMPORT_CHUNK_SIZE = 10000
+IMPORT_FORMATS = ('csv', 'jsonl')
+# Tamanho dos blocos lidos para calcular o hash do arquivo (identificação na retomada)
+SOURCE_HASH_BLOCK = 1 << 20
+
+PRIORITIES = {priority.lower(): priority for priority in ["Baixa", "Média", "Alta", "Urgente"]}
+STATUSES = {
+    'pendente': 'pendente', 'pendentes': 'pendente',
+    'em_andamento': 'em_andamento', 'em andamento': 'em_andamento',
+    'concluida': 'concluida', 'concluída': 'concluida', 'concluídas': 'concluida',
+}
+# Formatos aceitos além de ISO 8601
+TIMESTAMP_FORMATS = ('%d/%m/%Y %H:%M:%S', '%d/%m/%Y %H:%M', '%d/%m/%Y')
+
+INSERT_ACTIVITY = '''
+    INSERT INTO activities
+        (id, user_id, activity, description, status, priority, category, start_time,
+         end_time, estimated_hours, actual_hours, wall_clock_hours, comments, last_updated)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+def source_key(stream):
+    """Identificador do arquivo de entrada (binário) para a retomada: hash do
+    conteúdo inteiro, lido em blocos. Arquivos com o mesmo início e tamanho,
+    mas conteúdo diferente, não compartilham o ponto de retomada."""
+    digest = hashlib.sha1()
+    for block in iter(lambda: stream.read(SOURCE_HASH_BLOCK), b''):
+        digest.update(block)
+    return digest.hexdigest()
+
+def detect_format(name):
+    return 'jsonl' if name.lower().endswith(('.jsonl', '.ndjson', '.json')) else 'csv'
+
+def read_records(stream, fmt):
+    """Gera (linha, registro, erro) sem carregar o arquivo inteiro"""
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for record in reader:
+            record.pop(None, None)  # colunas além do cabeçalho
+            yield reader.line_num, record, None
+        return
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_number, {'_raw': line.rstrip('\n')}, f"JSON inválido: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, {'_raw': line.rstrip('\n')}, "a linha não é um objeto JSON"
+            continue
+        yield line_number, record, None
+
+class ImportLookups:
+    """Usuários e departamentos em memória, carregados uma vez por importação"""
+
+    def __init__(self):
+        with db_read() as conn:
+            users = conn.execute('SELECT id, username, department FROM users').fetchall()
+            departments = conn.execute('SELECT name FROM departments').fetchall()
+        self.users_by_name = {username.lower(): (user_id, department)
+                              for user_id, username, department in users}
+        self.users_by_id = {user_id: department for user_id, _, department in users}
+        self.departments = {name.lower(): name for (name,) in departments}
+
+    def resolve_user(self, record):
+        """(id, departamento) do responsável pelo registro"""
+        username = text(record.get('username'))
+        if username:
+            if username.lower() not in self.users_by_name:
+                raise ValueError(f"usuário desconhecido: {username}")
+            return self.users_by_name[username.lower()]
+        user_id = record.get('user_id')
+        if user_id in (None, ''):
+            raise ValueError("username ou user_id é obrigatório")
+        try:
+            user_id = int(user_id)
+        except (TypeError, ValueError):
+            raise ValueError(f"user_id inválido: {user_id!r}") from None
+        if user_id not in self.users_by_id:
+            raise ValueError(f"usuário desconhecido: {user_id}")
+        return user_id, self.users_by_id[user_id]
+
+def text(value):
+    return str(value).strip() if value is not None else ''
+
+def parse_timestamp(value):
+    """Converte a data do registro para o formato do banco (None se vazia)"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return to_db_timestamp(datetime.fromtimestamp(value))
+    value = str(value).strip()
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        if len(value) == 19 and value[10] == ' ':
+            return value  # já está no formato do banco
+    except ValueError:
+        for fmt in TIMESTAMP_FORMATS:
+            try:
+                parsed = datetime.strptime(value, fmt)
+                break
+            except ValueError:
+                continue
+        else:
+            raise ValueError(f"data inválida: {value!r}") from None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return to_db_timestamp(parsed)
+
+def parse_hours(value, field):
+    if value is None or value == '':
+        return None
+    try:
+        hours = float(str(value).replace(',', '.'))
+    except ValueError:
+        raise ValueError(f"{field} inválido: {value!r}") from None
+    if hours < 0:
+        raise ValueError(f"{field} negativo: {hours}")
+    return hours
+
+def parse_tags(value):
+    if isinstance(value, list):
+        tags = value
+    else:
+        tags = text(value).split(';')
+    return [text(tag) for tag in tags if text(tag)]
+
+def validate_record(record, lookups, now):
+    """Converte um registro em (valores da atividade sem o id, tags) ou levanta ValueError"""
+    user_id, user_department = lookups.resolve_user(record)
+    activity = text(record.get('activity'))
+    if not activity:
+        raise ValueError("activity é obrigatório")
+
+    department = text(record.get('department'))
+    if department:
+        if department.lower() not in lookups.departments:
+            raise ValueError(f"departamento desconhecido: {department}")
+        if department.lower() != (user_department or '').lower():
+            raise ValueError(f"o usuário não pertence ao departamento {department}")
+
+    priority = text(record.get('priority')) or 'Média'
+    if priority.lower() not in PRIORITIES:
+        raise ValueError(f"prioridade inválida: {priority}")
+
+    start_time = parse_timestamp(record.get('start_time')) or now
+    end_time = parse_timestamp(record.get('end_time'))
+    if end_time and end_time < start_time:
+        raise ValueError("end_time anterior a start_time")
+
+    status = text(record.get('status')).lower()
+    if status:
+        if status not in STATUSES:
+            raise ValueError(f"status inválido: {status}")
+        status = STATUSES[status]
+    else:
+        status = 'concluida' if end_time else 'pendente'
+    if status == 'concluida' and not end_time:
+        raise ValueError("atividade concluída sem end_time")
+
+    estimated_hours = parse_hours(record.get('estimated_hours'), 'estimated_hours')
+    actual_hours = parse_hours(record.get('actual_hours'), 'actual_hours')
+    wall_clock_hours = None
+    if status == 'concluida':
+        # Como em complete_activity: duração entre início e fim
+        elapsed = datetime.fromisoformat(end_time) - datetime.fromisoformat(start_time)
+        wall_clock_hours = round(elapsed.total_seconds() / 3600, 2)
+        if actual_hours is None:
+            actual_hours = wall_clock_hours
+
+    values = (user_id, activity, text(record.get('description')), status,
+              PRIORITIES[priority.lower()],
+              text(record.get('category')) or 'Outro', start_time, end_time,
+              1.0 if estimated_hours is None else estimated_hours, actual_hours,
+              wall_clock_hours, text(record.get('comments')), now)
+    return values, parse_tags(record.get('tags'))
+
+def validate_chunk(chunk, lookups):
+    """Separa um lote em registros válidos e rejeitados (linha, registro, erro)"""
+    now = to_db_timestamp(datetime.now())
+    valid, rejects = [], []
+    for line, record, error in chunk:
+        if error is None:
+            try:
+                valid.append(validate_record(record, lookups, now))
+                continue
+            except ValueError as e:
+                error = str(e)
+        rejects.append((line, record, error))
+    return valid, rejects
+
+def load_checkpoint(key):
+    with db_read() as conn:
+        return conn.execute('''SELECT records_done, inserted, rejected, finished
+                               FROM import_checkpoints WHERE source_key=?''', (key,)).fetchone()
+
+def save_checkpoint(c, key, report):
+    c.execute('''INSERT INTO import_checkpoints
+                     (source_key, source_name, records_done, inserted, rejected, finished, updated_at)
+                 VALUES (?, ?, ?, ?, ?, ?, ?)
+                 ON CONFLICT (source_key) DO UPDATE SET
+                     source_name=excluded.source_name, records_done=excluded.records_done,
+                     inserted=excluded.inserted, rejected=excluded.rejected,
+                     finished=excluded.finished, updated_at=excluded.updated_at''',
+              (key, report.source_name, report.records, report.inserted, report.rejected,
+               int(report.finished), datetime.now()))
+
+def insert_chunk(valid, key, report):
+    """Grava um lote e o ponto de retomada na mesma transação"""
+    with db_write('activities', 'activity_daily_stats', 'activity_tags') as conn:
+        c = conn.cursor()
+        if valid:
+            # Ids reservados na transação de escrita para ligar as tags às atividades
+            first_id = c.execute('''SELECT MAX(COALESCE((SELECT seq FROM sqlite_sequence
+                                                          WHERE name = 'activities'), 0),
+                                                 COALESCE((SELECT MAX(id) FROM activities), 0))
+                                 ''').fetchone()[0] + 1
+            # Tags antes das atividades: o índice de busca de cada atividade é
+            # montado uma vez só, no insert dela, já com as tags
+            c.executemany('INSERT INTO activity_tags (activity_id, tag) VALUES (?, ?)',
+                          [(first_id + i, tag) for i, (_, tags) in enumerate(valid) for tag in tags])
+            c.executemany(INSERT_ACTIVITY, [(first_id + i,) + values
+                                            for i, (values, _) in enumerate(valid)])
+            rollup_add_range(c, first_id, first_id + len(valid) - 1)
+        save_checkpoint(c, key, report)
+
+class RejectWriter:
+    """Grava os registros rejeitados no formato da entrada, com _line e _error"""
+
+    def __init__(self, stream, fmt):
+        self.stream = stream
+        self.fmt = fmt
+        self._csv = None
+
+    def write(self, rejects):
+        if self.stream is None or not rejects:
+            return
+        for line, record, error in rejects:
+            row = {**record, '_line': line, '_error': error}
+            if self.fmt == 'jsonl':
+                self.stream.write(json.dumps(row, ensure_ascii=False, default=str) + '\n')
+                continue
+            if self._csv is None:
+                self._csv = csv.DictWriter(self.stream, fieldnames=list(row), extrasaction='ignore')
+                # Na retomada o arquivo já tem cabeçalho
+                if self.stream.tell() == 0:
+                    self._csv.writeheader()
+            self._csv.writerow(row)
+        self.stream.flush()
+
+class ImportReport:
+    """Totais de uma importação, incluindo o que foi feito antes da retomada"""
+
+    def __init__(self, source_name, checkpoint=None):
+        self.source_name = source_name
+        self.records, self.inserted, self.rejected, finished = checkpoint or (0, 0, 0, 0)
+        self.finished = bool(finished)
+        self.already_imported = self.finished
+        self.resumed_from = self.records
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+
+    @property
+    def rows_per_second(self):
+        processed = self.records - self.resumed_from
+        return processed / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        resumed = f" (retomada após {self.resumed_from})" if self.resumed_from else ""
+        return (f"{self.records} registros{resumed}: {self.inserted} importados, "
+                f"{self.rejected} rejeitados em {self.seconds:.1f}s "
+                f"({self.rows_per_second:.0f} registros/s)")
+
+def import_activities(stream, fmt, key, source_name, reject_stream=None,
+                      chunk_size=IMPORT_CHUNK_SIZE, resume=True, user_id=None, progress=None):
+    """Importa os registros de `stream` (texto) e devolve o ImportReport.
+
+    Com resume=False o ponto de retomada de `key` é descartado e o arquivo é
+    importado do início. `progress(report)` é chamado após cada lote.
+    """
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError(f"formato não suportado: {fmt}")
+    if not resume:
+        with db_write() as conn:
+            conn.execute('DELETE FROM import_checkpoints WHERE source_key=?', (key,))
+    report = ImportReport(source_name, load_checkpoint(key))
+    if report.finished:
+        return report
+
+    lookups = ImportLookups()
+    rejects_out = RejectWriter(reject_stream, fmt)
+    records = read_records(stream, fmt)
+    # Registros já gravados em uma execução anterior
+    for _ in itertools.islice(records, report.resumed_from):
+        pass
+
+    while True:
+        chunk = list(itertools.islice(records, chunk_size))
+        if not chunk:
+            break
+        valid, rejects = validate_chunk(chunk, lookups)
+        report.records += len(chunk)
+        report.inserted += len(valid)
+        report.rejected += len(rejects)
+        insert_chunk(valid, key, report)
+        rejects_out.write(rejects)
+        report.seconds = time.perf_counter() - report.started
+        if progress:
+            progress(report)
+
+    report.finished = True
+    with db_write() as conn:
+        save_checkpoint(conn.cursor(), key, report)
+    report.seconds = time.perf_counter() - report.started
+    log_system_action(user_id, "import_activities",
+                      f"Importação de {source_name}: {report.inserted} atividades, "
+                      f"{report.rejected} rejeitadas")
+    return report
+
+def import_file(path, fmt=None, reject_path=None, chunk_size=IMPORT_CHUNK_SIZE, resume=True,
+                user_id=None, progress=None):
+    """import_activities para um arquivo em disco"""
+    fmt = fmt or detect_format(path)
+    with open(path, 'rb') as f:
+        key = source_key(f)
+    if reject_path is None:
+        base, ext = os.path.splitext(path)
+        reject_path = f"{base}.rejeitados{ext or '.' + fmt}"
+    resuming = resume and load_checkpoint(key) is not None
+    with open(path, encoding='utf-8-sig', newline='') as stream, \
+         open(reject_path, 'a' if resuming else 'w', encoding='utf-8', newline='') as rejects:
+        report = import_activities(stream, fmt, key, os.path.basename(path), rejects,
+                                   chunk_size, resume, user_id, progress)
+    if os.path.getsize(reject_path) == 0:
+        os.remove(reject_path)
+    return report, reject_path
+
+def import_upload(data, name, chunk_size=IMPORT_CHUNK_SIZE, resume=True, user_id=None,
+                  progress=None):
+    """import_activities para um arquivo enviado pela interface; devolve o
+    relatório e os rejeitados (texto no formato da entrada)"""
+    fmt = detect_format(name)
+    stream = io.TextIOWrapper(io.BytesIO(data), encoding='utf-8-sig', newline='')
+    rejects = io.StringIO()
+    report = import_activities(stream, fmt, source_key(io.BytesIO(data)), name,
+                               rejects, chunk_size, resume, user_id, progress)
+    return report, rejects.getvalue()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='task-monitoring-app.py import-activities',
+                                     description="Importa atividades de um arquivo CSV ou JSONL")
+    parser.add_argument('path')
+    parser.add_argument('--format', choices=IMPORT_FORMATS,
+                        help='padrão: pela extensão (.jsonl/.ndjson/.json ou CSV)')
+    parser.add_argument('--reject-file', help='padrão: <arquivo>.rejeitados.<ext>')
+    parser.add_argument('--chunk-size', type=int, default=IMPORT_CHUNK_SIZE)
+    parser.add_argument('--restart', action='store_true',
+                        help='ignora o ponto de retomada e importa desde o início')
+    args = parser.parse_args(argv)
+
+    def progress(report):
+        print(f"\r{report.records} registros ({report.rows_per_second:.0f}/s)", end='',
+              file=sys.stderr, flush=True)
+
+    report, reject_path = import_file(args.path, args.format, args.reject_file, args.chunk_size,
+                                      not args.restart, progress=progress)
+    print(file=sys.stderr)
+    if report.already_imported:
+        print(f"{args.path} já foi importado ({report.inserted} atividades); "
+              "use --restart para importar de novo")
+        return
+    print(report)
+    if report.rejected and os.path.exists(reject_path):
+        print(f"Rejeitados em {reject_path}")
@@ -0,0 +1,323 @@
+"""Logs do sistema gravados em segundo plano em um banco separado."""
+
+import streamlit as st
+from collections import defaultdict
+from datetime import date, datetime
+import glob
+import gzip
+import shutil
+import sqlite3
+import time
+import atexit
+import os
+import queue
+import threading
+
+from .db import ConnectionManager, DB_BUSY_TIMEOUT_MS, DB_PATH, db_read, db_write, to_db_timestamp
+
+# Logs do sistema (auditoria). Ficam em arquivos SQLite separados e são
+# gravados por uma thread em segundo plano, em lotes, para que as ações dos
+# usuários não disputem o lock de escrita do banco principal.
+#
+# Janela de durabilidade: um registro é gravado até LOG_FLUSH_INTERVAL
+# segundos depois de enfileirado (mais o tempo da própria gravação). O que
+# ainda estiver na fila é gravado no encerramento normal do processo, mas é
+# perdido se o processo for morto (kill -9, queda de energia). Com a fila cheia
+# (LOG_QUEUE_SIZE registros pendentes) a ação espera até LOG_ENQUEUE_TIMEOUT
+# segundos e, se ainda não houver espaço, o registro é descartado e contado em
+# LogWriter.dropped.
+LOG_DB_PATH = os.environ.get('MONITOR_LOG_DB_PATH',
+                             os.path.splitext(DB_PATH)[0] + '_logs.db')
+LOG_QUEUE_SIZE = int(os.environ.get('MONITOR_LOG_QUEUE_SIZE', '10000'))
+LOG_BATCH_SIZE = int(os.environ.get('MONITOR_LOG_BATCH_SIZE', '500'))
+LOG_FLUSH_INTERVAL = float(os.environ.get('MONITOR_LOG_FLUSH_INTERVAL', '1.0'))
+LOG_ENQUEUE_TIMEOUT = 1.0
+
+# Partições mensais. LOG_DB_PATH guarda só o catálogo (log_partitions) e o
+# dicionário de ações (log_actions); os registros de cada mês ficam em um
+# arquivo próprio (<LOG_DB_PATH sem .db>_AAAA-MM.db), anexado às conexões só
+# quando é lido ou gravado, com a ação gravada como action_id.
+#
+# Retenção: partições com mais de LOG_RETENTION_MONTHS meses (0 = sem limite)
+# são apagadas ou, com LOG_RETENTION_MODE=compress, compactadas em .gz e
+# retiradas das consultas. Nos dois casos é uma operação por arquivo, sem
+# DELETE de registros.
+LOG_RETENTION_MONTHS = int(os.environ.get('MONITOR_LOG_RETENTION_MONTHS', '12'))
+LOG_RETENTION_MODE = os.environ.get('MONITOR_LOG_RETENTION_MODE', 'drop')
+LOG_PARTITION_PREFIX = os.path.splitext(LOG_DB_PATH)[0] + '_'
+# Partições anexadas por transação (o SQLite aceita 10 anexos por conexão)
+LOG_ATTACH_BATCH = 8
+
+def init_log_db(manager):
+    with manager.write() as conn:
+        conn.execute('''CREATE TABLE IF NOT EXISTS log_actions
+                        (id INTEGER PRIMARY KEY,
+                         name TEXT NOT NULL UNIQUE)''')
+        # state: active (consultada) ou compressed (arquivo .gz, fora das consultas)
+        conn.execute('''CREATE TABLE IF NOT EXISTS log_partitions
+                        (month TEXT PRIMARY KEY,
+                         file TEXT NOT NULL,
+                         state TEXT NOT NULL DEFAULT 'active',
+                         row_count INTEGER NOT NULL DEFAULT 0)''')
+
+@st.cache_resource
+def get_log_db():
+    """Conexões com o catálogo de logs (mesmo gerenciador usado pelo banco principal)"""
+    manager = ConnectionManager(LOG_DB_PATH, read_pool_size=4)
+    init_log_db(manager)
+    return manager
+
+def partition_schema(month):
+    """Nome com que a partição do mês (AAAA-MM) é anexada"""
+    return 'logs_' + month.replace('-', '_')
+
+def partition_path(file):
+    return os.path.join(os.path.dirname(LOG_DB_PATH), file)
+
+def partition_file(month):
+    return os.path.basename(LOG_PARTITION_PREFIX) + month + '.db'
+
+def write_log_entries(manager, entries, keep_ids=False):
+    """Grava registros (user_id, action, details, timestamp em texto) nas
+    partições dos respectivos meses, criando as que faltarem. Com keep_ids os
+    registros começam pelo id, e os ids já gravados são ignorados."""
+    by_month = defaultdict(list)
+    for entry in entries:
+        by_month[entry[-1][:7]].append(entry)
+    months = sorted(by_month)
+    for i in range(0, len(months), LOG_ATTACH_BATCH):
+        group = months[i:i + LOG_ATTACH_BATCH]
+        attach = {partition_schema(month): partition_path(partition_file(month)) for month in group}
+        with manager.write(attach=attach) as conn:
+            actions = sorted({entry[-3] for month in group for entry in by_month[month]})
+            conn.executemany('INSERT OR IGNORE INTO log_actions (name) VALUES (?)',
+                             [(action,) for action in actions])
+            action_ids = dict(conn.execute(
+                f"SELECT name, id FROM log_actions WHERE name IN ({', '.join('?' * len(actions))})",
+                actions))
+            for month in group:
+                schema = partition_schema(month)
+                conn.execute(f'''CREATE TABLE IF NOT EXISTS {schema}.system_logs
+                                 (id INTEGER PRIMARY KEY,
+                                  user_id INTEGER,
+                                  action_id INTEGER NOT NULL,
+                                  details TEXT,
+                                  timestamp TEXT NOT NULL)''')
+                conn.execute(f'''CREATE INDEX IF NOT EXISTS {schema}.idx_system_logs_timestamp
+                                 ON system_logs (timestamp)''')
+                rows = [entry[:-3] + (action_ids[entry[-3]],) + entry[-2:]
+                        for entry in by_month[month]]
+                if keep_ids:
+                    inserted = conn.executemany(f'''INSERT OR IGNORE INTO {schema}.system_logs
+                                                   (id, user_id, action_id, details, timestamp)
+                                                   VALUES (?, ?, ?, ?, ?)''', rows).rowcount
+                else:
+                    inserted = conn.executemany(f'''INSERT INTO {schema}.system_logs
+                                                   (user_id, action_id, details, timestamp)
+                                                   VALUES (?, ?, ?, ?)''', rows).rowcount
+                conn.execute('''INSERT INTO log_partitions (month, file, row_count)
+                                VALUES (?, ?, ?)
+                                ON CONFLICT (month) DO UPDATE SET
+                                    row_count = row_count + excluded.row_count''',
+                             (month, partition_file(month), inserted))
+
+def read_system_logs(start, end):
+    """(user_id, action, timestamp) com start <= timestamp < end, mais recentes
+    primeiro. Só as partições dos meses do intervalo são abertas, e cada uma já
+    vem ordenada pelo índice, então não há ordenação do período inteiro."""
+    manager = get_log_db()
+    with manager.read() as conn:
+        partitions = conn.execute('''SELECT month, file FROM log_partitions
+                                     WHERE state = 'active'
+                                     AND month >= ? AND month || '-01 00:00:00' < ?
+                                     ORDER BY month DESC''', (start[:7], end)).fetchall()
+    logs = []
+    for month, file in partitions:
+        path = partition_path(file)
+        if not os.path.exists(path):
+            continue
+        schema = partition_schema(month)
+        with manager.read(attach={schema: path}) as conn:
+            logs += conn.execute(f'''SELECT l.user_id, a.name, l.timestamp
+                                     FROM {schema}.system_logs l
+                                     JOIN log_actions a ON a.id = l.action_id
+                                     WHERE l.timestamp >= ? AND l.timestamp < ?
+                                     ORDER BY l.timestamp DESC''', (start, end)).fetchall()
+    return logs
+
+def log_partition_counts():
+    """[(mês, estado, registros)] de todas as partições, mais recentes primeiro"""
+    with get_log_db().read() as conn:
+        return conn.execute('''SELECT month, state, row_count FROM log_partitions
+                               ORDER BY month DESC''').fetchall()
+
+def retention_cutoff_month(months, today=None):
+    """Primeiro mês (AAAA-MM) mantido por uma retenção de `months` meses"""
+    today = today or date.today()
+    index = today.year * 12 + today.month - 1 - months
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+def compress_partition(path):
+    # Volta ao journal DELETE para que o -wal seja incorporado ao arquivo
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute('PRAGMA journal_mode=DELETE')
+    finally:
+        conn.close()
+    with open(path, 'rb') as source, gzip.open(path + '.gz', 'wb') as target:
+        shutil.copyfileobj(source, target)
+
+def apply_log_retention(months=LOG_RETENTION_MONTHS, mode=LOG_RETENTION_MODE):
+    """Apaga (mode='drop') ou compacta (mode='compress') as partições anteriores
+    à retenção; devolve os meses afetados"""
+    if months <= 0:
+        return []
+    cutoff = retention_cutoff_month(months)
+    with get_log_db().write() as conn:
+        expired = conn.execute('''SELECT month, file FROM log_partitions
+                                  WHERE state = 'active' AND month < ?
+                                  ORDER BY month''', (cutoff,)).fetchall()
+        if mode == 'compress':
+            conn.execute('''UPDATE log_partitions SET state = 'compressed', file = file || '.gz'
+                            WHERE state = 'active' AND month < ?''', (cutoff,))
+        else:
+            conn.execute("DELETE FROM log_partitions WHERE state = 'active' AND month < ?",
+                         (cutoff,))
+    # Os arquivos saem depois do commit: a partir dele nenhuma consulta os abre
+    for _, file in expired:
+        path = partition_path(file)
+        if mode == 'compress' and os.path.exists(path):
+            compress_partition(path)
+        for suffix in ('-wal', '-shm', ''):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+    return [month for month, _ in expired]
+
+def remove_log_files():
+    """Apaga o catálogo e todas as partições (reset do banco)"""
+    for path in [LOG_DB_PATH] + glob.glob(glob.escape(LOG_PARTITION_PREFIX) + '*.db*'):
+        for suffix in ('-wal', '-shm', ''):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+class LogWriter:
+    """Fila limitada de registros de log, esvaziada em lotes por uma thread própria"""
+
+    def __init__(self, manager, max_queue=LOG_QUEUE_SIZE, batch_size=LOG_BATCH_SIZE,
+                 flush_interval=LOG_FLUSH_INTERVAL):
+        self.manager = manager
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='system-log-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def log(self, user_id, action, details):
+        entry = (user_id, action, details, to_db_timestamp(datetime.now()))
+        try:
+            self._queue.put(entry, timeout=LOG_ENQUEUE_TIMEOUT)
+        except queue.Full:
+            self.dropped += 1
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def flush(self):
+        """Bloqueia até que todos os registros enfileirados tenham sido gravados"""
+        self._queue.join()
+
+    def close(self):
+        """Grava o que estiver pendente e encerra a thread"""
+        self._stop.set()
+        self._thread.join(timeout=self.flush_interval + 10)
+
+    def _next_batch(self):
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        # Acumula registros por até flush_interval antes de gravar o lote
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size and not self._stop.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        try:
+            write_log_entries(self.manager, batch)
+            self.written += len(batch)
+        except sqlite3.Error as e:
+            self.dropped += len(batch)
+            print(f"Erro ao gravar logs do sistema: {e}")
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+    def _run(self):
+        while not (self._stop.is_set() and self._queue.empty()):
+            batch = self._next_batch()
+            if batch:
+                self._write(batch)
+
+@st.cache_resource
+def get_log_writer():
+    return LogWriter(get_log_db())
+
+def move_legacy_rows(read, write, chunk_size):
+    moved = 0
+    while True:
+        with read() as conn:
+            rows = conn.execute('''SELECT id, user_id, COALESCE(action, ''), details,
+                                          COALESCE(timestamp, '1970-01-01 00:00:00')
+                                   FROM system_logs ORDER BY id LIMIT ?''',
+                                (chunk_size,)).fetchall()
+        if not rows:
+            return moved
+        write_log_entries(get_log_db(), rows, keep_ids=True)
+        with write() as conn:
+            conn.execute('DELETE FROM system_logs WHERE id <= ?', (rows[-1][0],))
+        moved += len(rows)
+
+def move_legacy_system_logs(chunk_size=5000):
+    """Transfere para as partições os logs de versões anteriores: system_logs no
+    banco principal e a tabela única do banco de logs, que é removida no fim.
+
+    Os ids são preservados e a inserção ignora os já copiados, então uma
+    transferência interrompida pode ser retomada sem duplicar registros.
+    """
+    manager = get_log_db()
+    moved = move_legacy_rows(db_read, lambda: db_write('system_logs'), chunk_size)
+    with manager.read() as conn:
+        legacy = conn.execute("SELECT 1 FROM sqlite_master "
+                              "WHERE type = 'table' AND name = 'system_logs'").fetchone()
+    if legacy:
+        moved += move_legacy_rows(manager.read, manager.write, chunk_size)
+        with manager.write() as conn:
+            conn.execute('DROP TABLE system_logs')
+        # O VACUUM não roda dentro de transação: usa uma conexão avulsa
+        conn = sqlite3.connect(LOG_DB_PATH, timeout=DB_BUSY_TIMEOUT_MS / 1000)
+        try:
+            conn.execute('VACUUM')
+            conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        finally:
+            conn.close()
+    return moved
+
+def log_system_action(user_id, action, details):
+    """Enfileira o registro; a gravação é feita pelo LogWriter em segundo plano"""
+    get_log_writer().log(user_id, action, details)
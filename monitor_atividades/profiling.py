@@ -0,0 +1,282 @@
+"""Rastreamento de consultas SQL e tempos de renderização por rerun."""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import functools
+from collections import deque
+from contextlib import contextmanager
+
+# Quantos reruns recentes ficam guardados para o painel de Performance
+PROFILING_WINDOW = int(os.environ.get('MONITOR_PROFILING_WINDOW', '200'))
+# Intervalo (em instruções da VM do SQLite) do progress handler
+PROGRESS_STEPS = 1000
+
+class QueryRecord:
+    """Uma instrução executada: SQL, parâmetros (hash), linhas, tempo e tela"""
+    __slots__ = ('sql', 'fingerprint', 'view', 'rows', 'seconds', 'vm_steps', 'statements')
+
+    def __init__(self, sql, fingerprint, view):
+        self.sql = sql
+        self.fingerprint = fingerprint
+        self.view = view
+        self.rows = 0
+        self.seconds = 0.0
+        self.vm_steps = 0
+        self.statements = 0
+
+class RerunTrace:
+    """Tudo o que foi medido durante um rerun do Streamlit"""
+    __slots__ = ('label', 'started_at', 'seconds', 'queries', 'views', 'view_stack',
+                 'plotly_seconds')
+
+    def __init__(self, label):
+        self.label = label
+        self.started_at = time.time()
+        self.seconds = 0.0
+        self.queries = []
+        self.views = {}
+        self.view_stack = []
+        self.plotly_seconds = 0.0
+
+    @property
+    def sql_seconds(self):
+        return sum(query.seconds for query in self.queries)
+
+class Profiler:
+    """Coleta medições dos reruns enquanto `enabled` estiver ligado.
+
+    Desligado, o custo é uma verificação de atributo por instrução SQL e por
+    tela. Consultas feitas fora de um rerun (thread de logs, scripts) não são
+    registradas.
+    """
+
+    def __init__(self, enabled=False, window=PROFILING_WINDOW):
+        self.enabled = enabled
+        self.reruns = deque(maxlen=window)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def current(self):
+        return getattr(self._local, 'trace', None)
+
+    @contextmanager
+    def rerun(self, label):
+        if not self.enabled:
+            yield None
+            return
+        trace = RerunTrace(label)
+        self._local.trace = trace
+        started = time.perf_counter()
+        try:
+            yield trace
+        finally:
+            trace.seconds = time.perf_counter() - started
+            self._local.trace = None
+            with self._lock:
+                self.reruns.append(trace)
+
+    def start_query(self, sql, parameters):
+        trace = self.current()
+        if trace is None:
+            return None
+        fingerprint = hashlib.sha1(repr(parameters).encode()).hexdigest()[:8] if parameters else '-'
+        record = QueryRecord(' '.join(sql.split()), fingerprint,
+                             trace.view_stack[-1] if trace.view_stack else '-')
+        trace.queries.append(record)
+        return record
+
+    @contextmanager
+    def plotly(self):
+        """Mede a montagem de uma figura Plotly"""
+        trace = self.current() if self.enabled else None
+        if trace is None:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            trace.plotly_seconds += time.perf_counter() - started
+
+    def clear(self):
+        with self._lock:
+            self.reruns.clear()
+
+    def summary(self):
+        """Agregados da janela: consultas por SQL, telas e totais por rerun"""
+        with self._lock:
+            reruns = list(self.reruns)
+        queries = {}
+        views = {}
+        for trace in reruns:
+            for record in trace.queries:
+                entry = queries.setdefault(record.sql, {
+                    'sql': record.sql, 'calls': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                    'rows': 0, 'vm_steps': 0, 'fingerprints': set(), 'views': set()})
+                ms = record.seconds * 1000
+                entry['calls'] += 1
+                entry['total_ms'] += ms
+                entry['max_ms'] = max(entry['max_ms'], ms)
+                entry['rows'] += record.rows
+                entry['vm_steps'] += record.vm_steps
+                entry['fingerprints'].add(record.fingerprint)
+                entry['views'].add(record.view)
+            for name, seconds in trace.views.items():
+                entry = views.setdefault(name, {'view': name, 'calls': 0, 'total_ms': 0.0,
+                                                'max_ms': 0.0})
+                entry['calls'] += 1
+                entry['total_ms'] += seconds * 1000
+                entry['max_ms'] = max(entry['max_ms'], seconds * 1000)
+        for entry in queries.values():
+            entry['fingerprints'] = len(entry['fingerprints'])
+            entry['views'] = ', '.join(sorted(entry['views']))
+        return {
+            'queries': sorted(queries.values(), key=lambda e: e['total_ms'], reverse=True),
+            'views': sorted(views.values(), key=lambda e: e['total_ms'], reverse=True),
+            'reruns': [{'label': trace.label,
+                        'started_at': time.strftime('%Y-%m-%d %H:%M:%S',
+                                                    time.localtime(trace.started_at)),
+                        'total_ms': trace.seconds * 1000, 'sql_ms': trace.sql_seconds * 1000,
+                        'queries': len(trace.queries), 'plotly_ms': trace.plotly_seconds * 1000}
+                       for trace in reversed(reruns)],
+        }
+
+_profiler = Profiler(enabled=os.environ.get('MONITOR_PROFILING') == '1')
+
+def get_profiler():
+    return _profiler
+
+def profiled_view(func):
+    """Registra o tempo da tela (inclusivo) e atribui a ela as consultas feitas.
+    Em um fragmento (live_fragment), aplique por dentro: os reruns do fragmento
+    chamam só a função e viram um rerun próprio no profiler."""
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _profiler.enabled:
+            return func(*args, **kwargs)
+        trace = _profiler.current()
+        if trace is None:
+            with _profiler.rerun(f'fragmento {name}'):
+                return wrapper(*args, **kwargs)
+        trace.view_stack.append(name)
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            trace.views[name] = trace.views.get(name, 0.0) + time.perf_counter() - started
+            trace.view_stack.pop()
+    return wrapper
+
+class TracedCursor(sqlite3.Cursor):
+    """Cursor que mede execução e leitura das linhas quando o profiler está ligado"""
+    _record = None
+
+    def _traced(self, method, sql, parameters, many=False):
+        record = _profiler.start_query(sql, parameters if not many else '<many>')
+        self._record = record
+        if record is None:
+            return method(sql, parameters)
+        self.connection._active_record = record
+        started = time.perf_counter()
+        try:
+            return method(sql, parameters)
+        finally:
+            record.seconds += time.perf_counter() - started
+            if self.rowcount > 0:
+                record.rows += self.rowcount
+
+    def execute(self, sql, parameters=()):
+        if not _profiler.enabled:
+            self._record = None
+            return super().execute(sql, parameters)
+        return self._traced(super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        if not _profiler.enabled:
+            self._record = None
+            return super().executemany(sql, seq_of_parameters)
+        return self._traced(super().executemany, sql, seq_of_parameters, many=True)
+
+    def _fetch(self, method, *args):
+        record = self._record
+        if record is None:
+            return method(*args)
+        started = time.perf_counter()
+        result = method(*args)
+        record.seconds += time.perf_counter() - started
+        if isinstance(result, list):
+            record.rows += len(result)
+        elif result is not None:
+            record.rows += 1
+        return result
+
+    def fetchone(self):
+        return self._fetch(super().fetchone)
+
+    def fetchmany(self, size=None):
+        return self._fetch(super().fetchmany, size or self.arraysize)
+
+    def fetchall(self):
+        return self._fetch(super().fetchall)
+
+    def __iter__(self):
+        return self if self._record is None else self._iter_traced()
+
+    def _iter_traced(self):
+        record = self._record
+        next_row = super().__next__
+        while True:
+            started = time.perf_counter()
+            try:
+                row = next_row()
+            except StopIteration:
+                record.seconds += time.perf_counter() - started
+                return
+            record.seconds += time.perf_counter() - started
+            record.rows += 1
+            yield row
+
+class TracedConnection(sqlite3.Connection):
+    """Conexão cujos cursores são TracedCursor.
+
+    Com o profiler ligado também instala o progress handler (instruções da VM
+    executadas por consulta) e o trace callback (instruções internas, como
+    corpos de triggers); ambos são removidos quando ele é desligado.
+    """
+    _active_record = None
+    _hooks = False
+
+    def cursor(self, factory=TracedCursor):
+        if self._hooks != _profiler.enabled:
+            self._set_hooks(_profiler.enabled)
+        return super().cursor(factory)
+
+    def _set_hooks(self, enabled):
+        self._hooks = enabled
+        self._active_record = None
+        self.set_progress_handler(self._on_progress if enabled else None, PROGRESS_STEPS)
+        self.set_trace_callback(self._on_statement if enabled else None)
+
+    def _on_progress(self):
+        if self._active_record is not None:
+            self._active_record.vm_steps += PROGRESS_STEPS
+        return 0
+
+    def _on_statement(self, statement):
+        if self._active_record is not None:
+            self._active_record.statements += 1
+
+    def commit(self):
+        record = _profiler.start_query('COMMIT', ()) if _profiler.enabled else None
+        if record is None:
+            return super().commit()
+        started = time.perf_counter()
+        try:
+            return super().commit()
+        finally:
+            record.seconds += time.perf_counter() - started
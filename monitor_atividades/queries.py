@@ -0,0 +1,730 @@
+"""Consultas e escritas de atividades, usuários, departamentos e sessões."""
+
+import streamlit as st
+from datetime import datetime, timedelta
+import sqlite3
+from hashlib import sha256
+import time
+import atexit
+import os
+import threading
+from collections import namedtuple
+
+from .db import (
+    ActivityRow, DepartmentRow, UserRow, activities_source, archive_ready, cached_query,
+    day_range, db_read, db_write, fts_match, iter_rows, period_range, query_rows, to_db_timestamp
+)
+from .dependencies import add_dependencies
+from .logs import log_system_action, read_system_logs
+from .rollup import rollup_add, rollup_remove
+from .timesheet import ACTUAL_HOURS, track_time_entries
+
+# Nova função para adicionar tags às atividades
+def add_activity_tags(activity_id, tags):
+    with db_write('activity_tags') as conn:
+        c = conn.cursor()
+        
+        # Adicionar tags
+        for tag in tags:
+            c.execute('INSERT INTO activity_tags (activity_id, tag) VALUES (?, ?)',
+                     (activity_id, tag))
+
+# Nova função para gerenciar dependências entre atividades
+def manage_activity_dependencies(activity_id, dependent_on=None, required_for=None):
+    """Levanta ValueError se alguma dependência criar um ciclo (dependencies.py).
+    Aceita ids em texto, como os de get_available_activities."""
+    activity_id = int(activity_id)
+    add_dependencies([(activity_id, int(dep_id)) for dep_id in dependent_on or ()] +
+                     [(int(req_id), activity_id) for req_id in required_for or ()])
+
+# Nova função para adicionar comentários/histórico às atividades
+def add_activity_comment(activity_id, user_id, comment):
+    with db_write('activity_comments') as conn:
+        c = conn.cursor()
+        
+        c.execute('''INSERT INTO activity_comments 
+                     (activity_id, user_id, comment, created_at)
+                     VALUES (?, ?, ?, ?)''',
+                  (activity_id, user_id, comment, datetime.now()))
+
+# Nova função para rastrear tempo gasto em atividades
+def track_activity_time(activity_id, user_id, hours_spent, description=None):
+    """Um lançamento; para vários (uma semana de apontamentos) use track_time_entries"""
+    track_time_entries([(activity_id, user_id, hours_spent, description)])
+# Nova função para definir lembretes/notificações
+def set_activity_reminder(activity_id, user_id, reminder_date, reminder_type='email'):
+    with db_write('activity_reminders') as conn:
+        c = conn.cursor()
+        
+        c.execute('''INSERT INTO activity_reminders 
+                     (activity_id, user_id, reminder_date, reminder_type)
+                     VALUES (?, ?, ?, ?)''',
+                  (activity_id, user_id, reminder_date, reminder_type))
+
+# Função auxiliar para obter atividades disponíveis para dependências
+def get_available_activities():
+    with db_read() as conn:
+        c = conn.cursor()
+        c.execute('SELECT id, activity FROM activities WHERE status != "concluida"')
+        activities = c.fetchall()
+    return [(str(id), title) for id, title in activities]
+
+# Paginação por keyset (seek): cada página é delimitada pela chave de ordenação
+# da primeira/última linha exibida, nunca por OFFSET, então o custo de uma
+# página não depende de quão fundo o usuário navegou.
+PAGE_SIZE_OPTIONS = [10, 25, 50, 100]
+DEFAULT_PAGE_SIZE = 25
+
+# Valores exibidos nos filtros -> valores gravados no banco
+ACTIVITY_STATUS_FILTERS = {
+    "Em Andamento": "em_andamento",
+    "Concluídas": "concluida",
+    "Pendentes": "pendente",
+}
+USER_STATUS_FILTERS = {
+    "Ativo": "active",
+    "Inativo": "inactive",
+}
+
+# rows: linhas da página; next_cursor/prev_cursor: chaves para buscar a
+# página seguinte/anterior, ou None quando não há mais linhas naquela direção
+Page = namedtuple('Page', ['rows', 'next_cursor', 'prev_cursor'])
+
+def fetch_keyset_page(conn, row_type, query, params, key_columns, page_size,
+                      cursor=None, direction='next', descending=True):
+    """Executa `query` (um SELECT com cláusula WHERE, sem ORDER BY) paginada.
+
+    key_columns é uma lista de (expressão SQL, nome no resultado) que forma
+    uma chave única de ordenação. `cursor` é a chave da linha de referência e
+    `direction` indica se a página pedida vem depois ('next') ou antes ('prev')
+    dela na ordem exibida.
+    """
+    forward = direction == 'next'
+    ascending = forward != descending
+    params = list(params)
+    
+    expressions = ', '.join(expr for expr, _ in key_columns)
+    if cursor is not None:
+        placeholders = ', '.join('?' for _ in key_columns)
+        query += f" AND ({expressions}) {'>' if ascending else '<'} ({placeholders})"
+        params.extend(cursor)
+    order = 'ASC' if ascending else 'DESC'
+    query += ' ORDER BY ' + ', '.join(f'{expr} {order}' for expr, _ in key_columns)
+    query += ' LIMIT ?'
+    params.append(page_size + 1)
+    
+    rows = list(iter_rows(conn, row_type, query, params))
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if not forward:
+        rows.reverse()
+    if not rows:
+        return Page([], None, None)
+    
+    def key(row):
+        return tuple(row[name] for _, name in key_columns)
+    
+    if forward:
+        return Page(rows, key(rows[-1]) if has_more else None,
+                    key(rows[0]) if cursor is not None else None)
+    return Page(rows, key(rows[-1]), key(rows[0]) if has_more else None)
+
+# Funções auxiliares
+@cached_query('users')
+def get_all_users_names():
+    with db_read() as conn:
+        c = conn.cursor()
+        c.execute('SELECT full_name FROM users WHERE status="active" ORDER BY full_name')
+        users = [row[0] for row in c.fetchall()]
+    return users
+
+def get_user_id_by_name(full_name):
+    with db_read() as conn:
+        c = conn.cursor()
+        c.execute('SELECT id FROM users WHERE full_name=?', (full_name,))
+        result = c.fetchone()
+    return result[0] if result else None
+
+def get_filtered_activities(dept_filter, status_filter, user_filter,
+                            page_size=DEFAULT_PAGE_SIZE, cursor=None, direction='next',
+                            include_archive=False):
+    """Página de atividades, das mais recentes para as mais antigas"""
+    query = f'''
+        SELECT 
+            a.*,
+            u.full_name
+        FROM {activities_source(include_archive)} a
+        JOIN users u ON a.user_id = u.id
+        WHERE 1=1
+    '''
+    params = []
+    
+    if dept_filter != "Todos":
+        query += " AND u.department=?"
+        params.append(dept_filter)
+    
+    if status_filter != "Todos":
+        query += " AND a.status=?"
+        params.append(ACTIVITY_STATUS_FILTERS[status_filter])
+    
+    if user_filter != "Todos":
+        query += " AND u.full_name=?"
+        params.append(user_filter)
+    
+    with db_read() as conn:
+        return fetch_keyset_page(conn, ActivityRow, query, params,
+                                 [('a.start_time', 'start_time'), ('a.id', 'id')],
+                                 page_size, cursor, direction)
+
+@cached_query('activity_daily_stats', 'activities', 'users')
+def count_filtered_activities(dept_filter, status_filter, user_filter, include_archive=False):
+    """Total aproximado para a paginação, lido do rollup diário. Sem o arquivo,
+    desconta a parte das atividades arquivadas (archive.activity_daily_stats)."""
+    where = ''
+    params = []
+    
+    if dept_filter != "Todos":
+        where += " AND s.department=?"
+        params.append(dept_filter)
+    
+    if status_filter != "Todos":
+        where += " AND s.status=?"
+        params.append(ACTIVITY_STATUS_FILTERS[status_filter])
+    
+    if user_filter != "Todos":
+        where += " AND u.full_name=?"
+        params.append(user_filter)
+    
+    def total(stats):
+        return f'''(SELECT COALESCE(SUM(s.activity_count), 0)
+                    FROM {stats} s
+                    JOIN users u ON u.id = s.user_id
+                    WHERE 1=1{where})'''
+    
+    with db_read() as conn:
+        if include_archive or not archive_ready(conn):
+            return conn.execute('SELECT ' + total('main.activity_daily_stats'), params).fetchone()[0]
+        return conn.execute(f"SELECT {total('main.activity_daily_stats')} - "
+                            f"{total('archive.activity_daily_stats')}", params * 2).fetchone()[0]
+
+def delete_activity(activity_id):
+    with db_write('activities', 'activity_daily_stats') as conn:
+        c = conn.cursor()
+        rollup_remove(c, activity_id)
+        c.execute('DELETE FROM activities WHERE id=?', (activity_id,))
+
+def update_activity(activity_id, activity_name, description, priority, category, 
+                   status, estimated_hours, comments):
+    with db_write('activities', 'activity_daily_stats') as conn:
+        c = conn.cursor()
+    
+        rollup_remove(c, activity_id)
+        c.execute('''UPDATE activities 
+                     SET activity=?, description=?, priority=?, category=?,
+                         status=?, estimated_hours=?, comments=?, last_updated=?
+                     WHERE id=?''',
+                  (activity_name, description, priority, category, status,
+                   estimated_hours, comments, datetime.now(), activity_id))
+        rollup_add(c, activity_id)
+
+def create_user(username, password, role, full_name, email, department):
+    try:
+        hashed_password = sha256(password.encode()).hexdigest()
+        
+        with db_write('users') as conn:
+            c = conn.cursor()
+            c.execute('''
+                INSERT INTO users (username, password, role, full_name, email, department, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (username, hashed_password, role, full_name, email, department, datetime.now()))
+        
+        return True
+    except sqlite3.IntegrityError:
+        return False
+# Funções de autenticação e usuário
+# Perfil da sessão: carregado no login e guardado em st.session_state.user. Só
+# é relido quando update_user/toggle_user_status alteram aquele usuário; a
+# marca de versão é do processo, então vale para todas as sessões abertas.
+PROFILE_COLUMNS = 'id, username, role, full_name, email, department, status'
+
+class ProfileVersions:
+    """Contador de alterações de perfil e a última alteração de cada usuário"""
+
+    def __init__(self):
+        self._counter = 0
+        self._changed = {}
+        self._lock = threading.Lock()
+
+    def current(self):
+        return self._counter
+
+    def touch(self, user_id):
+        with self._lock:
+            self._counter += 1
+            self._changed[user_id] = self._counter
+
+    def is_stale(self, user_id, version):
+        return self._changed.get(user_id, 0) > version
+
+@st.cache_resource
+def get_profile_versions():
+    return ProfileVersions()
+
+def make_user_profile(row, version):
+    user_id, username, role, full_name, email, department, status = row
+    return {'id': user_id, 'username': username, 'role': role, 'full_name': full_name,
+            'email': email, 'department': department, 'status': status, 'version': version}
+
+def get_user_profile(user_id):
+    """Perfil atual do usuário (None se ele não existir mais)"""
+    version = get_profile_versions().current()
+    with db_read() as conn:
+        row = conn.execute(f'SELECT {PROFILE_COLUMNS} FROM users WHERE id=?',
+                           (user_id,)).fetchone()
+    return make_user_profile(row, version) if row else None
+
+def refresh_user_profile(profile):
+    """Devolve o perfil da sessão, relendo-o só se o usuário foi alterado"""
+    # Sessões anteriores a este formato (sem 'version') são sempre relidas
+    if not get_profile_versions().is_stale(profile['id'], profile.get('version', -1)):
+        return profile
+    return get_user_profile(profile['id'])
+
+def login_user(username, password):
+    """Valida as credenciais e devolve o perfil da sessão (ou None)"""
+    try:
+        hashed_password = sha256(password.encode()).hexdigest()
+        # Lida antes da consulta: uma alteração concorrente invalida o perfil
+        version = get_profile_versions().current()
+        
+        with db_read() as conn:
+            c = conn.cursor()
+            c.execute(f'SELECT {PROFILE_COLUMNS}, password FROM users WHERE username=?',
+                      (username,))
+            user_data = c.fetchone()
+        
+        # Verifica senha e status
+        if not user_data or user_data[-1] != hashed_password or user_data[-2] != 'active':
+            return None
+        
+        update_last_login(user_data[0])
+        return make_user_profile(user_data[:-1], version)
+        
+    except sqlite3.Error as e:
+        print(f"Erro no banco de dados: {e}")
+        return None
+
+def update_last_login(user_id):
+    """Registra um login efetivo (não é chamado nos reruns da sessão)"""
+    now = datetime.now()
+    # last_login/last_seen não são lidos por nenhuma consulta em cache, então a
+    # escrita não invalida as entradas que dependem de users
+    with db_write() as conn:
+        c = conn.cursor()
+        c.execute('UPDATE users SET last_login=?, last_seen=? WHERE id=?', (now, now, user_id))
+    get_session_tracker().touch(user_id, now)
+    log_system_action(user_id, "login", "Login realizado")
+
+# Atividade das sessões: cada rerun só atualiza um dicionário em memória; os
+# horários são gravados em users.last_seen em lote, no máximo uma vez a cada
+# SESSION_FLUSH_INTERVAL segundos para todo o processo.
+SESSION_FLUSH_INTERVAL = float(os.environ.get('MONITOR_SESSION_FLUSH_INTERVAL', '60'))
+ONLINE_WINDOW_MINUTES = 5
+
+class SessionTracker:
+    """Último acesso por usuário, mantido em memória e persistido periodicamente"""
+
+    def __init__(self, flush_interval=SESSION_FLUSH_INTERVAL):
+        self.flush_interval = flush_interval
+        self._last_seen = {}
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        atexit.register(self.flush)
+
+    def touch(self, user_id, when=None):
+        with self._lock:
+            self._last_seen[user_id] = when or datetime.now()
+            self._dirty.add(user_id)
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            self._last_flush = time.monotonic()
+            updates = [(self._last_seen[user_id], user_id) for user_id in self._dirty]
+            self._dirty = set()
+        if updates:
+            with db_write() as conn:
+                conn.executemany('UPDATE users SET last_seen=? WHERE id=?', updates)
+        return len(updates)
+
+    def seen_since(self, cutoff):
+        with self._lock:
+            return {user_id: seen for user_id, seen in self._last_seen.items() if seen >= cutoff}
+
+@st.cache_resource
+def get_session_tracker():
+    return SessionTracker()
+
+def get_online_users(window_minutes=ONLINE_WINDOW_MINUTES):
+    """Usuários com atividade nos últimos minutos, do mais recente ao mais antigo.
+
+    Combina o que ainda está só em memória com o que já foi gravado (outros
+    processos), lido por intervalo no índice de last_seen.
+    """
+    cutoff = datetime.now() - timedelta(minutes=window_minutes)
+    seen = {user_id: to_db_timestamp(when)
+            for user_id, when in get_session_tracker().seen_since(cutoff).items()}
+    with db_read() as conn:
+        for user_id, when in conn.execute('SELECT id, last_seen FROM users WHERE last_seen >= ?',
+                                          (cutoff,)):
+            if when > seen.get(user_id, ''):
+                seen[user_id] = when
+    usernames = get_usernames_by_id()
+    return sorted(((usernames[user_id], when) for user_id, when in seen.items()
+                   if user_id in usernames), key=lambda item: item[1], reverse=True)
+
+def filtered_users_where(dept_filter, status_filter, search):
+    where = " WHERE 1=1"
+    params = []
+    
+    if dept_filter != "Todos":
+        where += " AND department=?"
+        params.append(dept_filter)
+    
+    if status_filter != "Todos":
+        where += " AND status=?"
+        params.append(USER_STATUS_FILTERS[status_filter])
+    
+    match = fts_match(search)
+    if match:
+        where += " AND id IN (SELECT rowid FROM users_fts WHERE users_fts MATCH ?)"
+        params.append(match)
+    return where, params
+
+def get_filtered_users(dept_filter, status_filter, search,
+                       page_size=DEFAULT_PAGE_SIZE, cursor=None, direction='next'):
+    """Página de usuários em ordem de username"""
+    where, params = filtered_users_where(dept_filter, status_filter, search)
+    query = '''SELECT id, username, full_name, email, department, role, status 
+               FROM users''' + where
+    with db_read() as conn:
+        return fetch_keyset_page(conn, UserRow, query, params, [('username', 'username')],
+                                 page_size, cursor, direction, descending=False)
+
+@cached_query('users')
+def count_filtered_users(dept_filter, status_filter, search):
+    where, params = filtered_users_where(dept_filter, status_filter, search)
+    with db_read() as conn:
+        return conn.execute('SELECT COUNT(*) FROM users' + where, params).fetchone()[0]
+
+def toggle_user_status(user_id):
+    with db_write('users') as conn:
+        c = conn.cursor()
+        c.execute('UPDATE users SET status = CASE WHEN status="active" THEN "inactive" ELSE "active" END WHERE id=?', 
+                  (user_id,))
+    get_profile_versions().touch(user_id)
+
+# Funções de departamento
+@cached_query('departments', 'users', 'activities')
+def get_all_departments():
+    # Busca departamentos com contagem de usuários e atividades
+    query = '''
+        SELECT 
+            d.id,
+            d.name,
+            d.description,
+            COUNT(u.id) as user_count,
+            COALESCE(SUM(a.active_tasks), 0) as active_tasks
+        FROM departments d
+        LEFT JOIN users u ON u.department = d.name
+        LEFT JOIN (SELECT user_id, COUNT(*) as active_tasks
+                   FROM activities
+                   WHERE status='em_andamento'
+                   GROUP BY user_id) a ON a.user_id = u.id
+        GROUP BY d.id, d.name, d.description
+    '''
+    return list(query_rows(DepartmentRow, query))
+
+def add_department(name, description):
+    try:
+        with db_write('departments') as conn:
+            c = conn.cursor()
+            c.execute('INSERT INTO departments (name, description, created_at) VALUES (?, ?, ?)',
+                     (name, description, datetime.now()))
+        st.success(f"Departamento {name} criado com sucesso!")
+    except sqlite3.IntegrityError:
+        st.error("Departamento já existe!")
+
+def delete_department(dept_id):
+    with db_write('departments') as conn:
+        c = conn.cursor()
+    
+        # Verificar se há usuários no departamento
+        c.execute('''SELECT COUNT(*) FROM users 
+                     WHERE department=(SELECT name FROM departments WHERE id=?)''',
+                  (dept_id,))
+    
+        if c.fetchone()[0] > 0:
+            st.error("Não é possível excluir departamento com usuários!")
+            return
+    
+        c.execute('DELETE FROM departments WHERE id=?', (dept_id,))
+    st.success("Departamento excluído com sucesso!")
+
+# Funções de métricas e estatísticas
+
+# Contadores exibidos nos cards de métricas de todas as interfaces
+DashboardSnapshot = namedtuple('DashboardSnapshot', [
+    'total',               # todas as atividades do escopo
+    'ongoing',             # em andamento
+    'pending',             # pendentes
+    'completed',           # concluídas
+    'started_today',       # iniciadas hoje
+    'completed_today',     # concluídas hoje
+    'active_users_today',  # usuários com atividade em andamento iniciada hoje
+    'completion_rate',     # % de concluídas sobre o total
+])
+
+def query_dashboard_snapshot(join='', where='1=1', params=()):
+    """Calcula todos os contadores do escopo em uma única agregação.
+
+    Por ser um único SELECT, todos os números vêm do mesmo snapshot de leitura
+    e são consistentes entre si. As atividades arquivadas entram pelo rollup do
+    arquivo (archive.activity_daily_stats, com as mesmas colunas user_id e
+    status usadas em `where`), como nos gráficos: são todas concluídas antes do
+    corte do arquivamento, então só contam no total, nas concluídas e, se
+    iniciadas hoje, em started_today.
+    """
+    day_start, day_end = day_range()
+    with db_read() as conn:
+        archived = ''
+        if archive_ready(conn):
+            archived = f'''
+                UNION ALL
+                SELECT COALESCE(SUM(a.activity_count), 0), 0, 0,
+                       COALESCE(SUM(CASE WHEN a.status='concluida' THEN a.activity_count END), 0),
+                       COALESCE(SUM(CASE WHEN a.day = DATE(:day_start) THEN a.activity_count END), 0),
+                       0, 0
+                FROM archive.activity_daily_stats a
+                {join}
+                WHERE {where}'''
+        c = conn.cursor()
+        c.execute(f'''
+            SELECT SUM(total), SUM(ongoing), SUM(pending), SUM(completed),
+                   SUM(started_today), SUM(completed_today), SUM(active_users)
+            FROM (
+                SELECT
+                    COUNT(*) AS total,
+                    COALESCE(SUM(a.status='em_andamento'), 0) AS ongoing,
+                    COALESCE(SUM(a.status='pendente'), 0) AS pending,
+                    COALESCE(SUM(a.status='concluida'), 0) AS completed,
+                    COALESCE(SUM(a.start_time >= :day_start AND a.start_time < :day_end), 0)
+                        AS started_today,
+                    COALESCE(SUM(a.status='concluida'
+                                 AND a.end_time >= :day_start AND a.end_time < :day_end), 0)
+                        AS completed_today,
+                    COUNT(DISTINCT CASE WHEN a.status='em_andamento'
+                                         AND a.start_time >= :day_start AND a.start_time < :day_end
+                                        THEN a.user_id END) AS active_users
+                FROM main.activities a
+                {join}
+                WHERE {where}{archived}
+            )
+        ''', {'day_start': day_start, 'day_end': day_end, **dict(params)})
+        total, ongoing, pending, completed, started_today, completed_today, active_users = c.fetchone()
+    
+    completion_rate = completed * 100.0 / total if total else 0
+    return DashboardSnapshot(total, ongoing, pending, completed, started_today,
+                             completed_today, active_users, completion_rate)
+
+@cached_query('activities', per_day=True)
+def get_global_snapshot():
+    return query_dashboard_snapshot()
+
+@cached_query('activities', per_day=True)
+def get_user_snapshot(user_id):
+    return query_dashboard_snapshot(where='a.user_id = :user_id',
+                                    params={'user_id': user_id})
+
+# Contadores avulsos: leem o mesmo snapshot dos cards
+def get_total_activities():
+    return get_global_snapshot().total
+
+def get_total_ongoing_activities():
+    return get_global_snapshot().ongoing
+
+def get_pending_activities_count():
+    return get_global_snapshot().pending
+
+def get_activities_today():
+    return get_global_snapshot().started_today
+
+def get_completed_today_count():
+    return get_global_snapshot().completed_today
+
+def get_active_users_count():
+    return get_global_snapshot().active_users_today
+
+def get_team_active_count():
+    return get_global_snapshot().active_users_today
+
+def get_completion_rate():
+    return get_global_snapshot().completion_rate
+
+def get_user_activities_today(user_id):
+    return get_user_snapshot(user_id).started_today
+
+def get_user_completion_rate(user_id):
+    return get_user_snapshot(user_id).completion_rate
+
+def create_activity(user_id, activity, description, priority, category, estimated_hours, comments):
+    with db_write('activities', 'activity_daily_stats') as conn:
+        c = conn.cursor()
+    
+        c.execute('''INSERT INTO activities 
+                     (user_id, activity, description, status, priority, category, 
+                      start_time, estimated_hours, comments, last_updated)
+                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+                  (user_id, activity, description, 'em_andamento', priority, category,
+                   datetime.now(), estimated_hours, comments, datetime.now()))
+        rollup_add(c, c.lastrowid)
+    
+    log_system_action(user_id, "create_activity", f"Nova atividade criada: {activity}")
+
+
+
+def complete_activity(activity_id):
+    with db_write('activities', 'activity_daily_stats') as conn:
+        c = conn.cursor()
+    
+        # Atualizar status e registrar a duração de relógio; o tempo real é o
+        # registrado, se houver (timesheet.ACTUAL_HOURS)
+        end_time = datetime.now()
+        rollup_remove(c, activity_id)
+        c.execute('''UPDATE activities 
+                     SET status='concluida', 
+                         end_time=?, 
+                         wall_clock_hours=ROUND(
+                             (JULIANDAY(?) - JULIANDAY(start_time)) * 24, 2),
+                         last_updated=?
+                     WHERE id=?''', 
+                  (end_time, end_time, end_time, activity_id))
+        c.execute(f'UPDATE activities SET actual_hours = {ACTUAL_HOURS} WHERE id=?', (activity_id,))
+        rollup_add(c, activity_id)
+
+# Funções auxiliares de dados
+def get_user_active_activities(user_id, status_filter="Todas",
+                               page_size=DEFAULT_PAGE_SIZE, cursor=None, direction='next'):
+    query = '''SELECT * FROM activities WHERE user_id=?'''
+    params = [user_id]
+    
+    # Aplicar o filtro de status, se necessário
+    if status_filter != "Todas":
+        query += " AND status=?"
+        params.append(ACTIVITY_STATUS_FILTERS[status_filter])
+    
+    with db_read() as conn:
+        return fetch_keyset_page(conn, ActivityRow, query, params,
+                                 [('start_time', 'start_time'), ('id', 'id')],
+                                 page_size, cursor, direction)
+
+@cached_query('activity_daily_stats', 'activities')
+def count_user_activities(user_id, status_filter="Todas"):
+    """Total aproximado para a paginação, lido do rollup diário, sem as
+    atividades arquivadas (a lista lê só a camada quente)"""
+    where = ' AND status=?' if status_filter != "Todas" else ''
+    params = [user_id] + ([ACTIVITY_STATUS_FILTERS[status_filter]] if where else [])
+    
+    def total(stats):
+        return f'''(SELECT COALESCE(SUM(activity_count), 0)
+                    FROM {stats} WHERE user_id=?{where})'''
+    
+    with db_read() as conn:
+        if not archive_ready(conn):
+            return conn.execute('SELECT ' + total('main.activity_daily_stats'), params).fetchone()[0]
+        return conn.execute(f"SELECT {total('main.activity_daily_stats')} - "
+                            f"{total('archive.activity_daily_stats')}", params * 2).fetchone()[0]
+
+# Painel em tempo real: cada sessão carrega as atividades em andamento uma vez
+# e, a cada REALTIME_REFRESH_SECONDS, busca só as linhas com last_updated a
+# partir do seu cursor. Exclusões não aparecem nesse delta, por isso o painel
+# recarrega tudo a cada REALTIME_RESYNC_SECONDS.
+REALTIME_REFRESH_SECONDS = int(os.environ.get('MONITOR_REALTIME_REFRESH', '10'))
+REALTIME_RESYNC_SECONDS = 300
+REALTIME_COLUMNS = '''a.id, a.activity, a.priority, a.status, a.start_time, a.last_updated,
+                      u.full_name'''
+
+def get_realtime_activities():
+    query = f'''
+        SELECT {REALTIME_COLUMNS}
+        FROM activities a
+        JOIN users u ON a.user_id = u.id
+        WHERE a.status = 'em_andamento'
+        ORDER BY a.start_time DESC
+    '''
+    return query_rows(ActivityRow, query)
+
+def get_realtime_changes(since):
+    """Atividades (de qualquer status) alteradas a partir de `since`.
+
+    O cursor é inclusivo porque last_updated tem resolução de segundos; linhas
+    repetidas são reaplicadas sem efeito pelo painel.
+    """
+    query = f'''
+        SELECT {REALTIME_COLUMNS}
+        FROM activities a
+        JOIN users u ON a.user_id = u.id
+        WHERE a.last_updated >= ?
+    '''
+    return query_rows(ActivityRow, query, (since,))
+
+# Funções Auxiliares
+@cached_query('departments')
+def get_departments():
+    with db_read() as conn:
+        c = conn.cursor()
+        c.execute('SELECT name FROM departments ORDER BY name')
+        departments = [row[0] for row in c.fetchall()]
+    return departments
+def update_user(user_id, full_name, email, department, role, new_password=None):
+    with db_write('users', 'activity_daily_stats') as conn:
+        c = conn.cursor()
+    
+        if new_password:
+            hashed_password = sha256(new_password.encode()).hexdigest()
+            c.execute('''UPDATE users 
+                         SET full_name=?, email=?, department=?, role=?, password=?
+                         WHERE id=?''', 
+                     (full_name, email, department, role, hashed_password, user_id))
+        else:
+            c.execute('''UPDATE users 
+                         SET full_name=?, email=?, department=?, role=?
+                         WHERE id=?''', 
+                     (full_name, email, department, role, user_id))
+        
+        # Mantém o rollup coerente com o departamento atual do usuário
+        for stats in ('main.activity_daily_stats', 'archive.activity_daily_stats'):
+            c.execute(f'UPDATE {stats} SET department=? WHERE user_id=? AND department!=?',
+                      (department or '', user_id, department or ''))
+    get_profile_versions().touch(user_id)
+
+def update_department(dept_id, name, description):
+    with db_write('departments') as conn:
+        c = conn.cursor()
+        c.execute('UPDATE departments SET name=?, description=? WHERE id=?',
+                  (name, description, dept_id))
+
+@cached_query('users')
+def get_usernames_by_id():
+    with db_read() as conn:
+        return dict(conn.execute('SELECT id, username FROM users').fetchall())
+
+def get_access_logs(start_date, end_date):
+    # Os logs ficam nas partições mensais; o nome do usuário vem do banco principal
+    logs = read_system_logs(*period_range(start_date, end_date))
+    usernames = get_usernames_by_id()
+    return [(usernames[user_id], action, timestamp)
+            for user_id, action, timestamp in logs if user_id in usernames]
@@ -0,0 +1,213 @@
+"""Relatórios exportáveis em CSV e Parquet.
+
+    python task-monitoring-app.py export-report atividades --start 2024-01-01 --end 2024-12-31 -o atividades.csv
+    python task-monitoring-app.py export-report usuarios --format parquet -o usuarios.parquet
+
+As linhas saem do cursor em blocos de EXPORT_CHUNK_ROWS e são gravadas bloco
+a bloco (no Parquet, um row group por bloco), então a memória usada não
+depende do tamanho do período exportado.
+"""
+
+import argparse
+import csv
+import os
+import tempfile
+from collections import namedtuple
+from datetime import date, timedelta
+
+from .db import activities_source, daily_stats_source, db_read, period_range
+
+EXPORT_CHUNK_ROWS = 5000
+EXPORT_FORMATS = ('csv', 'parquet')
+
+# columns: (nome, tipo) na ordem do SELECT; tipo é int, float, text ou timestamp.
+# As consultas recebem :start/:end (timestamps, intervalo semiaberto) e
+# :start_day/:end_day (dias do rollup, inclusivos). {activities} é a camada
+# quente ou, com include_archive, a união com o arquivo; {stats}, o rollup
+# diário sem ou com a parte das atividades arquivadas.
+ReportSpec = namedtuple('ReportSpec', 'title query columns')
+
+REPORTS = {
+    'atividades': ReportSpec("Atividades por Período", '''
+        SELECT a.id, a.activity, COALESCE(u.full_name, u.username) AS user, u.department,
+               a.status, a.priority, a.category, a.start_time, a.end_time,
+               a.estimated_hours, a.actual_hours, a.tracked_hours, a.wall_clock_hours
+        FROM {activities} a
+        LEFT JOIN users u ON u.id = a.user_id
+        WHERE a.start_time >= :start AND a.start_time < :end
+        ORDER BY a.start_time, a.id
+    ''', [('id', 'int'), ('activity', 'text'), ('user', 'text'), ('department', 'text'),
+          ('status', 'text'), ('priority', 'text'), ('category', 'text'),
+          ('start_time', 'timestamp'), ('end_time', 'timestamp'),
+          ('estimated_hours', 'float'), ('actual_hours', 'float'), ('tracked_hours', 'float'),
+          ('wall_clock_hours', 'float')]),
+    'usuarios': ReportSpec("Performance por Usuário", '''
+        SELECT u.id AS user_id, COALESCE(u.full_name, u.username) AS user, u.department,
+               SUM(s.activity_count) AS activities,
+               SUM(CASE WHEN s.status = 'concluida' THEN s.activity_count ELSE 0 END) AS completed,
+               SUM(CASE WHEN s.status = 'em_andamento' THEN s.activity_count ELSE 0 END) AS in_progress,
+               SUM(CASE WHEN s.status = 'pendente' THEN s.activity_count ELSE 0 END) AS pending,
+               ROUND(SUM(CASE WHEN s.status = 'concluida' THEN s.activity_count ELSE 0 END) * 100.0
+                     / SUM(s.activity_count), 1) AS completion_rate,
+               ROUND(SUM(s.estimated_hours), 2) AS estimated_hours,
+               ROUND(SUM(s.actual_hours), 2) AS actual_hours
+        FROM {stats} s
+        JOIN users u ON u.id = s.user_id
+        WHERE s.day >= :start_day AND s.day <= :end_day
+        GROUP BY u.id
+        HAVING SUM(s.activity_count) > 0
+        ORDER BY user
+    ''', [('user_id', 'int'), ('user', 'text'), ('department', 'text'), ('activities', 'int'),
+          ('completed', 'int'), ('in_progress', 'int'), ('pending', 'int'),
+          ('completion_rate', 'float'), ('estimated_hours', 'float'), ('actual_hours', 'float')]),
+    'departamentos': ReportSpec("Análise de Departamentos", '''
+        SELECT COALESCE(NULLIF(s.department, ''), 'Sem departamento') AS department,
+               COUNT(DISTINCT s.user_id) AS users,
+               SUM(s.activity_count) AS activities,
+               SUM(CASE WHEN s.status = 'concluida' THEN s.activity_count ELSE 0 END) AS completed,
+               ROUND(SUM(CASE WHEN s.status = 'concluida' THEN s.activity_count ELSE 0 END) * 100.0
+                     / SUM(s.activity_count), 1) AS completion_rate,
+               ROUND(SUM(s.estimated_hours), 2) AS estimated_hours,
+               ROUND(SUM(s.actual_hours), 2) AS actual_hours
+        FROM {stats} s
+        WHERE s.day >= :start_day AND s.day <= :end_day AND s.user_id != 0
+        GROUP BY 1
+        HAVING SUM(s.activity_count) > 0
+        ORDER BY 1
+    ''', [('department', 'text'), ('users', 'int'), ('activities', 'int'), ('completed', 'int'),
+          ('completion_rate', 'float'), ('estimated_hours', 'float'), ('actual_hours', 'float')]),
+    'tempo-conclusao': ReportSpec("Tempo Médio de Conclusão", '''
+        SELECT COALESCE(NULLIF(u.department, ''), 'Sem departamento') AS department,
+               COALESCE(a.category, '') AS category,
+               COUNT(*) AS completed,
+               ROUND(AVG((JULIANDAY(a.end_time) - JULIANDAY(a.start_time)) * 24), 2)
+                   AS avg_elapsed_hours,
+               ROUND(AVG(a.actual_hours), 2) AS avg_actual_hours,
+               ROUND(AVG(a.estimated_hours), 2) AS avg_estimated_hours
+        FROM {activities} a
+        LEFT JOIN users u ON u.id = a.user_id
+        WHERE a.status = 'concluida' AND a.end_time >= :start AND a.end_time < :end
+        GROUP BY 1, 2
+        ORDER BY 1, 2
+    ''', [('department', 'text'), ('category', 'text'), ('completed', 'int'),
+          ('avg_elapsed_hours', 'float'), ('avg_actual_hours', 'float'),
+          ('avg_estimated_hours', 'float')]),
+}
+REPORT_TITLES = {spec.title: name for name, spec in REPORTS.items()}
+
+def report_params(start_date, end_date):
+    start, end = period_range(start_date, end_date)
+    return {'start': start, 'end': end,
+            'start_day': start_date.isoformat(), 'end_day': end_date.isoformat()}
+
+def iter_report_chunks(name, start_date, end_date, chunk_rows=EXPORT_CHUNK_ROWS,
+                       include_archive=False):
+    """Gera as linhas do relatório em listas de até `chunk_rows` tuplas"""
+    query = REPORTS[name].query.format(activities=activities_source(include_archive),
+                                       stats=daily_stats_source(include_archive))
+    with db_read() as conn:
+        c = conn.cursor()
+        c.execute(query, report_params(start_date, end_date))
+        while True:
+            rows = c.fetchmany(chunk_rows)
+            if not rows:
+                return
+            yield rows
+
+def write_csv(name, chunks, stream):
+    """Grava os blocos em `stream` (texto); devolve o número de linhas"""
+    writer = csv.writer(stream)
+    writer.writerow([column for column, _ in REPORTS[name].columns])
+    total = 0
+    for rows in chunks:
+        writer.writerows(rows)
+        total += len(rows)
+    return total
+
+def parquet_schema(name):
+    import pyarrow as pa
+    types = {'int': pa.int64(), 'float': pa.float64(), 'text': pa.string(),
+             'timestamp': pa.timestamp('s')}
+    return pa.schema([(column, types[kind]) for column, kind in REPORTS[name].columns])
+
+def write_parquet(name, chunks, sink):
+    """Grava os blocos em `sink` (caminho ou arquivo binário), um row group por
+    bloco; devolve o número de linhas"""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+
+    schema = parquet_schema(name)
+    total = 0
+    with pq.ParquetWriter(sink, schema) as writer:
+        for rows in chunks:
+            arrays = []
+            for i, (column, kind) in enumerate(REPORTS[name].columns):
+                values = [row[i] for row in rows]
+                if kind == 'timestamp':
+                    arrays.append(pc.strptime(pa.array(values, pa.string()),
+                                              format='%Y-%m-%d %H:%M:%S', unit='s'))
+                else:
+                    arrays.append(pa.array(values, schema.field(column).type))
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            total += len(rows)
+    return total
+
+def export_report(name, start_date, end_date, fmt, path, chunk_rows=EXPORT_CHUNK_ROWS,
+                  include_archive=False):
+    """Exporta o relatório para `path`; devolve o número de linhas"""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"formato não suportado: {fmt}")
+    chunks = iter_report_chunks(name, start_date, end_date, chunk_rows, include_archive)
+    if fmt == 'csv':
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            return write_csv(name, chunks, f)
+    return write_parquet(name, chunks, path)
+
+def export_report_to_tempfile(name, start_date, end_date, fmt, include_archive=False):
+    """Exporta para um arquivo temporário; devolve (caminho, linhas).
+    Quem chama remove o arquivo quando não precisar mais dele."""
+    fd, path = tempfile.mkstemp(prefix=f'{name}-', suffix=f'.{fmt}')
+    os.close(fd)
+    try:
+        return path, export_report(name, start_date, end_date, fmt, path,
+                                   include_archive=include_archive)
+    except Exception:
+        os.remove(path)
+        raise
+
+def export_report_bytes(name, start_date, end_date, fmt, include_archive=False):
+    """Conteúdo do relatório exportado, para download; o arquivo temporário da
+    geração é removido antes de devolver"""
+    path, _ = export_report_to_tempfile(name, start_date, end_date, fmt, include_archive)
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    finally:
+        os.remove(path)
+
+def export_file_name(name, start_date, end_date, fmt):
+    return f"{name}_{start_date:%Y%m%d}_{end_date:%Y%m%d}.{fmt}"
+
+def main(argv=None):
+    today = date.today()
+    parser = argparse.ArgumentParser(prog='task-monitoring-app.py export-report',
+                                     description="Exporta um relatório em CSV ou Parquet")
+    parser.add_argument('report', choices=list(REPORTS))
+    parser.add_argument('--start', type=date.fromisoformat, default=today - timedelta(days=30),
+                        help='primeiro dia (AAAA-MM-DD); padrão: 30 dias atrás')
+    parser.add_argument('--end', type=date.fromisoformat, default=today,
+                        help='último dia (AAAA-MM-DD); padrão: hoje')
+    parser.add_argument('--format', choices=EXPORT_FORMATS,
+                        help='padrão: pela extensão do arquivo de saída')
+    parser.add_argument('-o', '--output', help='padrão: <relatório>_<início>_<fim>.<formato>')
+    parser.add_argument('--chunk-rows', type=int, default=EXPORT_CHUNK_ROWS)
+    parser.add_argument('--include-archive', action='store_true',
+                        help='inclui as atividades arquivadas')
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ('parquet' if (args.output or '').endswith('.parquet') else 'csv')
+    output = args.output or export_file_name(args.report, args.start, args.end, fmt)
+    rows = export_report(args.report, args.start, args.end, fmt, output, args.chunk_rows,
+                         args.include_archive)
+    print(f"{rows} linhas gravadas em {output}")
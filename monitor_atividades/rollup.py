@@ -0,0 +1,90 @@
+"""Rollup diário de atividades (activity_daily_stats)."""
+
+from datetime import datetime, timedelta
+
+from .db import ALL_ACTIVITIES, archive_ready, db_write
+
+# Estatísticas diárias (rollup). Cada atividade contribui para uma linha de
+# activity_daily_stats chaveada por (dia de início, usuário, departamento,
+# categoria, status). As funções de escrita retiram a contribuição antiga com
+# rollup_remove antes de alterar a atividade e somam a nova com rollup_add
+# depois, na mesma transação.
+ROLLUP_KEY_SELECT = '''
+    SELECT DATE(a.start_time), COALESCE(a.user_id, 0), COALESCE(u.department, ''),
+           COALESCE(a.category, ''), a.status
+    FROM activities a
+    LEFT JOIN users u ON u.id = a.user_id
+    WHERE a.id = :activity_id
+'''
+
+def rollup_apply(c, activity_id, sign):
+    c.execute('''
+        INSERT INTO activity_daily_stats
+            (day, user_id, department, category, status,
+             activity_count, estimated_hours, actual_hours)
+        SELECT DATE(a.start_time), COALESCE(a.user_id, 0), COALESCE(u.department, ''),
+               COALESCE(a.category, ''), a.status,
+               :sign, :sign * COALESCE(a.estimated_hours, 0), :sign * COALESCE(a.actual_hours, 0)
+        FROM activities a
+        LEFT JOIN users u ON u.id = a.user_id
+        WHERE a.id = :activity_id
+        ON CONFLICT (day, user_id, department, category, status) DO UPDATE SET
+            activity_count = activity_count + excluded.activity_count,
+            estimated_hours = estimated_hours + excluded.estimated_hours,
+            actual_hours = actual_hours + excluded.actual_hours
+    ''', {'activity_id': activity_id, 'sign': sign})
+
+def rollup_add(c, activity_id):
+    rollup_apply(c, activity_id, 1)
+
+def rollup_remove(c, activity_id):
+    rollup_apply(c, activity_id, -1)
+    c.execute(f'''DELETE FROM activity_daily_stats
+                  WHERE activity_count <= 0
+                  AND (day, user_id, department, category, status) = ({ROLLUP_KEY_SELECT})''',
+              {'activity_id': activity_id})
+
+def rollup_add_where(c, where, params=(), source='main.activities',
+                     target='main.activity_daily_stats'):
+    """Soma ao rollup `target` as atividades de `source` que satisfazem `where`
+    (cargas em lote, arquivamento e recálculo)"""
+    c.execute(f'''
+        INSERT INTO {target}
+            (day, user_id, department, category, status,
+             activity_count, estimated_hours, actual_hours)
+        SELECT DATE(a.start_time), COALESCE(a.user_id, 0), COALESCE(u.department, ''),
+               COALESCE(a.category, ''), a.status,
+               COUNT(*), COALESCE(SUM(a.estimated_hours), 0), COALESCE(SUM(a.actual_hours), 0)
+        FROM {source} a
+        LEFT JOIN main.users u ON u.id = a.user_id
+        WHERE ({where}) AND a.start_time IS NOT NULL
+        GROUP BY 1, 2, 3, 4, 5
+        ON CONFLICT (day, user_id, department, category, status) DO UPDATE SET
+            activity_count = activity_count + excluded.activity_count,
+            estimated_hours = estimated_hours + excluded.estimated_hours,
+            actual_hours = actual_hours + excluded.actual_hours
+    ''', params)
+    return c.rowcount
+
+def rollup_add_range(c, first_id, last_id):
+    """Soma ao rollup as atividades com id entre first_id e last_id (cargas em lote)"""
+    rollup_add_where(c, 'a.id BETWEEN ? AND ?', (first_id, last_id))
+
+def rollup_window_start(days):
+    """Primeiro dia (texto YYYY-MM-DD) de uma janela de `days` dias no rollup"""
+    return (datetime.now().date() - timedelta(days=days)).isoformat()
+
+def rebuild_activity_daily_stats(c=None):
+    """Recalcula o rollup inteiro a partir de activities (backfill/correção).
+    Com o arquivo criado, conta também as atividades arquivadas e recalcula a
+    parte delas (archive.activity_daily_stats)."""
+    if c is None:
+        with db_write('activity_daily_stats') as conn:
+            return rebuild_activity_daily_stats(conn.cursor())
+    
+    c.execute('DELETE FROM main.activity_daily_stats')
+    if not archive_ready(c):
+        return rollup_add_where(c, '1')
+    c.execute('DELETE FROM archive.activity_daily_stats')
+    rollup_add_where(c, '1', source='archive.activities', target='archive.activity_daily_stats')
+    return rollup_add_where(c, '1', source=ALL_ACTIVITIES)
@@ -0,0 +1,536 @@
+"""Migrações do esquema, dados iniciais e reset do banco."""
+
+import streamlit as st
+from datetime import datetime
+import sqlite3
+from hashlib import sha256
+import os
+
+from .db import ARCHIVE_DB_PATH, DB_PATH, archive_ready, db_read, db_write, get_db, get_query_cache
+from .logs import (
+    apply_log_retention, get_log_db, get_log_writer, init_log_db, move_legacy_system_logs,
+    remove_log_files
+)
+from .archive import ensure_archive_schema
+from .changes import compact_changes
+
+# Migrações do schema. Cada migração recebe um cursor dentro de uma transação
+# de escrita e é registrada em schema_version; nunca altere uma migração já
+# publicada, adicione uma nova ao final da lista.
+def migration_001_core_tables(c):
+    # Tabela de usuários com campos adicionais
+    c.execute('''CREATE TABLE IF NOT EXISTS users
+                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                  username TEXT UNIQUE NOT NULL,
+                  password TEXT NOT NULL,
+                  role TEXT NOT NULL,
+                  full_name TEXT,
+                  email TEXT,
+                  department TEXT,
+                  last_login TIMESTAMP,
+                  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                  status TEXT DEFAULT 'active')''')
+    
+    # Tabela de atividades com campos adicionais
+    c.execute('''CREATE TABLE IF NOT EXISTS activities
+                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                  user_id INTEGER,
+                  activity TEXT NOT NULL,
+                  description TEXT,
+                  status TEXT NOT NULL DEFAULT 'pendente',
+                  priority TEXT DEFAULT 'Média',
+                  category TEXT,
+                  start_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                  end_time TIMESTAMP,
+                  estimated_hours FLOAT DEFAULT 1.0,
+                  actual_hours FLOAT,
+                  comments TEXT,
+                  attachments TEXT,
+                  last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                  FOREIGN KEY (user_id) REFERENCES users (id))''')
+    
+    # Tabela de departamentos
+    c.execute('''CREATE TABLE IF NOT EXISTS departments
+                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                  name TEXT UNIQUE NOT NULL,
+                  description TEXT,
+                  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
+    
+    # Tabela de logs do sistema
+    c.execute('''CREATE TABLE IF NOT EXISTS system_logs
+                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                  user_id INTEGER,
+                  action TEXT,
+                  details TEXT,
+                  timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                  FOREIGN KEY (user_id) REFERENCES users (id))''')
+
+def migration_002_auxiliary_tables(c):
+    # Tags das atividades
+    c.execute('''CREATE TABLE IF NOT EXISTS activity_tags
+                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                  activity_id INTEGER,
+                  tag TEXT,
+                  FOREIGN KEY (activity_id) REFERENCES activities(id))''')
+    
+    # Dependências entre atividades
+    c.execute('''CREATE TABLE IF NOT EXISTS activity_dependencies
+                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                  activity_id INTEGER,
+                  depends_on INTEGER,
+                  FOREIGN KEY (activity_id) REFERENCES activities(id),
+                  FOREIGN KEY (depends_on) REFERENCES activities(id))''')
+    
+    # Comentários/histórico das atividades
+    c.execute('''CREATE TABLE IF NOT EXISTS activity_comments
+                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                  activity_id INTEGER,
+                  user_id INTEGER,
+                  comment TEXT,
+                  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                  FOREIGN KEY (activity_id) REFERENCES activities(id),
+                  FOREIGN KEY (user_id) REFERENCES users(id))''')
+    
+    # Registro de tempo gasto
+    c.execute('''CREATE TABLE IF NOT EXISTS time_tracking
+                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                  activity_id INTEGER,
+                  user_id INTEGER,
+                  hours_spent FLOAT,
+                  description TEXT,
+                  tracked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                  FOREIGN KEY (activity_id) REFERENCES activities(id),
+                  FOREIGN KEY (user_id) REFERENCES users(id))''')
+    
+    # Lembretes/notificações
+    c.execute('''CREATE TABLE IF NOT EXISTS activity_reminders
+                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                  activity_id INTEGER,
+                  user_id INTEGER,
+                  reminder_date TIMESTAMP,
+                  reminder_type TEXT,
+                  sent BOOLEAN DEFAULT FALSE,
+                  FOREIGN KEY (activity_id) REFERENCES activities(id),
+                  FOREIGN KEY (user_id) REFERENCES users(id))''')
+
+def migration_003_indexes(c):
+    # get_filtered_activities / get_realtime_activities / get_completed_today_count:
+    # filtro por status + ordenação ou intervalo de datas
+    c.execute('CREATE INDEX IF NOT EXISTS idx_activities_status_start ON activities (status, start_time)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_activities_status_end ON activities (status, end_time)')
+    # Atividades de um usuário (join com users, filtros por usuário/status)
+    c.execute('CREATE INDEX IF NOT EXISTS idx_activities_user_status_start ON activities (user_id, status, start_time)')
+    # Listagens sem filtro ordenadas por início / janelas de timeline
+    c.execute('CREATE INDEX IF NOT EXISTS idx_activities_start ON activities (start_time)')
+    
+    c.execute('CREATE INDEX IF NOT EXISTS idx_users_department ON users (department)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_users_status_name ON users (status, full_name)')
+    
+    # get_access_logs: intervalo por timestamp
+    c.execute('CREATE INDEX IF NOT EXISTS idx_system_logs_timestamp ON system_logs (timestamp)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_system_logs_user ON system_logs (user_id, timestamp)')
+    
+    c.execute('CREATE INDEX IF NOT EXISTS idx_activity_tags_activity ON activity_tags (activity_id)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_activity_tags_tag ON activity_tags (tag)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_dependencies_activity ON activity_dependencies (activity_id)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_dependencies_depends_on ON activity_dependencies (depends_on)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_comments_activity ON activity_comments (activity_id, created_at)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_time_tracking_activity ON time_tracking (activity_id)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_reminders_pending ON activity_reminders (sent, reminder_date)')
+
+def migration_004_canonical_timestamps(c):
+    # Valores gravados pelo Python (datetime.now()) estão em horário local,
+    # às vezes com microssegundos: apenas normaliza o formato
+    for table, column in [('users', 'last_login'), ('users', 'created_at'),
+                          ('activities', 'start_time'), ('activities', 'end_time'),
+                          ('activities', 'last_updated'), ('system_logs', 'timestamp'),
+                          ('activity_reminders', 'reminder_date')]:
+        c.execute(f"""UPDATE {table}
+                      SET {column} = strftime('%Y-%m-%d %H:%M:%S', {column})
+                      WHERE {column} != strftime('%Y-%m-%d %H:%M:%S', {column})""")
+    
+    # Colunas preenchidas apenas pelo DEFAULT CURRENT_TIMESTAMP estão em UTC
+    for table, column in [('departments', 'created_at'), ('activity_comments', 'created_at'),
+                          ('time_tracking', 'tracked_at')]:
+        c.execute(f"""UPDATE {table}
+                      SET {column} = datetime({column}, 'localtime')
+                      WHERE {column} IS NOT NULL""")
+
+def migration_005_activity_daily_stats(c):
+    c.execute('''CREATE TABLE IF NOT EXISTS activity_daily_stats
+                 (day TEXT NOT NULL,
+                  user_id INTEGER NOT NULL,
+                  department TEXT NOT NULL,
+                  category TEXT NOT NULL,
+                  status TEXT NOT NULL,
+                  activity_count INTEGER NOT NULL DEFAULT 0,
+                  estimated_hours FLOAT NOT NULL DEFAULT 0,
+                  actual_hours FLOAT NOT NULL DEFAULT 0,
+                  PRIMARY KEY (day, user_id, department, category, status))''')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_daily_stats_user_day ON activity_daily_stats (user_id, day)')
+    # Carga inicial; o SQL fica aqui (e não em rollup.py) para a migração não
+    # mudar junto com o rebuild
+    c.execute('''INSERT INTO activity_daily_stats
+                     (day, user_id, department, category, status,
+                      activity_count, estimated_hours, actual_hours)
+                 SELECT DATE(a.start_time), COALESCE(a.user_id, 0), COALESCE(u.department, ''),
+                        COALESCE(a.category, ''), a.status,
+                        COUNT(*), COALESCE(SUM(a.estimated_hours), 0), COALESCE(SUM(a.actual_hours), 0)
+                 FROM activities a
+                 LEFT JOIN users u ON u.id = a.user_id
+                 WHERE a.start_time IS NOT NULL
+                 GROUP BY 1, 2, 3, 4, 5''')
+
+def migration_006_pagination_indexes(c):
+    # Listas de usuários paginadas por username, com e sem filtros
+    c.execute('CREATE INDEX IF NOT EXISTS idx_users_department_username ON users (department, username)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_users_status_username ON users (status, username)')
+
+def migration_007_users_last_seen(c):
+    # last_login passa a registrar só logins; a atividade da sessão vai para last_seen
+    c.execute('ALTER TABLE users ADD COLUMN last_seen TIMESTAMP')
+    c.execute('UPDATE users SET last_seen = last_login')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_users_last_seen ON users (last_seen)')
+
+def migration_008_activities_last_updated_index(c):
+    # Painel em tempo real: busca só o que mudou desde a última atualização
+    c.execute('CREATE INDEX IF NOT EXISTS idx_activities_last_updated ON activities (last_updated)')
+
+def migration_009_change_feed(c):
+    # Feed de alterações: uma linha por inserção, atualização ou exclusão nas
+    # tabelas abaixo. AUTOINCREMENT garante que seq nunca é reutilizado, mesmo
+    # depois de a compactação apagar as linhas mais recentes.
+    c.execute('''CREATE TABLE IF NOT EXISTS changes
+                 (seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                  table_name TEXT NOT NULL,
+                  row_id INTEGER NOT NULL,
+                  op TEXT NOT NULL,
+                  changed_at TIMESTAMP NOT NULL)''')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_changes_table_seq ON changes (table_name, seq)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_changes_changed_at ON changes (changed_at)')
+    
+    now = "strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime')"
+    # last_login/last_seen mudam a cada sessão e não interessam aos consumidores
+    user_columns = 'username, password, role, full_name, email, department, status'
+    for table in ('activities', 'users', 'departments', 'activity_tags',
+                  'activity_dependencies', 'activity_comments', 'time_tracking',
+                  'activity_reminders'):
+        update_of = f' OF {user_columns}' if table == 'users' else ''
+        for op, event, ref in (('insert', 'INSERT', 'NEW'), ('update', f'UPDATE{update_of}', 'NEW'),
+                               ('delete', 'DELETE', 'OLD')):
+            c.execute(f'''CREATE TRIGGER IF NOT EXISTS trg_changes_{table}_{op}
+                          AFTER {event} ON {table}
+                          BEGIN
+                              INSERT INTO changes (table_name, row_id, op, changed_at)
+                              VALUES ('{table}', {ref}.id, '{op}', {now});
+                          END''')
+
+def migration_010_import_checkpoints(c):
+    # Progresso das importações em lote, gravado na mesma transação de cada lote
+    c.execute('''CREATE TABLE IF NOT EXISTS import_checkpoints
+                 (source_key TEXT PRIMARY KEY,
+                  source_name TEXT,
+                  records_done INTEGER NOT NULL DEFAULT 0,
+                  inserted INTEGER NOT NULL DEFAULT 0,
+                  rejected INTEGER NOT NULL DEFAULT 0,
+                  finished INTEGER NOT NULL DEFAULT 0,
+                  updated_at TIMESTAMP)''')
+
+# Documento indexado de uma atividade: título, descrição, comentários (coluna
+# comments e activity_comments) e tags. :id é substituído pela expressão do id.
+ACTIVITY_SEARCH_DOCUMENT = '''
+    SELECT a.id, a.activity, a.description,
+           TRIM(COALESCE(a.comments, '') || ' ' || COALESCE(
+               (SELECT group_concat(comment, ' ') FROM activity_comments
+                WHERE activity_id = a.id), '')),
+           (SELECT group_concat(tag, ' ') FROM activity_tags WHERE activity_id = a.id)
+    FROM activities a
+    WHERE a.id = {id}'''
+
+def migration_011_search_index(c):
+    # Busca textual. activities_fts guarda uma cópia do documento (tags e
+    # comentários vêm de outras tabelas) com rowid = id da atividade;
+    # users_fts lê o conteúdo da própria tabela users.
+    tokenize = "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'"
+    c.execute(f'''CREATE VIRTUAL TABLE IF NOT EXISTS activities_fts
+                  USING fts5(activity, description, comments, tags, {tokenize})''')
+    c.execute(f'''CREATE VIRTUAL TABLE IF NOT EXISTS users_fts
+                  USING fts5(username, full_name, email, content = 'users',
+                             content_rowid = 'id', {tokenize})''')
+    
+    def index(ref):
+        return (f"INSERT INTO activities_fts (rowid, activity, description, comments, tags)"
+                f"{ACTIVITY_SEARCH_DOCUMENT.format(id=ref)};")
+    
+    def reindex(ref):
+        return f"DELETE FROM activities_fts WHERE rowid = {ref};\n" + index(ref)
+    
+    triggers = {
+        'activities_insert': ('AFTER INSERT ON activities', index('NEW.id')),
+        'activities_update': ('AFTER UPDATE OF activity, description, comments ON activities',
+                              reindex('NEW.id')),
+        'activities_delete': ('AFTER DELETE ON activities',
+                              'DELETE FROM activities_fts WHERE rowid = OLD.id;'),
+        'users_insert': ('AFTER INSERT ON users',
+                         '''INSERT INTO users_fts (rowid, username, full_name, email)
+                            VALUES (NEW.id, NEW.username, NEW.full_name, NEW.email);'''),
+        'users_update': ('AFTER UPDATE OF username, full_name, email ON users',
+                         '''INSERT INTO users_fts (users_fts, rowid, username, full_name, email)
+                            VALUES ('delete', OLD.id, OLD.username, OLD.full_name, OLD.email);
+                            INSERT INTO users_fts (rowid, username, full_name, email)
+                            VALUES (NEW.id, NEW.username, NEW.full_name, NEW.email);'''),
+        'users_delete': ('AFTER DELETE ON users',
+                         '''INSERT INTO users_fts (users_fts, rowid, username, full_name, email)
+                            VALUES ('delete', OLD.id, OLD.username, OLD.full_name, OLD.email);'''),
+    }
+    for table in ('activity_tags', 'activity_comments'):
+        triggers[f'{table}_insert'] = (f'AFTER INSERT ON {table}', reindex('NEW.activity_id'))
+        triggers[f'{table}_update'] = (f'AFTER UPDATE ON {table}',
+                                       reindex('OLD.activity_id') + '\n' + reindex('NEW.activity_id'))
+        triggers[f'{table}_delete'] = (f'AFTER DELETE ON {table}', reindex('OLD.activity_id'))
+    for name, (event, body) in triggers.items():
+        c.execute(f'''CREATE TRIGGER IF NOT EXISTS trg_search_{name} {event}
+                      BEGIN
+                          {body}
+                      END''')
+    
+    c.execute('DELETE FROM activities_fts')
+    c.execute('''INSERT INTO activities_fts (rowid, activity, description, comments, tags)'''
+              + ACTIVITY_SEARCH_DOCUMENT.format(id='a.id'))
+    c.execute("INSERT INTO users_fts (users_fts) VALUES ('rebuild')")
+
+def time_total_changes(ref, sign):
+    """Corpo de trigger: soma (sign='+') ou retira (sign='-') o lançamento `ref`
+    de activities.tracked_hours e de time_daily_totals"""
+    hours = f'COALESCE({ref}.hours_spent, 0)'
+    user = f'COALESCE({ref}.user_id, 0)'
+    return f'''
+        UPDATE activities SET tracked_hours = tracked_hours {sign} {hours}
+        WHERE id = {ref}.activity_id;
+        INSERT INTO time_daily_totals (user_id, day, hours, entries)
+        SELECT {user}, DATE({ref}.tracked_at), {sign}{hours}, {sign}1
+        WHERE {ref}.tracked_at IS NOT NULL
+        ON CONFLICT (user_id, day) DO UPDATE SET
+            hours = hours + excluded.hours,
+            entries = entries + excluded.entries;
+        DELETE FROM time_daily_totals
+        WHERE user_id = {user} AND day = DATE({ref}.tracked_at) AND entries <= 0;'''
+
+def migration_012_time_totals(c):
+    # Tempo registrado (soma de time_tracking) e duração de relógio em colunas
+    # separadas; totais por atividade e por (usuário, dia) mantidos por triggers
+    c.execute('ALTER TABLE activities ADD COLUMN tracked_hours FLOAT NOT NULL DEFAULT 0')
+    c.execute('ALTER TABLE activities ADD COLUMN wall_clock_hours FLOAT')
+    c.execute('''CREATE TABLE IF NOT EXISTS time_daily_totals
+                 (user_id INTEGER NOT NULL,
+                  day TEXT NOT NULL,
+                  hours FLOAT NOT NULL DEFAULT 0,
+                  entries INTEGER NOT NULL DEFAULT 0,
+                  PRIMARY KEY (user_id, day)) WITHOUT ROWID''')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_time_daily_totals_day ON time_daily_totals (day)')
+    
+    # Lançamentos apagados junto com a atividade (arquivamento, que apaga a
+    # atividade antes das filhas) continuam nos totais
+    triggers = {
+        'insert': ('AFTER INSERT ON time_tracking', time_total_changes('NEW', '+')),
+        'update': ('AFTER UPDATE OF activity_id, user_id, hours_spent, tracked_at ON time_tracking',
+                   time_total_changes('OLD', '-') + time_total_changes('NEW', '+')),
+        'delete': ('AFTER DELETE ON time_tracking '
+                   'WHEN EXISTS (SELECT 1 FROM activities WHERE id = OLD.activity_id)',
+                   time_total_changes('OLD', '-')),
+    }
+    for name, (event, body) in triggers.items():
+        c.execute(f'''CREATE TRIGGER IF NOT EXISTS trg_time_totals_{name} {event}
+                      BEGIN
+                          {body}
+                      END''')
+    
+    # Carga inicial com SQL próprio (não timesheet.rebuild_time_totals nem
+    # archive.ensure_archive_schema), para a migração não mudar junto com eles.
+    # O arquivo, se já criado, recebe as colunas novas aqui mesmo.
+    sources = ['main']
+    if archive_ready(c):
+        sources.append('archive')
+        existing = {row[1] for row in c.execute('PRAGMA archive.table_info(activities)')}
+        for column, kind in (('tracked_hours', 'FLOAT NOT NULL DEFAULT 0'),
+                             ('wall_clock_hours', 'FLOAT')):
+            if column not in existing:
+                c.execute(f'ALTER TABLE archive.activities ADD COLUMN {column} {kind}')
+    
+    for schema in sources:
+        c.execute(f'''UPDATE {schema}.activities
+                      SET wall_clock_hours = ROUND((JULIANDAY(end_time) - JULIANDAY(start_time)) * 24, 2)
+                      WHERE status = 'concluida' AND end_time IS NOT NULL''')
+        c.execute(f'''UPDATE {schema}.activities
+                      SET tracked_hours = (SELECT SUM(t.hours_spent) FROM {schema}.time_tracking t
+                                           WHERE t.activity_id = {schema}.activities.id)
+                      WHERE id IN (SELECT activity_id FROM {schema}.time_tracking
+                                   WHERE hours_spent IS NOT NULL)''')
+    
+    entries = ' UNION ALL '.join(f'SELECT user_id, tracked_at, hours_spent FROM {schema}.time_tracking'
+                                 for schema in sources)
+    c.execute(f'''INSERT INTO time_daily_totals (user_id, day, hours, entries)
+                  SELECT COALESCE(user_id, 0), DATE(tracked_at), SUM(COALESCE(hours_spent, 0)), COUNT(*)
+                  FROM ({entries})
+                  WHERE tracked_at IS NOT NULL
+                  GROUP BY 1, 2''')
+
+def migration_013_local_timestamp_defaults(c):
+    # DEFAULT CURRENT_TIMESTAMP grava em UTC, e os timestamps do banco são hora
+    # local no formato canônico. Trocar o DEFAULT não muda o formato das linhas
+    # em disco, então o CREATE TABLE é reescrito no lugar (procedimento da
+    # documentação do SQLite para esse caso), sem recriar tabelas e triggers.
+    tables = c.execute("""SELECT name, sql FROM main.sqlite_master
+                          WHERE type = 'table' AND sql LIKE '%DEFAULT CURRENT_TIMESTAMP%'""").fetchall()
+    if not tables:
+        return
+    schema_version = c.execute('PRAGMA main.schema_version').fetchone()[0]
+    c.execute('PRAGMA writable_schema = ON')
+    try:
+        for name, sql in tables:
+            c.execute("UPDATE main.sqlite_master SET sql = ? WHERE type = 'table' AND name = ?",
+                      (sql.replace('DEFAULT CURRENT_TIMESTAMP', "DEFAULT (datetime('now', 'localtime'))"),
+                       name))
+        c.execute(f'PRAGMA main.schema_version = {schema_version + 1}')
+    finally:
+        c.execute('PRAGMA writable_schema = OFF')
+
+MIGRATIONS = [
+    (1, 'Tabelas principais', migration_001_core_tables),
+    (2, 'Tabelas auxiliares (tags, dependências, comentários, tempo, lembretes)', migration_002_auxiliary_tables),
+    (3, 'Índices secundários', migration_003_indexes),
+    (4, 'Timestamps em formato canônico', migration_004_canonical_timestamps),
+    (5, 'Rollup diário de atividades', migration_005_activity_daily_stats),
+    (6, 'Índices para paginação de usuários', migration_006_pagination_indexes),
+    (7, 'Último acesso da sessão (last_seen)', migration_007_users_last_seen),
+    (8, 'Índice de atividades por última atualização', migration_008_activities_last_updated_index),
+    (9, 'Feed de alterações (changes) preenchido por triggers', migration_009_change_feed),
+    (10, 'Pontos de retomada das importações em lote', migration_010_import_checkpoints),
+    (11, 'Índices de busca textual (FTS5) de atividades e usuários', migration_011_search_index),
+    (12, 'Tempo registrado e duração de relógio separados, totais por usuário e dia', migration_012_time_totals),
+    (13, 'Timestamps padrão em hora local', migration_013_local_timestamp_defaults),
+]
+
+def get_schema_version(conn):
+    row = conn.execute('SELECT MAX(version) FROM schema_version').fetchone()
+    return row[0] or 0
+
+def run_migrations():
+    """Aplica as migrações pendentes, cada uma em sua própria transação"""
+    with db_write() as conn:
+        conn.execute('''CREATE TABLE IF NOT EXISTS schema_version
+                        (version INTEGER PRIMARY KEY,
+                         description TEXT,
+                         applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
+        current = get_schema_version(conn)
+    
+    applied = []
+    for version, description, migration in MIGRATIONS:
+        if version <= current:
+            continue
+        with db_write() as conn:
+            migration(conn.cursor())
+            conn.execute('INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)',
+                         (version, description, datetime.now()))
+        applied.append(version)
+    
+    if applied:
+        # Atualiza as estatísticas do planejador para os novos índices
+        with db_write() as conn:
+            conn.execute('PRAGMA optimize')
+        get_query_cache().clear()
+        print(f"Migrações aplicadas: {applied}")
+    return applied
+
+# Configuração inicial do banco de dados e criação do usuário admin
+@st.cache_resource
+def init_db():
+    """Executa as migrações e cria os dados padrão (uma vez por processo)"""
+    run_migrations()
+    if not check_database():
+        raise RuntimeError("Banco de dados inconsistente após as migrações")
+    move_legacy_system_logs()
+    apply_log_retention()
+    ensure_archive_schema()
+    compact_changes()
+    
+    with db_write('users', 'departments') as conn:
+        c = conn.cursor()
+        
+        # Criar usuário admin se não existir
+        create_admin_user(c)
+        
+        # Criar departamentos padrão
+        create_default_departments(c)
+    return True
+
+def check_database():
+    """Verifica se o banco de dados existe e está consistente"""
+    try:
+        with db_read() as conn:
+            c = conn.cursor()
+            
+            # Verifica se as tabelas existem
+            c.execute("SELECT name FROM sqlite_master WHERE type='table'")
+            tables = [row[0] for row in c.fetchall()]
+        
+        required_tables = ['users', 'activities', 'departments', 'system_logs',
+                           'activity_tags', 'activity_dependencies', 'activity_comments',
+                           'time_tracking', 'activity_reminders']
+        missing_tables = [table for table in required_tables if table not in tables]
+        
+        if missing_tables:
+            print(f"Tabelas faltando: {missing_tables}")
+            return False
+            
+        return True
+        
+    except sqlite3.Error as e:
+        print(f"Erro ao verificar banco de dados: {e}")
+        return False
+def create_admin_user(cursor):
+    # Verifica se o usuário admin já existe
+    cursor.execute('SELECT id FROM users WHERE username = ?', ('admin',))
+    if cursor.fetchone() is None:
+        # Criar usuário admin com senha admin
+        hashed_password = sha256('admin'.encode()).hexdigest()
+        cursor.execute('''
+            INSERT INTO users (username, password, role, full_name, email, department, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', ('admin', hashed_password, 'admin', 'Administrador', 'admin@empresa.com', 'TI', datetime.now()))
+
+def create_default_departments(cursor):
+    departments = [
+        ('TI', 'Tecnologia da Informação'),
+        ('RH', 'Recursos Humanos'),
+        ('Financeiro', 'Departamento Financeiro'),
+        ('Comercial', 'Departamento Comercial'),
+        ('Operações', 'Departamento de Operações')
+    ]
+    
+    for dept_name, dept_desc in departments:
+        cursor.execute('INSERT OR IGNORE INTO departments (name, description, created_at) VALUES (?, ?, ?)',
+                      (dept_name, dept_desc, datetime.now()))
+def reset_database():
+    """Remove o banco de dados existente para uma nova inicialização"""
+    try:
+        # Fecha as conexões compartilhadas antes de remover os arquivos
+        get_log_writer().flush()
+        get_db().close()
+        get_log_db().close()
+        get_query_cache().clear()
+        remove_log_files()
+        init_log_db(get_log_db())
+        for suffix in ('-wal', '-shm', ''):
+            if os.path.exists(ARCHIVE_DB_PATH + suffix):
+                os.remove(ARCHIVE_DB_PATH + suffix)
+        if os.path.exists(DB_PATH):
+            for suffix in ('-wal', '-shm'):
+                if os.path.exists(DB_PATH + suffix):
+                    os.remove(DB_PATH + suffix)
+            os.remove(DB_PATH)
+            print("Banco de dados resetado com sucesso!")
+            return True
+    except Exception as e:
+        print(f"Erro ao resetar banco de dados: {e}")
+        return False
@@ -0,0 +1,124 @@
+"""Busca textual (FTS5) em atividades e usuários.
+
+Os índices activities_fts e users_fts são mantidos por triggers (migração 11).
+O texto digitado vira uma expressão MATCH com todos os termos como prefixo
+(`fts_match`), e os filtros de departamento, status e período são combinados
+com ela na mesma consulta. Os resultados saem ordenados por relevância (bm25)
+com um trecho do texto encontrado, termos marcados em negrito (markdown).
+"""
+
+from .db import (
+    ActivitySearchRow, UserSearchRow, cached_query, db_read, fts_match, iter_rows, period_range
+)
+from .queries import ACTIVITY_STATUS_FILTERS, USER_STATUS_FILTERS
+
+SEARCH_LIMIT = 50
+# O bm25 é calculado só para as SEARCH_RANK_CANDIDATES correspondências mais
+# recentes: termos que aparecem em boa parte do histórico continuam rápidos,
+# e buscas específicas (o caso comum) são ordenadas por inteiro.
+SEARCH_RANK_CANDIDATES = 10000
+# Pesos do bm25 por coluna, na ordem dos índices
+ACTIVITY_SEARCH_WEIGHTS = (10.0, 3.0, 1.0, 5.0)  # activity, description, comments, tags
+USER_SEARCH_WEIGHTS = (5.0, 10.0, 2.0)            # username, full_name, email
+SNIPPET_TOKENS = 16
+
+def rank_activities(conn, schema, match, where, params, limit):
+    """Busca em `schema` (main ou archive): [(score, linha)] dos `limit` mais relevantes"""
+    # Com o schema na frente o FTS5 não aceita alias: a tabela vai pelo nome
+    # 1) Ranking: só os `limit` ids mais relevantes entre os candidatos
+    ranking = f'''
+        SELECT id, score FROM (
+            SELECT activities_fts.rowid AS id,
+                   bm25(activities_fts, {', '.join(map(str, ACTIVITY_SEARCH_WEIGHTS))}) AS score
+            FROM {schema}.activities_fts
+            JOIN {schema}.activities a ON a.id = activities_fts.rowid
+            LEFT JOIN main.users u ON u.id = a.user_id
+            WHERE activities_fts MATCH ?{where}
+            ORDER BY activities_fts.rowid DESC
+            LIMIT ?)
+        ORDER BY score
+        LIMIT ?
+    '''
+    scores = dict(conn.execute(ranking, [match] + params + [SEARCH_RANK_CANDIDATES, limit]).fetchall())
+    if not scores:
+        return []
+    # 2) Dados e trechos só dessas linhas, numa única passada pelo índice
+    # (o + impede que o IN vire uma busca do MATCH por id)
+    details = f'''
+        SELECT a.id, a.activity, a.status, a.priority, a.category, a.start_time, a.end_time,
+               u.full_name, u.department,
+               snippet(activities_fts, -1, '**', '**', '…', {SNIPPET_TOKENS}) AS snippet,
+               {int(schema == 'archive')} AS archived
+        FROM {schema}.activities_fts
+        JOIN {schema}.activities a ON a.id = activities_fts.rowid
+        LEFT JOIN main.users u ON u.id = a.user_id
+        WHERE activities_fts MATCH ?
+          AND activities_fts.rowid >= ? AND activities_fts.rowid <= ?
+          AND +activities_fts.rowid IN ({', '.join('?' * len(scores))})
+    '''
+    return [(scores[row['id']], row)
+            for row in iter_rows(conn, ActivitySearchRow, details,
+                                 [match, min(scores), max(scores)] + list(scores))]
+
+@cached_query('activities', 'activity_tags', 'activity_comments', 'users')
+def search_activities(text, dept_filter="Todos", status_filter="Todos",
+                      start_date=None, end_date=None, limit=SEARCH_LIMIT, include_archive=False):
+    """Atividades que contêm todos os termos de `text`, mais relevantes primeiro.
+    start_date/end_date (inclusivos) filtram pelo início da atividade; com
+    include_archive a busca inclui as atividades arquivadas."""
+    match = fts_match(text)
+    if match is None:
+        return []
+    where = ''
+    params = []
+    
+    if dept_filter != "Todos":
+        where += " AND u.department = ?"
+        params.append(dept_filter)
+    
+    if status_filter != "Todos":
+        where += " AND a.status = ?"
+        params.append(ACTIVITY_STATUS_FILTERS[status_filter])
+    
+    if start_date is not None:
+        where += " AND a.start_time >= ?"
+        params.append(period_range(start_date, start_date)[0])
+    
+    if end_date is not None:
+        where += " AND a.start_time < ?"
+        params.append(period_range(end_date, end_date)[1])
+    
+    with db_read() as conn:
+        results = rank_activities(conn, 'main', match, where, params, limit)
+        if include_archive:
+            results += rank_activities(conn, 'archive', match, where, params, limit)
+    results.sort(key=lambda result: result[0])
+    return [row for _, row in results[:limit]]
+
+@cached_query('users')
+def search_users(text, dept_filter="Todos", status_filter="Todos", limit=SEARCH_LIMIT):
+    """Usuários cujo username, nome ou email contém todos os termos de `text`"""
+    match = fts_match(text)
+    if match is None:
+        return []
+    query = f'''
+        SELECT u.id, u.username, u.full_name, u.email, u.department, u.role, u.status,
+               snippet(users_fts, -1, '**', '**', '…', {SNIPPET_TOKENS}) AS snippet
+        FROM users_fts
+        JOIN users u ON u.id = users_fts.rowid
+        WHERE users_fts MATCH ?
+    '''
+    params = [match]
+
+    if dept_filter != "Todos":
+        query += " AND u.department = ?"
+        params.append(dept_filter)
+
+    if status_filter != "Todos":
+        query += " AND u.status = ?"
+        params.append(USER_STATUS_FILTERS[status_filter])
+
+    query += f" ORDER BY bm25(users_fts, {', '.join(map(str, USER_SEARCH_WEIGHTS))}) LIMIT ?"
+    params.append(limit)
+    with db_read() as conn:
+        return list(iter_rows(conn, UserSearchRow, query, params))
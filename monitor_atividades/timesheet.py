@@ -0,0 +1,106 @@
+"""Registro de tempo (time_tracking): lançamentos em lote e totais incrementais."""
+
+from collections import namedtuple
+from datetime import date, datetime
+
+from .db import ID_LIST, archive_ready, cached_query, db_read, db_write, id_list, period_range
+from .rollup import rollup_add, rollup_remove
+
+# Os totais são mantidos pelos triggers da migração 12 a cada lançamento, sem
+# SUM sobre time_tracking: activities.tracked_hours soma as horas registradas
+# na atividade e time_daily_totals as de cada (usuário, dia). Entradas que
+# saem da camada quente junto com a atividade (arquivamento) continuam nos
+# totais diários.
+#
+# A duração de relógio (início → conclusão) fica em wall_clock_hours, gravada
+# por complete_activity. actual_hours, usado pelo rollup e pelos relatórios, é
+# o tempo registrado quando houver e a duração de relógio caso contrário.
+ACTUAL_HOURS = 'CASE WHEN tracked_hours > 0 THEN ROUND(tracked_hours, 2) ELSE wall_clock_hours END'
+
+TimeEntry = namedtuple('TimeEntry', 'activity_id user_id hours_spent description tracked_at',
+                       defaults=(None, None))
+
+def track_time_entries(entries):
+    """Grava os lançamentos (TimeEntry ou tuplas na mesma ordem; tracked_at
+    padrão: agora) em uma transação e devolve quantos. Levanta ValueError, sem
+    gravar nenhum, se algum tiver horas <= 0 ou for de atividade inexistente ou
+    arquivada."""
+    now = datetime.now()
+    rows = []
+    for entry in map(lambda values: TimeEntry(*values), entries):
+        try:
+            activity_id = int(entry.activity_id)
+        except (TypeError, ValueError):
+            raise ValueError(f"atividade inválida: {entry.activity_id!r}") from None
+        try:
+            hours = float(entry.hours_spent)
+        except (TypeError, ValueError):
+            raise ValueError(f"horas inválidas: {entry.hours_spent!r}") from None
+        if not hours > 0:
+            raise ValueError(f"horas inválidas: {entry.hours_spent!r}")
+        rows.append((activity_id, entry.user_id, hours, entry.description,
+                     entry.tracked_at or now))
+    if not rows:
+        return 0
+    activity_ids = sorted({row[0] for row in rows})
+    params = {'ids': id_list(activity_ids)}
+
+    with db_write('time_tracking', 'time_daily_totals', 'activities', 'activity_daily_stats') as conn:
+        c = conn.cursor()
+        found = {row[0] for row in c.execute(f'SELECT id FROM activities WHERE id IN ({ID_LIST})',
+                                             params)}
+        missing = [activity_id for activity_id in activity_ids if activity_id not in found]
+        if missing:
+            raise ValueError(f"atividade inexistente ou arquivada: {', '.join(map(str, missing))}")
+
+        for activity_id in activity_ids:
+            rollup_remove(c, activity_id)
+        c.executemany('''INSERT INTO time_tracking
+                         (activity_id, user_id, hours_spent, description, tracked_at)
+                         VALUES (?, ?, ?, ?, ?)''', rows)
+        c.execute(f'UPDATE activities SET actual_hours = {ACTUAL_HOURS} WHERE id IN ({ID_LIST})',
+                  params)
+        for activity_id in activity_ids:
+            rollup_add(c, activity_id)
+    return len(rows)
+
+@cached_query('time_daily_totals')
+def get_time_totals(start_date, end_date, user_id=None):
+    """[(dia, user_id, horas, lançamentos)] de start_date a end_date (inclusive),
+    lidos de time_daily_totals: pela chave (user_id, day) quando há usuário,
+    pelo índice de day para a equipe"""
+    start_day, end_day = (value[:10] for value in period_range(start_date, end_date))
+    query = '''SELECT day, user_id, ROUND(hours, 2), entries FROM time_daily_totals
+               WHERE day >= ? AND day < ?'''
+    params = [start_day, end_day]
+    if user_id is not None:
+        query += ' AND user_id = ?'
+        params.append(user_id)
+    query += ' ORDER BY day, user_id'
+    with db_read() as conn:
+        return [(date.fromisoformat(day), row_user, hours, count)
+                for day, row_user, hours, count in conn.execute(query, params)]
+
+def rebuild_time_totals(c=None):
+    """Recalcula tracked_hours e time_daily_totals a partir de time_tracking
+    (backfill/correção), incluindo os lançamentos arquivados"""
+    if c is None:
+        with db_write('activities', 'time_daily_totals') as conn:
+            return rebuild_time_totals(conn.cursor())
+
+    sources = ['main'] + (['archive'] if archive_ready(c) else [])
+    for schema in sources:
+        tracked = f'''COALESCE((SELECT SUM(t.hours_spent) FROM {schema}.time_tracking t
+                                WHERE t.activity_id = {schema}.activities.id), 0)'''
+        c.execute(f'UPDATE {schema}.activities SET tracked_hours = {tracked} '
+                  f'WHERE tracked_hours IS NOT {tracked}')
+
+    entries = ' UNION ALL '.join(f'SELECT user_id, tracked_at, hours_spent FROM {schema}.time_tracking'
+                                 for schema in sources)
+    c.execute('DELETE FROM time_daily_totals')
+    c.execute(f'''INSERT INTO time_daily_totals (user_id, day, hours, entries)
+                  SELECT COALESCE(user_id, 0), DATE(tracked_at), SUM(COALESCE(hours_spent, 0)), COUNT(*)
+                  FROM ({entries})
+                  WHERE tracked_at IS NOT NULL
+                  GROUP BY 1, 2''')
+    return c.rowcount
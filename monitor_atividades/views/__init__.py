@@ -0,0 +1 @@
+"""Telas da aplicação, uma por perfil de acesso."""
@@ -0,0 +1,661 @@
+"""Telas do perfil administrador."""
+
+import streamlit as st
+import pandas as pd
+import os
+import time
+from datetime import date, timedelta
+
+from ..archive import ARCHIVE_AFTER_DAYS, archive_activities, archive_counts, archive_cutoff
+from ..changes import CHANGES_RETENTION_DAYS, compact_changes, get_change_sequence
+from ..db import get_query_cache, to_db_timestamp
+from ..importer import import_upload
+from ..logs import (
+    LOG_RETENTION_MODE, LOG_RETENTION_MONTHS, apply_log_retention, get_log_writer,
+    log_partition_counts, log_system_action
+)
+from ..reports import (
+    EXPORT_FORMATS, REPORT_TITLES, export_file_name, export_report_bytes
+)
+from ..rollup import rebuild_activity_daily_stats
+from ..queries import (
+    DEFAULT_PAGE_SIZE, PAGE_SIZE_OPTIONS, add_department, complete_activity,
+    count_filtered_activities, count_filtered_users, create_activity, create_user,
+    delete_activity, delete_department, get_access_logs, get_all_departments,
+    get_all_users_names, get_departments, get_filtered_activities, get_filtered_users,
+    get_global_snapshot, get_user_id_by_name, toggle_user_status, update_activity,
+    update_department, update_user
+)
+from ..charts import (
+    show_activities_timeline, show_department_performance, show_productivity_metrics,
+    show_report_analysis, show_status_distribution
+)
+from ..profiling import get_profiler, profiled_view
+from ..timesheet import rebuild_time_totals
+from .common import (
+    deferred_downloads, get_page_state, show_metric_card, show_pagination_controls, show_search
+)
+
+@profiled_view
+def show_admin_new_activity():
+    st.subheader("Nova Atividade")
+    
+    with st.form("new_activity_admin_form"):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            responsible = st.selectbox("Responsável*", get_all_users_names())
+            activity = st.text_input("Título da Atividade*")
+            description = st.text_area("Descrição*")
+            priority = st.selectbox("Prioridade", ["Baixa", "Média", "Alta", "Urgente"])
+        
+        with col2:
+            category = st.selectbox("Categoria", ["Desenvolvimento", "Manutenção", "Suporte", "Reunião", "Outro"])
+            estimated_hours = st.number_input("Horas Estimadas", min_value=0.5, value=1.0)
+            start_date = st.date_input("Data de Início")
+        
+        comments = st.text_area("Comentários")
+        
+        if st.form_submit_button("Criar Atividade"):
+            if not activity or not description:
+                st.error("Por favor, preencha todos os campos obrigatórios")
+                return
+                
+            user_id = get_user_id_by_name(responsible)
+            if not user_id:
+                st.error("Usuário responsável não encontrado")
+                return
+                
+            activity_id = create_activity(
+                user_id=user_id,
+                activity=activity,
+                description=description,
+                priority=priority,
+                category=category,
+                estimated_hours=estimated_hours,
+                comments=comments
+            )
+            
+            if activity_id:
+                st.success("Atividade criada com sucesso!")
+                time.sleep(1)
+                st.experimental_rerun()
+
+@profiled_view
+def show_admin_interface():
+    st.title("🎯 Dashboard Administrativo")
+    
+    # Menu lateral para navegação
+    menu = st.sidebar.selectbox(
+        "Menu",
+        ["Dashboard", "Usuários", "Atividades", "Departamentos", "Relatórios", "Busca",
+         "Configurações"]
+    )
+    
+    if menu == "Dashboard":
+        show_admin_dashboard()
+    elif menu == "Usuários":
+        show_admin_users()
+    elif menu == "Atividades":
+        show_admin_activities()
+    elif menu == "Departamentos":
+        show_department_management()
+    elif menu == "Relatórios":
+        show_reports()
+    elif menu == "Busca":
+        show_search()
+    elif menu == "Configurações":
+        show_settings()
+@profiled_view
+def show_admin_users():
+    st.title("👥 Gestão de Usuários")
+    
+    # Tabs para diferentes ações
+    tab1, tab2, tab3 = st.tabs(["Lista de Usuários", "Novo Usuário", "Logs de Acesso"])
+    
+    with tab1:
+        show_users_list()
+    with tab2:
+        show_new_user_form()
+    with tab3:
+        show_access_logs()
+
+@profiled_view
+def show_admin_activities():
+    st.title("📋 Gestão de Atividades")
+    
+    # Tabs para diferentes visualizações
+    tab1, tab2, tab3, tab4 = st.tabs(["Todas as Atividades", "Nova Atividade", "Métricas",
+                                      "Importar"])
+    
+    with tab1:
+        show_all_activities()
+    with tab2:
+        show_admin_new_activity()
+    with tab3:
+        show_activities_metrics()
+    with tab4:
+        show_activity_import()
+
+@profiled_view
+def show_activity_import():
+    st.subheader("Importação em Lote")
+    st.caption("CSV ou JSONL com os campos username (ou user_id) e activity; opcionais: "
+               "description, status, priority, category, start_time, end_time, "
+               "estimated_hours, actual_hours, comments, department e tags. "
+               "Reenviar o mesmo arquivo continua uma importação interrompida.")
+    
+    uploaded = st.file_uploader("Arquivo", type=["csv", "jsonl", "ndjson", "json"])
+    restart = st.checkbox("Importar desde o início (ignorar importação anterior do arquivo)")
+    if uploaded is None or not st.button("Importar atividades"):
+        return
+    
+    bar = st.progress(0.0)
+    status = st.empty()
+    data = uploaded.getvalue()
+    total_lines = max(data.count(b'\n'), 1)
+    
+    def progress(report):
+        bar.progress(min(report.records / total_lines, 1.0))
+        status.write(f"{report.records} registros ({report.rows_per_second:.0f}/s)")
+    
+    report, rejects = import_upload(data, uploaded.name, resume=not restart,
+                                    user_id=st.session_state.user['id'], progress=progress)
+    bar.progress(1.0)
+    if report.already_imported:
+        status.info("Este arquivo já foi importado. Marque \"Importar desde o início\" "
+                    "para importar de novo.")
+        return
+    status.success(str(report))
+    if rejects:
+        base, ext = os.path.splitext(uploaded.name)
+        st.download_button("Baixar registros rejeitados", rejects,
+                           file_name=f"{base}.rejeitados{ext}")
+
+@profiled_view
+def show_all_activities():
+    st.subheader("Todas as Atividades")
+    
+    # Filtros
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        dept_filter = st.selectbox("Departamento", ["Todos"] + get_departments())
+    with col2:
+        status_filter = st.selectbox(
+            "Status", 
+            ["Todos", "Em Andamento", "Concluídas", "Pendentes"]
+        )
+    with col3:
+        user_filter = st.selectbox("Usuário", ["Todos"] + get_all_users_names())
+    col1, col2 = st.columns(2)
+    with col1:
+        page_size = st.selectbox("Itens por página", PAGE_SIZE_OPTIONS,
+                                 index=PAGE_SIZE_OPTIONS.index(DEFAULT_PAGE_SIZE),
+                                 key="all_activities_page_size")
+    with col2:
+        include_archive = st.checkbox("Incluir arquivo", key="all_activities_archive",
+                                      help=f"Atividades concluídas há mais de "
+                                           f"{ARCHIVE_AFTER_DAYS} dias")
+    
+    nav = get_page_state('all_activities_page',
+                         (dept_filter, status_filter, user_filter, page_size, include_archive))
+    page = get_filtered_activities(dept_filter, status_filter, user_filter,
+                                   page_size, nav['cursor'], nav['direction'], include_archive)
+    
+    for activity in page.rows:
+        archived = activity.get('archived')
+        title = f"{activity['activity']} - {activity['status'].title()}"
+        with st.expander(f"📦 {title} (arquivada)" if archived else title):
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.write(f"**Responsável:** {activity['full_name']}")
+                st.write(f"**Descrição:** {activity['description']}")
+                st.write(f"**Prioridade:** {activity['priority']}")
+                st.write(f"**Categoria:** {activity['category']}")
+            
+            with col2:
+                st.write(f"**Início:** {activity['start_time']}")
+                st.write(f"**Horas Estimadas:** {activity['estimated_hours']}")
+                if activity['status'] == 'concluida':
+                    st.write(f"**Horas Reais:** {activity['actual_hours']}")
+                st.write(f"**Última Atualização:** {activity['last_updated']}")
+            
+            if archived:
+                continue
+            # Ações
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                if st.button("✏️ Editar", key=f"edit_act_{activity['id']}"):
+                    show_edit_activity_modal(activity)
+            with col2:
+                if activity['status'] != 'concluida':
+                    if st.button("✅ Concluir", key=f"complete_act_{activity['id']}"):
+                        complete_activity(activity['id'])
+                        st.experimental_rerun()
+            with col3:
+                if st.button("🗑️ Excluir", key=f"del_act_{activity['id']}"):
+                    delete_activity(activity['id'])
+                    st.experimental_rerun()
+    
+    show_pagination_controls('all_activities_page', page,
+                             count_filtered_activities(dept_filter, status_filter, user_filter,
+                                                       include_archive),
+                             page_size)
+
+
+
+@profiled_view
+def show_activities_metrics():
+    st.subheader("📊 Métricas de Atividades")
+    
+    snapshot = get_global_snapshot()
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        show_metric_card("Total de Atividades", snapshot.total, "📊")
+    with col2:
+        show_metric_card("Concluídas Hoje", snapshot.completed_today, "✅")
+    with col3:
+        show_metric_card("Em Andamento", snapshot.ongoing, "🔄")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        show_productivity_metrics()
+    with col2:
+        show_status_distribution()
+
+@profiled_view
+def show_edit_activity_modal(activity):
+    st.subheader(f"✏️ Editar Atividade: {activity['activity']}")
+    
+    with st.form(f"edit_activity_form_{activity['id']}"):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            new_activity = st.text_input("Título", value=activity['activity'])
+            description = st.text_area("Descrição", value=activity['description'])
+            priority = st.selectbox("Prioridade", 
+                                  ["Baixa", "Média", "Alta", "Urgente"],
+                                  index=["Baixa", "Média", "Alta", "Urgente"].index(activity['priority']))
+        
+        with col2:
+            category = st.selectbox("Categoria",
+                                  ["Desenvolvimento", "Manutenção", "Suporte", "Reunião", "Outro"],
+                                  index=["Desenvolvimento", "Manutenção", "Suporte", "Reunião", "Outro"].index(activity['category']))
+            status = st.selectbox("Status",
+                                ["pendente", "em_andamento", "concluida"],
+                                index=["pendente", "em_andamento", "concluida"].index(activity['status']))
+            estimated_hours = st.number_input("Horas Estimadas", 
+                                           min_value=0.5,
+                                           value=float(activity['estimated_hours']))
+        
+        comments = st.text_area("Comentários", value=activity['comments'])
+        
+        if st.form_submit_button("Salvar Alterações"):
+            update_activity(activity['id'], new_activity, description, priority,
+                          category, status, estimated_hours, comments)
+            st.success("Atividade atualizada com sucesso!")
+            st.experimental_rerun()
+
+@profiled_view
+def show_user_management():
+    st.subheader("👥 Gerenciamento de Usuários")
+    
+    # Tabs para diferentes ações
+    user_tabs = st.tabs(["Lista de Usuários", "Novo Usuário", "Logs de Acesso"])
+    
+    with user_tabs[0]:
+        show_user_list()
+    
+    with user_tabs[1]:
+        show_new_user_form()
+    
+    with user_tabs[2]:
+        show_access_logs()
+
+@profiled_view
+def show_user_list():
+    # Filtros
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        dept_filter = st.selectbox("Departamento", ["Todos"] + get_departments())
+    with col2:
+        status_filter = st.selectbox("Status", ["Todos", "Ativo", "Inativo"])
+    with col3:
+        search = st.text_input("Buscar usuário")
+    page_size = st.selectbox("Itens por página", PAGE_SIZE_OPTIONS,
+                             index=PAGE_SIZE_OPTIONS.index(DEFAULT_PAGE_SIZE),
+                             key="user_list_page_size")
+    
+    # Lista de usuários
+    nav = get_page_state('user_list_page', (dept_filter, status_filter, search, page_size))
+    page = get_filtered_users(dept_filter, status_filter, search,
+                              page_size, nav['cursor'], nav['direction'])
+    
+    for user in page.rows:
+        with st.expander(f"{user['full_name']} ({user['username']})"):
+            col1, col2, col3 = st.columns(3)
+            
+            with col1:
+                st.write(f"**Email:** {user['email']}")
+                st.write(f"**Departamento:** {user['department']}")
+            
+            with col2:
+                st.write(f"**Função:** {user['role']}")
+                st.write(f"**Status:** {user['status']}")
+            
+            with col3:
+                if st.button("✏️ Editar", key=f"edit_{user['id']}"):
+                    show_edit_user_modal(user)
+                if st.button("🗑️ Desativar" if user['status'] == 'active' else "✅ Ativar", 
+                            key=f"toggle_{user['id']}"):
+                    toggle_user_status(user['id'])
+    
+    show_pagination_controls('user_list_page', page,
+                             count_filtered_users(dept_filter, status_filter, search),
+                             page_size)
+
+@profiled_view
+def show_new_user_form():
+    st.subheader("➕ Cadastrar Novo Usuário")
+    
+    with st.form("new_user_form"):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            username = st.text_input("Nome de usuário*")
+            password = st.text_input("Senha*", type="password")
+            full_name = st.text_input("Nome completo*")
+        
+        with col2:
+            email = st.text_input("Email*")
+            department = st.selectbox("Departamento*", get_departments())
+            role = st.selectbox("Função*", ["comum", "supervisor", "admin"])
+        
+        if st.form_submit_button("Cadastrar Usuário"):
+            if create_user(username, password, role, full_name, email, department):
+                st.success("Usuário cadastrado com sucesso!")
+                log_system_action(st.session_state.user['id'], 
+                                "create_user", 
+                                f"Novo usuário criado: {username}")
+            else:
+                st.error("Erro ao cadastrar usuário. Verifique se o nome de usuário já existe.")
+
+@profiled_view
+def show_department_management():
+    st.subheader("🏢 Gerenciamento de Departamentos")
+    
+    # Novo departamento
+    with st.expander("➕ Adicionar Novo Departamento"):
+        with st.form("new_dept_form"):
+            dept_name = st.text_input("Nome do Departamento")
+            dept_desc = st.text_area("Descrição")
+            if st.form_submit_button("Adicionar"):
+                add_department(dept_name, dept_desc)
+    
+    # Lista de departamentos
+    departments = get_all_departments()
+    for dept in departments:
+        with st.expander(f"📁 {dept['name']}"):
+            st.write(f"**Descrição:** {dept['description']}")
+            st.write(f"**Total de Usuários:** {dept['user_count']}")
+            st.write(f"**Atividades em Andamento:** {dept['active_tasks']}")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("✏️ Editar", key=f"edit_dept_{dept['id']}"):
+                    show_edit_department_modal(dept)
+            with col2:
+                if st.button("🗑️ Excluir", key=f"del_dept_{dept['id']}"):
+                    delete_department(dept['id'])
+@profiled_view
+def show_users_list():
+    st.subheader("Lista de Usuários")
+    page_size = st.selectbox("Itens por página", PAGE_SIZE_OPTIONS,
+                             index=PAGE_SIZE_OPTIONS.index(DEFAULT_PAGE_SIZE),
+                             key="users_list_page_size")
+
+    # Get users and display in a data frame
+    nav = get_page_state('users_list_page', (page_size,))
+    page = get_filtered_users("Todos", "Todos", "", page_size, nav['cursor'], nav['direction'])
+    if page.rows:
+        st.table([user.as_dict() for user in page.rows])
+        show_pagination_controls('users_list_page', page,
+                                 count_filtered_users("Todos", "Todos", ""), page_size)
+    else:
+        st.write("No users found.")
+
+@profiled_view
+def show_admin_dashboard():
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        show_activities_timeline()
+        st.markdown('</div>', unsafe_allow_html=True)
+        
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        show_department_performance()
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        show_productivity_metrics()
+        st.markdown('</div>', unsafe_allow_html=True)
+        
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        show_status_distribution()
+        st.markdown('</div>', unsafe_allow_html=True)
+
+@profiled_view
+def show_reports():
+    st.subheader("📊 Relatórios")
+    report_type = st.selectbox("Tipo de Relatório", list(REPORT_TITLES))
+    name = REPORT_TITLES[report_type]
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        start_date = st.date_input("Data inicial", date.today() - timedelta(days=30),
+                                   key="report_start")
+    with col2:
+        end_date = st.date_input("Data final", date.today(), key="report_end")
+    with col3:
+        fmt = st.radio("Formato", EXPORT_FORMATS, format_func=str.upper, horizontal=True,
+                       key="report_format")
+    if start_date > end_date:
+        st.error("A data inicial deve ser anterior à final")
+        return
+    include_archive = st.checkbox("Incluir arquivo", key="report_archive",
+                                  help=f"Atividades concluídas há mais de {ARCHIVE_AFTER_DAYS} "
+                                       "dias ficam no arquivo")
+    if not include_archive and to_db_timestamp(start_date) < archive_cutoff():
+        st.caption("O período começa antes do corte do arquivo: marque \"Incluir arquivo\" "
+                   "para contar também as atividades arquivadas.")
+    
+    if not show_report_analysis(name, start_date, end_date, include_archive):
+        st.info("Nenhum dado no período selecionado")
+        return
+    
+    # O arquivo é gerado em blocos, direto do cursor para um temporário, só
+    # quando pedido, e removido logo depois de lido: com downloads adiados, no
+    # clique em "Baixar"; sem eles, em "Gerar arquivo", e o botão de download
+    # vale só para esse rerun. Nada fica no disco nem na sessão entre reruns.
+    def generate():
+        return export_report_bytes(name, start_date, end_date, fmt, include_archive)
+    
+    label = f"Baixar {fmt.upper()}"
+    file_name = export_file_name(name, start_date, end_date, fmt)
+    if deferred_downloads():
+        st.download_button(label, generate, file_name=file_name)
+    elif st.button("Gerar arquivo"):
+        with st.spinner("Gerando relatório..."):
+            data = generate()
+        st.download_button(label, data, file_name=file_name)
+
+@profiled_view
+def show_settings():
+    st.subheader("⚙️ Configurações do Sistema")
+    
+    with st.expander("🔒 Segurança"):
+        st.checkbox("Ativar autenticação em dois fatores")
+        st.number_input("Tempo de expiração da sessão (minutos)", min_value=5)
+    
+    with st.expander("📧 Notificações"):
+        st.checkbox("Enviar e-mail para atividades atrasadas")
+        st.checkbox("Notificar supervisor sobre novas atividades")
+    
+    with st.expander("🎨 Personalização"):
+        st.color_picker("Cor principal", "#4CAF50")
+        st.selectbox("Tema", ["Claro", "Escuro", "Sistema"])
+    
+    with st.expander("⚡ Cache de consultas"):
+        cache_stats = get_query_cache().stats()
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Taxa de acerto", f"{cache_stats['hit_rate']:.1f}%")
+        col2.metric("Entradas", cache_stats['entries'])
+        col3.metric("Memória", f"{cache_stats['bytes'] / 1024 / 1024:.1f} / "
+                               f"{cache_stats['max_bytes'] / 1024 / 1024:.0f} MB")
+        st.write(f"**Acertos:** {cache_stats['hits']} | **Falhas:** {cache_stats['misses']} | "
+                 f"**Invalidações:** {cache_stats['invalidations']} | "
+                 f"**Remoções (LRU):** {cache_stats['evictions']}")
+        st.write("**Versões por tabela:**", cache_stats['versions'])
+        if st.button("Limpar cache"):
+            get_query_cache().clear()
+    
+    with st.expander("🛠️ Manutenção"):
+        if st.button("Recalcular estatísticas diárias"):
+            rows = rebuild_activity_daily_stats()
+            time_rows = rebuild_time_totals()
+            st.success(f"Estatísticas recalculadas ({rows} linhas; {time_rows} totais de horas por dia)")
+
+        if st.button("Compactar feed de alterações"):
+            st.success(f"{compact_changes()} alterações com mais de "
+                       f"{CHANGES_RETENTION_DAYS} dias removidas")
+        st.caption(f"Feed de alterações: seq atual {get_change_sequence()}")
+        
+        if st.button(f"Arquivar concluídas há mais de {ARCHIVE_AFTER_DAYS} dias"):
+            with st.spinner("Arquivando..."):
+                moved = archive_activities()
+            st.success(f"{moved} atividades movidas para o arquivo")
+        hot, cold = archive_counts()
+        st.caption(f"Atividades: {hot} na camada quente, {cold} no arquivo")
+        
+        if LOG_RETENTION_MONTHS and st.button(f"Aplicar retenção dos logs "
+                                              f"({LOG_RETENTION_MONTHS} meses)"):
+            months = apply_log_retention()
+            st.success(f"Partições {'compactadas' if LOG_RETENTION_MODE == 'compress' else 'removidas'}: "
+                       f"{', '.join(months) or 'nenhuma'}")
+        log_writer = get_log_writer()
+        partitions = log_partition_counts()
+        st.caption(f"Logs do sistema: {log_writer.written} gravados, "
+                   f"{log_writer.pending()} na fila, {log_writer.dropped} descartados; "
+                   f"{len(partitions)} partições mensais, "
+                   f"{sum(rows for _, state, rows in partitions if state == 'active')} registros")
+    
+    with st.expander("⏱️ Performance"):
+        show_performance_panel()
+
+def set_profiling(enabled_key):
+    get_profiler().enabled = st.session_state[enabled_key]
+
+@profiled_view
+def show_performance_panel():
+    profiler = get_profiler()
+    st.checkbox("Rastrear consultas e tempos de tela", value=profiler.enabled,
+                key="profiling_enabled", on_change=set_profiling, args=("profiling_enabled",))
+    st.caption(f"Janela: últimos {profiler.reruns.maxlen} reruns de todas as sessões. "
+               "Desligado, o rastreamento não registra nada.")
+    
+    summary = profiler.summary()
+    reruns = summary['reruns']
+    if not reruns:
+        st.info("Nenhuma medição na janela. Ative o rastreamento e navegue pelas telas.")
+        return
+    
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Reruns", len(reruns))
+    col2.metric("Tempo médio", f"{sum(r['total_ms'] for r in reruns) / len(reruns):.0f} ms")
+    col3.metric("SQL médio", f"{sum(r['sql_ms'] for r in reruns) / len(reruns):.0f} ms")
+    col4.metric("Plotly médio", f"{sum(r['plotly_ms'] for r in reruns) / len(reruns):.0f} ms")
+    
+    st.write("**Consultas mais lentas** (tempo total na janela)")
+    queries = pd.DataFrame(summary['queries'][:20])
+    queries['avg_ms'] = queries['total_ms'] / queries['calls']
+    st.dataframe(queries[['sql', 'calls', 'total_ms', 'avg_ms', 'max_ms', 'rows',
+                          'vm_steps', 'fingerprints', 'views']].round(2))
+    
+    st.write("**Telas mais lentas** (tempo inclusivo, com as telas internas)")
+    views = pd.DataFrame(summary['views'][:20])
+    views['avg_ms'] = views['total_ms'] / views['calls']
+    st.dataframe(views[['view', 'calls', 'total_ms', 'avg_ms', 'max_ms']].round(2))
+    
+    st.write("**Últimos reruns**")
+    history = pd.DataFrame(reruns[:50])
+    st.dataframe(history[['started_at', 'label', 'total_ms', 'sql_ms', 'queries',
+                          'plotly_ms']].round(2))
+    
+    if st.button("Limpar medições"):
+        profiler.clear()
+# Funções de Modal
+@profiled_view
+def show_edit_user_modal(user):
+    st.subheader(f"✏️ Editar Usuário: {user['username']}")
+    
+    with st.form(f"edit_user_form_{user['id']}"):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            full_name = st.text_input("Nome completo", value=user['full_name'])
+            email = st.text_input("Email", value=user['email'])
+        
+        with col2:
+            departments = get_departments()
+            department = st.selectbox("Departamento", departments, 
+                                    index=departments.index(user['department']))
+            role = st.selectbox("Função", ["comum", "supervisor", "admin"],
+                              index=["comum", "supervisor", "admin"].index(user['role']))
+        
+        new_password = st.text_input("Nova senha (deixe em branco para manter a atual)", type="password")
+        
+        if st.form_submit_button("Salvar Alterações"):
+            update_user(user['id'], full_name, email, department, role, new_password)
+            st.success("Usuário atualizado com sucesso!")
+            st.experimental_rerun()
+
+@profiled_view
+def show_edit_department_modal(dept):
+    st.subheader(f"✏️ Editar Departamento: {dept['name']}")
+    
+    with st.form(f"edit_dept_form_{dept['id']}"):
+        name = st.text_input("Nome do Departamento", value=dept['name'])
+        description = st.text_area("Descrição", value=dept['description'])
+        
+        if st.form_submit_button("Salvar Alterações"):
+            update_department(dept['id'], name, description)
+            st.success("Departamento atualizado com sucesso!")
+            st.experimental_rerun()
+
+@profiled_view
+def show_access_logs():
+    st.subheader("📋 Logs de Acesso")
+    
+    # Filtros
+    col1, col2 = st.columns(2)
+    with col1:
+        start_date = st.date_input("Data Inicial")
+    with col2:
+        end_date = st.date_input("Data Final")
+    
+    # Buscar logs
+    logs = get_access_logs(start_date, end_date)
+    
+    # Exibir logs em uma tabela
+    if logs:
+        st.dataframe(
+            pd.DataFrame(logs, 
+                        columns=['Usuário', 'Ação', 'Data/Hora'])
+        )
+    else:
+        st.info("Nenhum log encontrado para o período selecionado.")
@@ -0,0 +1,223 @@
+"""Telas e componentes compartilhados: página, login, perfil, paginação e busca."""
+
+import streamlit as st
+import math
+
+from ..db import fts_match
+from ..profiling import profiled_view
+from ..queries import ACTIVITY_STATUS_FILTERS, get_departments, login_user
+from ..search import SEARCH_LIMIT, search_activities, search_users
+
+# Configuração do tema e estilo
+def configure_page():
+    st.set_page_config(
+        page_title="Sistema de Monitoramento",
+        page_icon="📊",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    
+    # CSS personalizado
+    st.markdown("""
+        <style>
+        .main {
+            padding: 2rem;
+        }
+        .stButton button {
+            width: 100%;
+            border-radius: 5px;
+            height: 3em;
+            background-color: #4CAF50;
+            color: white;
+        }
+        .stTextInput > div > div > input {
+            border-radius: 5px;
+        }
+        .status-card {
+            padding: 1rem;
+            border-radius: 10px;
+            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+            margin-bottom: 1rem;
+        }
+        .metric-card {
+            background-color: white;
+            padding: 1.5rem;
+            border-radius: 10px;
+            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+            text-align: center;
+        }
+        .chart-container {
+            background-color: white;
+            padding: 1rem;
+            border-radius: 10px;
+            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+            margin-bottom: 1rem;
+        }
+        .sidebar .sidebar-content {
+            background-color: #f8f9fa;
+        }
+        .stTab {
+            background-color: #ffffff;
+            padding: 1rem;
+            border-radius: 5px;
+            margin-bottom: 1rem;
+        }
+        </style>
+    """, unsafe_allow_html=True)
+@profiled_view
+def show_login_page():
+    st.markdown("""
+        <style>
+        .login-container {
+            max-width: 400px;
+            margin: auto;
+            padding: 2rem;
+            background-color: white;
+            border-radius: 10px;
+            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+        }
+        </style>
+    """, unsafe_allow_html=True)
+    
+    st.markdown('<div class="login-container">', unsafe_allow_html=True)
+    st.title("🔐 Login")
+    
+    with st.form("login_form"):
+        username = st.text_input("Usuário")
+        password = st.text_input("Senha", type="password")
+        submitted = st.form_submit_button("Entrar")
+        
+        if submitted:
+            user = login_user(username, password)
+            if user:
+                st.session_state.user = user
+                st.experimental_rerun()
+            else:
+                st.error("Usuário ou senha inválidos")
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+def live_fragment(run_every):
+    """st.fragment que se reexecuta sozinho a cada `run_every` segundos.
+
+    Em versões do Streamlit sem fragmentos a função roda junto com a página.
+    """
+    fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None)
+    if fragment is None:
+        return lambda func: func
+    return fragment(run_every=run_every)
+
+def deferred_downloads():
+    """Se st.download_button aceita uma função, chamada só no clique"""
+    try:
+        from streamlit.runtime.media_file_manager import MediaFileManager
+    except ImportError:
+        return False
+    return hasattr(MediaFileManager, 'add_deferred')
+
+# Funções de interface do usuário
+def get_page_state(state_key, filters):
+    """Estado de navegação de uma lista paginada; reinicia quando os filtros mudam"""
+    state = st.session_state.get(state_key)
+    if state is None or state['filters'] != filters:
+        state = {'filters': filters, 'cursor': None, 'direction': 'next', 'page_number': 1}
+        st.session_state[state_key] = state
+    return state
+
+def go_to_page(state_key, cursor, direction, step):
+    state = st.session_state[state_key]
+    state['cursor'] = cursor
+    state['direction'] = direction
+    state['page_number'] = max(1, state['page_number'] + step)
+
+@profiled_view
+def show_pagination_controls(state_key, page, total, page_size):
+    state = st.session_state[state_key]
+    total_pages = max(1, math.ceil(total / page_size))
+    
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        st.button("⬅️ Anterior", key=f"{state_key}_prev",
+                  disabled=page.prev_cursor is None,
+                  on_click=go_to_page, args=(state_key, page.prev_cursor, 'prev', -1))
+    with col2:
+        st.caption(f"Página {state['page_number']} de ~{total_pages} (~{total} registros)")
+    with col3:
+        st.button("Próxima ➡️", key=f"{state_key}_next",
+                  disabled=page.next_cursor is None,
+                  on_click=go_to_page, args=(state_key, page.next_cursor, 'next', 1))
+
+@profiled_view
+def show_metric_card(title, value, icon):
+    st.markdown(f"""
+        <div class="metric-card">
+            <h3>{icon} {title}</h3>
+            <h2>{value}</h2>
+        </div>
+    """, unsafe_allow_html=True)
+
+# Funções de Interface
+@profiled_view
+def show_user_profile():
+    st.sidebar.title("Perfil do Usuário")
+    # Perfil carregado no login (st.session_state.user), sem consulta por rerun
+    user_info = st.session_state.user
+    
+    st.sidebar.write(f"**Nome:** {user_info['full_name'] or 'Não informado'}")
+    st.sidebar.write(f"**Email:** {user_info['email'] or 'Não informado'}")
+    st.sidebar.write(f"**Departamento:** {user_info['department'] or 'Não informado'}")
+    st.sidebar.write(f"**Função:** {user_info['role'].title()}")
+    
+    st.sidebar.divider()
+    
+    if st.sidebar.button("🚪 Logout"):
+        st.session_state.user = None
+        st.experimental_rerun()
+
+@profiled_view
+def show_search():
+    """Busca em atividades (título, descrição, comentários, tags) e usuários"""
+    st.subheader("🔎 Busca")
+    text = st.text_input("Buscar", placeholder="ex.: vpn acesso remoto", key="search_text")
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        dept_filter = st.selectbox("Departamento", ["Todos"] + get_departments(),
+                                   key="search_dept")
+    with col2:
+        status_filter = st.selectbox("Status", ["Todos"] + list(ACTIVITY_STATUS_FILTERS),
+                                     key="search_status")
+    with col3:
+        period = st.date_input("Início da atividade entre", value=(), key="search_period")
+    start_date = period[0] if len(period) > 0 else None
+    end_date = period[1] if len(period) > 1 else start_date
+    include_archive = st.checkbox("Incluir arquivo", key="search_archive",
+                                  help="Busca também nas atividades concluídas arquivadas")
+    
+    if not fts_match(text):
+        st.caption("Digite um ou mais termos; todos precisam aparecer (prefixos valem: "
+                   "\"conf\" encontra \"configuração\").")
+        return
+    
+    activities_tab, users_tab = st.tabs(["Atividades", "Usuários"])
+    with activities_tab:
+        results = search_activities(text, dept_filter, status_filter, start_date, end_date,
+                                    include_archive=include_archive)
+        if not results:
+            st.info("Nenhuma atividade encontrada")
+        for activity in results:
+            st.markdown(f"{'📦 ' if activity['archived'] else ''}"
+                        f"**{activity['activity']}** · {activity['status'].title()} · "
+                        f"{activity['full_name'] or '-'} ({activity['department'] or '-'}) · "
+                        f"{activity['start_time']}")
+            st.caption(activity['snippet'])
+        if len(results) == SEARCH_LIMIT:
+            st.caption(f"Mostrando os {SEARCH_LIMIT} resultados mais relevantes; "
+                       "refine a busca ou os filtros para ver outros.")
+    with users_tab:
+        users = search_users(text, dept_filter)
+        if not users:
+            st.info("Nenhum usuário encontrado")
+        for user in users:
+            st.markdown(f"**{user['full_name'] or user['username']}** · {user['username']} · "
+                        f"{user['email'] or '-'} · {user['department'] or '-'}")
+            st.caption(user['snippet'])
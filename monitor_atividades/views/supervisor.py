@@ -0,0 +1,176 @@
+"""Telas do perfil supervisor."""
+
+import streamlit as st
+import pandas as pd
+import time
+from datetime import datetime
+
+from ..queries import (
+    ONLINE_WINDOW_MINUTES, REALTIME_REFRESH_SECONDS, REALTIME_RESYNC_SECONDS,
+    get_global_snapshot, get_online_users, get_realtime_activities, get_realtime_changes
+)
+from ..changes import get_change_sequence
+from ..dependencies import add_dependencies, dependency_graph
+from ..charts import show_team_performance, show_team_workload
+from ..profiling import profiled_view
+from .common import live_fragment, show_metric_card, show_search
+
+def sync_realtime_activities():
+    """Atividades em andamento da sessão (id -> linha), atualizadas por delta"""
+    state = st.session_state.get('realtime_activities')
+    # Lido antes das consultas: o que for gravado depois aparece no próximo ciclo
+    seq = get_change_sequence()
+    if state is None or time.monotonic() - state['synced_at'] > REALTIME_RESYNC_SECONDS:
+        rows = {activity.id: activity for activity in get_realtime_activities()}
+        cursor = max((activity.last_updated for activity in rows.values() if activity.last_updated),
+                     default=None)
+        state = {'rows': rows, 'cursor': cursor or datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                 'synced_at': time.monotonic(), 'seq': seq}
+        st.session_state.realtime_activities = state
+        return state['rows']
+    
+    # Nada mudou no banco desde o último ciclo: nem consulta o delta
+    if seq == state['seq']:
+        return state['rows']
+    state['seq'] = seq
+    for activity in get_realtime_changes(state['cursor']):
+        if activity.status == 'em_andamento':
+            state['rows'][activity.id] = activity
+        else:
+            state['rows'].pop(activity.id, None)
+        if activity.last_updated and activity.last_updated > state['cursor']:
+            state['cursor'] = activity.last_updated
+    return state['rows']
+
+@live_fragment(REALTIME_REFRESH_SECONDS)
+@profiled_view
+def show_realtime_activities():
+    activities = sync_realtime_activities()
+    if not activities:
+        st.info("Nenhuma atividade em andamento")
+        return
+    
+    # Tempo decorrido calculado de uma vez para todas as atividades
+    df = pd.DataFrame([(a.activity, a.full_name, a.priority, a.start_time)
+                       for a in activities.values()],
+                      columns=['activity', 'full_name', 'priority', 'start_time'])
+    df['start_time'] = pd.to_datetime(df['start_time'], format='%Y-%m-%d %H:%M:%S')
+    df['hours_running'] = (pd.Timestamp.now() - df['start_time']).dt.total_seconds() / 3600
+    df = df.sort_values('start_time', ascending=False)
+    
+    # Exibir em cards
+    for activity in df.itertuples(index=False):
+        with st.container():
+            st.markdown(f"""
+                <div class="status-card">
+                    <h3>{activity.activity}</h3>
+                    <p><strong>Responsável:</strong> {activity.full_name}</p>
+                    <p><strong>Tempo Decorrido:</strong> {activity.hours_running:.1f} horas</p>
+                    <p><strong>Prioridade:</strong> {activity.priority}</p>
+                </div>
+            """, unsafe_allow_html=True)
+    st.caption(f"Atualizado às {datetime.now():%H:%M:%S} "
+               f"(a cada {REALTIME_REFRESH_SECONDS}s)")
+
+@profiled_view
+def show_online_users():
+    online = get_online_users()
+    st.subheader(f"🟢 Online agora ({len(online)})")
+    if online:
+        st.table(pd.DataFrame(online, columns=['Usuário', 'Último acesso']))
+    else:
+        st.info(f"Nenhum usuário ativo nos últimos {ONLINE_WINDOW_MINUTES} minutos")
+
+DEPENDENCY_LIST_LIMIT = 50
+
+def dependency_label(graph, activity_id):
+    node = graph.nodes.get(activity_id)
+    if node is None or node.status is None:
+        return f"#{activity_id} (excluída)"
+    return f"#{activity_id} {node.activity}" + (" (arquivada)" if node.archived else "")
+
+def dependency_table(graph, rows, extra_column):
+    """rows: [(id, valor de extra_column)]"""
+    return pd.DataFrame([(dependency_label(graph, activity_id), graph.nodes[activity_id].status,
+                          graph.nodes[activity_id].estimated_hours, extra)
+                         for activity_id, extra in rows[:DEPENDENCY_LIST_LIMIT]],
+                        columns=['Atividade', 'Status', 'Horas estimadas', extra_column])
+
+@profiled_view
+def show_dependencies():
+    st.subheader("🔗 Dependências")
+    graph = dependency_graph()
+    analysis = graph.analysis()
+    hours, path = graph.critical_path()
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        show_metric_card("Bloqueadas", len(analysis.blocked), "⛔")
+    with col2:
+        show_metric_card("Prontas", len(analysis.ready), "🟢")
+    with col3:
+        show_metric_card("Caminho Crítico", f"{hours:.1f}h", "📐")
+    
+    if not graph.edges:
+        st.info("Nenhuma dependência cadastrada")
+    else:
+        if path:
+            st.write("**Caminho crítico** (da primeira à última):")
+            st.dataframe(dependency_table(graph, [(activity_id, position) for position, activity_id
+                                                 in enumerate(path, 1)], 'Ordem'))
+        
+        blocked = sorted(analysis.blocked, key=lambda activity_id: -analysis.hours.get(activity_id, 0))
+        if blocked:
+            target = st.selectbox("O que bloqueia...", blocked, key="dependency_target",
+                                  format_func=lambda activity_id: dependency_label(graph, activity_id))
+            blockers = graph.blockers(target)
+            target_hours, target_path = graph.critical_path(target)
+            st.caption(f"{len(blockers)} atividades abertas antes dela; caminho crítico até ela: "
+                       f"{target_hours:.1f}h em {len(target_path)} atividades")
+            st.dataframe(dependency_table(graph, blockers, 'Distância'))
+        
+        if analysis.ready:
+            st.write("**Prontas** (todas as dependências concluídas):")
+            st.write(", ".join(dependency_label(graph, activity_id)
+                               for activity_id in sorted(analysis.ready)[:DEPENDENCY_LIST_LIMIT]))
+    
+    with st.form("dependency_form", clear_on_submit=True):
+        col1, col2 = st.columns(2)
+        with col1:
+            activity_id = st.number_input("Atividade (id)", min_value=1, step=1)
+        with col2:
+            depends_on = st.number_input("Depende de (id)", min_value=1, step=1)
+        if st.form_submit_button("Adicionar dependência"):
+            try:
+                add_dependencies([(int(activity_id), int(depends_on))])
+                st.success("Dependência adicionada")
+            except ValueError as e:
+                st.error(f"Dependência recusada: {e}")
+
+@profiled_view
+def show_supervisor_interface():
+    st.title("👥 Dashboard de Supervisão")
+    
+    # Métricas do supervisor
+    snapshot = get_global_snapshot()
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        show_metric_card("Equipe Ativa", snapshot.active_users_today, "👥")
+    with col2:
+        show_metric_card("Atividades Pendentes", snapshot.pending, "⏳")
+    with col3:
+        show_metric_card("Conclusões Hoje", snapshot.completed_today, "✅")
+    
+    # Monitoramento em tempo real
+    st.subheader("🔄 Atividades em Tempo Real")
+    show_realtime_activities()
+    show_online_users()
+    
+    # Dashboard da equipe
+    col1, col2 = st.columns(2)
+    with col1:
+        show_team_performance()
+    with col2:
+        show_team_workload()
+    
+    show_dependencies()
+    show_search()
@@ -0,0 +1,202 @@
+"""Telas do perfil usuário comum."""
+
+import streamlit as st
+from datetime import date, datetime, time, timedelta
+
+from ..queries import (
+    DEFAULT_PAGE_SIZE, PAGE_SIZE_OPTIONS, complete_activity, count_user_activities,
+    create_activity, get_user_active_activities, get_user_snapshot, update_activity
+)
+from ..charts import show_user_productivity_chart, show_user_status_distribution
+from ..profiling import profiled_view
+from ..timesheet import get_time_totals, track_time_entries
+from .common import get_page_state, show_metric_card, show_pagination_controls
+
+# Funções para atividades do usuário
+@profiled_view
+def show_new_activity_form(user_id):
+    st.subheader("➕ Nova Atividade")
+    
+    with st.form("new_activity_form"):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            activity = st.text_input("Título da Atividade*")
+            description = st.text_area("Descrição")
+            priority = st.selectbox("Prioridade", ["Baixa", "Média", "Alta", "Urgente"])
+        
+        with col2:
+            category = st.selectbox("Categoria", ["Desenvolvimento", "Manutenção", "Suporte", "Reunião", "Outro"])
+            estimated_hours = st.number_input("Horas Estimadas", min_value=0.5, value=1.0)
+            comments = st.text_area("Comentários")
+        
+        if st.form_submit_button("Iniciar Atividade"):
+            create_activity(user_id, activity, description, priority, category, estimated_hours, comments)
+            st.success("Atividade criada com sucesso!")
+            st.experimental_rerun()
+
+@profiled_view
+def show_user_dashboard(user_id):
+    st.subheader("📊 Meu Dashboard")
+    
+    # Métricas pessoais
+    snapshot = get_user_snapshot(user_id)
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        show_metric_card("Atividades Hoje", snapshot.started_today, "📅")
+    with col2:
+        show_metric_card("Em Andamento", snapshot.ongoing, "🔄")
+    with col3:
+        show_metric_card("Taxa de Conclusão", f"{snapshot.completion_rate:.1f}%", "✅")
+    
+    # Gráficos
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        show_user_productivity_chart(user_id)
+    with col2:
+        show_user_status_distribution(user_id)
+
+@profiled_view
+def show_user_activities(user_id):
+    st.subheader("📋 Minhas Atividades")
+
+    # Filter Options for Status
+    status_filter = st.selectbox("Filtrar por Status", ["Todas", "Em Andamento", "Concluídas", "Pendentes"])
+    page_size = st.selectbox("Itens por página", PAGE_SIZE_OPTIONS,
+                             index=PAGE_SIZE_OPTIONS.index(DEFAULT_PAGE_SIZE),
+                             key="my_activities_page_size")
+    
+    # Fetch and Display Activities
+    nav = get_page_state('my_activities_page', (user_id, status_filter, page_size))
+    page = get_user_active_activities(user_id, status_filter, page_size,
+                                      nav['cursor'], nav['direction'])
+    for activity in page.rows:
+        with st.expander(f"{activity['activity']} - {activity['status'].title()}"):
+            col1, col2 = st.columns(2)
+
+            with col1:
+                st.write(f"**Descrição:** {activity['description']}")
+                st.write(f"**Prioridade:** {activity['priority']}")
+                st.write(f"**Categoria:** {activity['category']}")
+                st.write(f"**Comentários:** {activity['comments']}")
+            
+            with col2:
+                st.write(f"**Início:** {activity['start_time']}")
+                st.write(f"**Horas Estimadas:** {activity['estimated_hours']}")
+                st.write(f"**Horas Registradas:** {activity['tracked_hours']:.2f}")
+                if activity['status'] == 'concluida':
+                    st.write(f"**Horas Reais:** {activity['actual_hours']}")
+                    st.write(f"**Duração (relógio):** {activity['wall_clock_hours']}")
+                st.write(f"**Última Atualização:** {activity['last_updated']}")
+            
+            # Action Buttons for Editing or Completing Activity
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("✏️ Editar", key=f"edit_act_{activity['id']}"):
+                    show_user_edit_activity_modal(activity)
+            with col2:
+                if activity['status'] != 'concluida':
+                    if st.button("✅ Concluir", key=f"complete_act_{activity['id']}"):
+                        complete_activity(activity['id'])
+                        st.experimental_rerun()
+    
+    show_pagination_controls('my_activities_page', page,
+                             count_user_activities(user_id, status_filter), page_size)
+WEEKDAYS = ('Seg', 'Ter', 'Qua', 'Qui', 'Sex', 'Sáb', 'Dom')
+
+@profiled_view
+def show_timesheet(user_id):
+    """Apontamento da semana: totais por dia e lançamento em lote"""
+    picked = st.date_input("Semana de", value=date.today(), key="timesheet_week")
+    monday = picked - timedelta(days=picked.weekday())
+    days = [monday + timedelta(days=i) for i in range(7)]
+
+    totals = {day: hours for day, _, hours, _ in get_time_totals(days[0], days[-1], user_id)}
+    for col, label, day in zip(st.columns(7), WEEKDAYS, days):
+        col.metric(f"{label} {day:%d/%m}", f"{totals.get(day, 0):.1f} h")
+
+    activities = get_user_active_activities(user_id, "Em Andamento", 100).rows
+    if not activities:
+        st.info("Nenhuma atividade em andamento para registrar horas.")
+        return
+
+    with st.form("timesheet_form"):
+        activity = st.selectbox("Atividade", activities,
+                                format_func=lambda row: f"#{row['id']} {row['activity']}")
+        hours = [col.number_input(label, min_value=0.0, max_value=24.0, step=0.5,
+                                  key=f"timesheet_{label}")
+                 for col, label in zip(st.columns(7), WEEKDAYS)]
+        description = st.text_input("Descrição")
+
+        if st.form_submit_button("Registrar Horas"):
+            # Meio-dia: o lançamento cai no dia escolhido em qualquer fuso
+            entries = [(activity['id'], user_id, spent, description or None,
+                        datetime.combine(day, time(12)))
+                       for day, spent in zip(days, hours) if spent > 0]
+            try:
+                count = track_time_entries(entries)
+            except ValueError as e:
+                st.error(str(e))
+            else:
+                if count:
+                    st.success(f"{count} lançamentos registrados")
+                    st.experimental_rerun()
+                else:
+                    st.warning("Informe as horas de pelo menos um dia.")
+
+@profiled_view
+def show_user_edit_activity_modal(activity):
+    """Displays a modal for the user to edit their activity."""
+    st.subheader(f"✏️ Editar Atividade: {activity['activity']}")
+    
+    with st.form(f"edit_activity_form_{activity['id']}"):
+        col1, col2 = st.columns(2)
+
+        with col1:
+            new_activity = st.text_input("Título", value=activity['activity'])
+            description = st.text_area("Descrição", value=activity['description'])
+            priority = st.selectbox(
+                "Prioridade", 
+                ["Baixa", "Média", "Alta", "Urgente"], 
+                index=["Baixa", "Média", "Alta", "Urgente"].index(activity['priority'])
+            )
+        
+        with col2:
+            category = st.selectbox(
+                "Categoria",
+                ["Desenvolvimento", "Manutenção", "Suporte", "Reunião", "Outro"],
+                index=["Desenvolvimento", "Manutenção", "Suporte", "Reunião", "Outro"].index(activity['category'])
+            )
+            estimated_hours = st.number_input("Horas Estimadas", min_value=0.5, value=float(activity['estimated_hours']))
+        
+        comments = st.text_area("Comentários", value=activity['comments'])
+        
+        if st.form_submit_button("Salvar Alterações"):
+            update_activity(
+                activity['id'], new_activity, description, priority,
+                category, activity['status'], estimated_hours, comments
+            )
+            st.success("Atividade atualizada com sucesso!")
+            st.experimental_rerun()
+
+@profiled_view
+def show_user_interface():
+    st.title("📋 Minhas Atividades")
+    user_id = st.session_state.user['id']
+    
+    # Ações rápidas
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("➕ Nova Atividade"):
+            show_new_activity_form(user_id)
+    with col2:
+        if st.button("📊 Meu Dashboard"):
+            show_user_dashboard(user_id)
+    
+    with st.expander("⏱️ Registro de Horas"):
+        show_timesheet(user_id)
+
+    # Lista de atividades do usuário
+    show_user_activities(user_id)
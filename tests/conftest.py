@@ -0,0 +1,66 @@
+"""Configuração dos testes de regressão.
+
+Os módulos leem os caminhos dos bancos na importação e guardam as conexões em
+st.cache_resource, então o banco temporário é definido aqui, antes de qualquer
+import de monitor_atividades, e compartilhado por toda a sessão. Cada teste
+cria o próprio usuário e as próprias atividades.
+"""
+import itertools
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEST_DIR = tempfile.mkdtemp(prefix='monitor_tests_')
+os.environ['MONITOR_DB_PATH'] = os.path.join(TEST_DIR, 'test.db')
+sys.path.insert(0, ROOT)
+
+import pytest
+
+from monitor_atividades.db import db_read, get_query_cache
+from monitor_atividades.queries import create_activity, create_user
+from monitor_atividades.schema import init_db
+
+_names = itertools.count(1)
+
+@pytest.fixture(scope='session', autouse=True)
+def database():
+    init_db()
+    return os.environ['MONITOR_DB_PATH']
+
+@pytest.fixture(autouse=True)
+def clear_query_cache():
+    get_query_cache().clear()
+    yield
+
+@pytest.fixture
+def make_user():
+    """make_user(department='TI') -> id de um usuário novo"""
+    def make(department='TI'):
+        username = f'teste{next(_names)}'
+        assert create_user(username, 'senha', 'usuario', username.title(),
+                           f'{username}@exemplo.com', department)
+        with db_read() as conn:
+            return conn.execute('SELECT id FROM users WHERE username=?', (username,)).fetchone()[0]
+    return make
+
+@pytest.fixture
+def make_activity():
+    """make_activity(user_id, category='Desenvolvimento', estimated_hours=2) -> id"""
+    def make(user_id, category='Desenvolvimento', estimated_hours=2):
+        create_activity(user_id, f'Atividade {next(_names)}', 'descrição', 'Média',
+                        category, estimated_hours, '')
+        with db_read() as conn:
+            return conn.execute('SELECT MAX(id) FROM activities WHERE user_id=?',
+                                (user_id,)).fetchone()[0]
+    return make
+
+def daily_stats(schema='main'):
+    """Conteúdo do rollup, com as horas arredondadas, para comparação"""
+    with db_read() as conn:
+        return sorted((day, user_id, department, category, status, count,
+                       round(estimated, 4), round(actual, 4))
+                      for day, user_id, department, category, status, count, estimated, actual
+                      in conn.execute(f'''SELECT day, user_id, department, category, status,
+                                                 activity_count, estimated_hours, actual_hours
+                                          FROM {schema}.activity_daily_stats'''))
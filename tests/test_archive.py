@@ -0,0 +1,55 @@
+"""Arquivamento: contadores em cache são invalidados e o rollup continua certo."""
+from datetime import datetime, timedelta
+
+from conftest import daily_stats
+
+from monitor_atividades.archive import archive_activities, archive_counts
+from monitor_atividades.db import db_read, db_write
+from monitor_atividades.queries import (complete_activity, count_user_activities,
+                                        get_global_snapshot, get_user_snapshot)
+from monitor_atividades.rollup import rebuild_activity_daily_stats
+
+def complete_long_ago(activity_id, days=400):
+    complete_activity(activity_id)
+    with db_write('activities') as conn:
+        conn.execute('UPDATE activities SET end_time=? WHERE id=?',
+                     (datetime.now() - timedelta(days=days), activity_id))
+
+def test_archive_invalidates_cached_counts(make_user, make_activity):
+    user_id = make_user()
+    archived = make_activity(user_id)
+    make_activity(user_id)
+    complete_long_ago(archived)
+
+    # Preenche o cache antes de arquivar
+    assert count_user_activities(user_id) == 2
+    assert count_user_activities(user_id, "Concluídas") == 1
+    total_before = get_global_snapshot().total
+    user_before = get_user_snapshot(user_id)
+    hot_before, _ = archive_counts()
+
+    assert archive_activities(days=30) >= 1
+
+    # A lista paginada lê só a camada quente
+    assert count_user_activities(user_id) == 1
+    assert count_user_activities(user_id, "Concluídas") == 0
+    with db_read() as conn:
+        hot = conn.execute('SELECT COUNT(*) FROM activities WHERE user_id=?', (user_id,)).fetchone()[0]
+    assert hot == 1
+    assert archive_counts()[0] < hot_before
+
+    # Os cards contam as arquivadas pelo rollup do arquivo
+    assert get_global_snapshot().total == total_before
+    assert get_user_snapshot(user_id).total == user_before.total
+
+def test_archive_keeps_rollups_consistent(make_user, make_activity):
+    user_id = make_user()
+    for _ in range(3):
+        complete_long_ago(make_activity(user_id))
+    archive_activities(days=30, batch_size=2)
+
+    main, archive = daily_stats(), daily_stats('archive')
+    assert any(row[1] == user_id for row in archive)
+    rebuild_activity_daily_stats()
+    assert daily_stats() == main
+    assert daily_stats('archive') == archive
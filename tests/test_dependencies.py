@@ -0,0 +1,68 @@
+"""Grafo de dependências: ciclos rejeitados sem gravar nada."""
+import pytest
+
+from monitor_atividades.db import db_read
+from monitor_atividades.dependencies import add_dependencies, dependency_graph, remove_dependency
+from monitor_atividades.queries import complete_activity
+
+def edges_of(ids):
+    with db_read() as conn:
+        return sorted(conn.execute(f'''SELECT activity_id, depends_on FROM activity_dependencies
+                                       WHERE activity_id IN ({', '.join('?' * len(ids))})''', ids))
+
+@pytest.fixture
+def chain(make_user, make_activity):
+    """Quatro atividades novas: a, b, c, d"""
+    user_id = make_user()
+    return [make_activity(user_id, estimated_hours=hours) for hours in (1, 2, 3, 4)]
+
+def test_rejects_self_dependency(chain):
+    a = chain[0]
+    with pytest.raises(ValueError, match='ciclo'):
+        add_dependencies([(a, a)])
+    assert edges_of(chain) == []
+
+def test_rejects_cycle_with_existing_edges(chain):
+    a, b, c, _ = chain
+    assert add_dependencies([(a, b), (b, c)]) == 2
+    with pytest.raises(ValueError, match='ciclo'):
+        add_dependencies([(c, a)])
+    assert edges_of(chain) == [(a, b), (b, c)]
+
+def test_rejects_cycle_within_batch(chain):
+    a, b, c, d = chain
+    # A aresta que fecha o ciclo vem no mesmo lote: nenhuma é gravada
+    with pytest.raises(ValueError, match='ciclo'):
+        add_dependencies([(d, a), (a, b), (b, c), (c, a)])
+    assert edges_of(chain) == []
+
+def test_rejects_missing_activity(chain):
+    with pytest.raises(ValueError, match='inexistente'):
+        add_dependencies([(chain[0], chain[1]), (chain[0], 10 ** 9)])
+    assert edges_of(chain) == []
+
+def test_duplicates_and_text_ids(chain):
+    a, b, c, _ = chain
+    assert add_dependencies([(str(a), str(b)), (a, b)]) == 1
+    assert add_dependencies([(a, b), (b, c)]) == 1
+    assert edges_of(chain) == [(a, b), (b, c)]
+
+def test_removed_edge_allows_reverse(chain):
+    a, b, _, _ = chain
+    add_dependencies([(a, b)])
+    remove_dependency(a, b)
+    assert add_dependencies([(b, a)]) == 1
+    assert edges_of(chain) == [(b, a)]
+
+def test_blockers_and_critical_path(chain):
+    a, b, c, d = chain
+    add_dependencies([(d, c), (c, b), (b, a)])
+    graph = dependency_graph()
+    assert graph.blockers(d) == [(c, 1), (b, 2), (a, 3)]
+    assert graph.critical_path(d) == (10, [a, b, c, d])
+
+    # Concluídas interrompem a cadeia
+    complete_activity(b)
+    graph = dependency_graph()
+    assert graph.blockers(d) == [(c, 1)]
+    assert graph.critical_path(d) == (7, [c, d])
@@ -0,0 +1,57 @@
+"""O rollup incremental (rollup_add/rollup_remove) deve ficar igual ao recálculo."""
+from conftest import daily_stats
+
+from monitor_atividades.queries import complete_activity, delete_activity, update_activity
+from monitor_atividades.rollup import rebuild_activity_daily_stats
+from monitor_atividades.timesheet import track_time_entries
+
+def assert_matches_rebuild():
+    incremental = daily_stats()
+    rebuild_activity_daily_stats()
+    assert daily_stats() == incremental
+
+def user_rows(user_id):
+    return [row for row in daily_stats() if row[1] == user_id]
+
+def test_create_adds_one_row(make_user, make_activity):
+    user_id = make_user()
+    make_activity(user_id, estimated_hours=3)
+    make_activity(user_id, estimated_hours=1.5)
+
+    [row] = user_rows(user_id)
+    assert row[2:] == ('TI', 'Desenvolvimento', 'em_andamento', 2, 4.5, 0)
+    assert_matches_rebuild()
+
+def test_update_moves_contribution(make_user, make_activity):
+    user_id = make_user()
+    activity_id = make_activity(user_id)
+    make_activity(user_id)
+
+    update_activity(activity_id, 'Renomeada', 'descrição', 'Alta', 'Reunião',
+                    'pausada', 5, '')
+    assert sorted(row[3:6] for row in user_rows(user_id)) == [
+        ('Desenvolvimento', 'em_andamento', 1), ('Reunião', 'pausada', 1)]
+    assert_matches_rebuild()
+
+def test_complete_and_time_entries(make_user, make_activity):
+    user_id = make_user()
+    activity_id = make_activity(user_id)
+
+    complete_activity(activity_id)
+    track_time_entries([(activity_id, user_id, 1.25), (activity_id, user_id, 0.5)])
+
+    [row] = user_rows(user_id)
+    assert row[4:] == ('concluida', 1, 2, 1.75)
+    assert_matches_rebuild()
+
+def test_delete_removes_empty_rows(make_user, make_activity):
+    user_id = make_user()
+    first = make_activity(user_id)
+    second = make_activity(user_id)
+
+    delete_activity(first)
+    assert [row[5] for row in user_rows(user_id)] == [1]
+    delete_activity(second)
+    # rollup_remove apaga a linha que chega a zero, como o recálculo
+    assert user_rows(user_id) == []
+    assert_matches_rebuild()
@@ -0,0 +1,63 @@
+"""Validação de track_time_entries e totais incrementais do timesheet."""
+from datetime import date, datetime
+
+import pytest
+
+from monitor_atividades.db import db_read
+from monitor_atividades.timesheet import TimeEntry, get_time_totals, track_time_entries
+
+def entry_count(activity_id):
+    with db_read() as conn:
+        return conn.execute('SELECT COUNT(*) FROM time_tracking WHERE activity_id=?',
+                            (activity_id,)).fetchone()[0]
+
+@pytest.mark.parametrize('hours', [0, -1, 'abc', None, float('nan')])
+def test_rejects_invalid_hours(make_user, make_activity, hours):
+    user_id = make_user()
+    activity_id = make_activity(user_id)
+    with pytest.raises(ValueError, match='horas inválidas'):
+        track_time_entries([(activity_id, user_id, 1), (activity_id, user_id, hours)])
+    assert entry_count(activity_id) == 0
+
+@pytest.mark.parametrize('bad_id', ['abc', None, '1) OR 1=1 --', '0); DROP TABLE activities; --'])
+def test_rejects_invalid_activity_ids(make_user, make_activity, bad_id):
+    user_id = make_user()
+    activity_id = make_activity(user_id)
+    with pytest.raises(ValueError, match='atividade inválida'):
+        track_time_entries([(activity_id, user_id, 1), (bad_id, user_id, 1)])
+    assert entry_count(activity_id) == 0
+    with db_read() as conn:
+        assert conn.execute('SELECT COUNT(*) FROM activities WHERE id=?', (activity_id,)).fetchone()[0]
+
+def test_rejects_missing_activity(make_user, make_activity):
+    user_id = make_user()
+    activity_id = make_activity(user_id)
+    with pytest.raises(ValueError, match='inexistente'):
+        track_time_entries([(activity_id, user_id, 1), (10 ** 9, user_id, 1)])
+    assert entry_count(activity_id) == 0
+
+def test_empty_batch():
+    assert track_time_entries([]) == 0
+
+def test_totals_follow_entries(make_user, make_activity):
+    user_id = make_user()
+    first = make_activity(user_id)
+    second = make_activity(user_id)
+    today = date.today()
+    noon = datetime.combine(today, datetime.min.time()).replace(hour=12)
+
+    # ids em texto (vindos de formulários) são aceitos
+    assert track_time_entries([
+        TimeEntry(str(first), user_id, 1.5, 'análise', noon),
+        TimeEntry(first, user_id, '0.25', None, noon),
+        (second, user_id, 2, 'revisão', noon),
+    ]) == 3
+
+    with db_read() as conn:
+        tracked = dict(conn.execute('SELECT id, tracked_hours FROM activities WHERE id IN (?, ?)',
+                                    (first, second)))
+        actual = dict(conn.execute('SELECT id, actual_hours FROM activities WHERE id IN (?, ?)',
+                                   (first, second)))
+    assert tracked == pytest.approx({first: 1.75, second: 2})
+    assert actual == pytest.approx({first: 1.75, second: 2})
+    assert get_time_totals(today, today, user_id) == [(today, user_id, 3.75, 3)]